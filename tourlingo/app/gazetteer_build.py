@@ -0,0 +1,154 @@
+"""
+Build the offline gazetteer used before the Google Maps API
+
+Reads CSV files (name,lat,lng,types,aliases,address,population; types and
+aliases separated by "|") or GeoNames dumps (e.g. IN.txt from
+https://download.geonames.org/export/dump/) and writes one SQLite index.
+
+Usage (from the tourlingo/ directory):
+    python -m app.gazetteer_build data/gazetteer_seed.csv -o data/gazetteer.db
+    python -m app.gazetteer_build data/gazetteer_seed.csv IN.txt --min-population 5000
+"""
+import argparse
+import csv
+import sys
+
+from app.utils.gazetteer import GazetteerBuilder
+from app.utils.scripts import token_script
+
+# GeoNames feature codes mapped to Places API types
+FEATURE_TYPES = {
+    'PPLC': ['locality', 'political'],
+    'PPLA': ['locality', 'political'],
+    'PPLA2': ['locality', 'political'],
+    'PPL': ['locality', 'political'],
+    'MUS': ['museum', 'tourist_attraction'],
+    'MNMT': ['tourist_attraction', 'point_of_interest'],
+    'FT': ['tourist_attraction', 'point_of_interest'],
+    'PAL': ['tourist_attraction', 'point_of_interest'],
+    'CSTL': ['tourist_attraction', 'point_of_interest'],
+    'TMB': ['tourist_attraction', 'point_of_interest'],
+    'RUIN': ['tourist_attraction', 'point_of_interest'],
+    'HSTS': ['tourist_attraction', 'point_of_interest'],
+    'TMPL': ['place_of_worship', 'hindu_temple'],
+    'MSQE': ['place_of_worship', 'mosque'],
+    'CH': ['place_of_worship', 'church'],
+    'SHRN': ['place_of_worship'],
+    'PRK': ['park'],
+    'ZOO': ['zoo'],
+    'GDN': ['park'],
+    'BCH': ['natural_feature'],
+    'LK': ['natural_feature'],
+    'MT': ['natural_feature'],
+    'AIRP': ['airport'],
+    'RSTN': ['train_station'],
+    'BUSTN': ['bus_station'],
+    'HTL': ['lodging'],
+    'MKT': ['shopping_mall'],
+}
+
+CLASS_TYPES = {
+    'P': ['locality', 'political'],
+    'S': ['point_of_interest'],
+    'L': ['point_of_interest'],
+    'H': ['natural_feature'],
+    'T': ['natural_feature'],
+}
+
+
+def split_list(value):
+    return [item.strip() for item in (value or '').split('|') if item.strip()]
+
+
+def read_csv(path):
+    """Yield builder.add() keyword arguments from a seed-style CSV"""
+    with open(path, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                yield {
+                    'name': row['name'].strip(),
+                    'lat': float(row['lat']),
+                    'lng': float(row['lng']),
+                    'types': split_list(row.get('types')),
+                    'aliases': split_list(row.get('aliases')),
+                    'address': (row.get('address') or '').strip() or None,
+                    'population': int(row.get('population') or 0),
+                    'source_id': row.get('id') or None
+                }
+            except (KeyError, ValueError) as e:
+                print(f"Skipping row {row}: {e}", file=sys.stderr)
+
+
+def read_geonames(path, feature_classes, min_population, country=None):
+    """
+    Yield builder.add() keyword arguments from a GeoNames dump
+
+    Only alternate names written in a script Tourlingo handles (Latin and
+    the Indic scripts) are kept; popular places have hundreds of others.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            columns = line.rstrip('\n').split('\t')
+            if len(columns) < 15:
+                continue
+
+            feature_class, feature_code, country_code = columns[6], columns[7], columns[8]
+            population = int(columns[14] or 0)
+            if feature_class not in feature_classes:
+                continue
+            if country and country_code != country:
+                continue
+            if feature_class == 'P' and population < min_population:
+                continue
+
+            aliases = [columns[2]] + [
+                name for name in columns[3].split(',')
+                if name and token_script(name) is not None
+            ]
+            yield {
+                'name': columns[1],
+                'lat': float(columns[4]),
+                'lng': float(columns[5]),
+                'types': FEATURE_TYPES.get(feature_code, CLASS_TYPES.get(feature_class, [])),
+                'aliases': aliases,
+                'population': population,
+                'source_id': f"geonames:{columns[0]}"
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline gazetteer index")
+    parser.add_argument('inputs', nargs='+', help="CSV files or GeoNames dumps (.txt)")
+    parser.add_argument('-o', '--output', default='data/gazetteer.db')
+    parser.add_argument('--format', choices=['auto', 'csv', 'geonames'], default='auto',
+                        help="Input format; auto picks csv for .csv and geonames otherwise")
+    parser.add_argument('--feature-classes', default='P,S,L,H,T',
+                        help="GeoNames feature classes to import")
+    parser.add_argument('--min-population', type=int, default=1000,
+                        help="Skip GeoNames populated places smaller than this")
+    parser.add_argument('--country', help="Only import this GeoNames country code, e.g. IN")
+    args = parser.parse_args()
+
+    feature_classes = set(args.feature_classes.split(','))
+    builder = GazetteerBuilder(args.output)
+
+    for path in args.inputs:
+        fmt = args.format
+        if fmt == 'auto':
+            fmt = 'csv' if path.endswith('.csv') else 'geonames'
+
+        if fmt == 'csv':
+            places = read_csv(path)
+        else:
+            places = read_geonames(path, feature_classes, args.min_population, args.country)
+
+        added = sum(1 for place in places if builder.add(**place))
+        print(f"{path}: {added} places", file=sys.stderr)
+
+    summary = builder.finish(source=','.join(args.inputs))
+    print(f"Wrote {summary['places']} places and {summary['aliases']} aliases to {summary['path']}",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,21 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template, send_file, stream_with_context
 from flask_cors import CORS
-from PIL import Image
-import io
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 
-from app.utils.translator import IndicTranslator
-from app.utils.ner_extractor import TravelNER
-from app.utils.ocr_processor import OCRProcessor
-from app.utils.maps_helper import GoogleMapsHelper
+from app.utils.image_ingest import ImageIngestError, open_image
+from app.utils.metrics import init_metrics
+from app.utils.ocr_cache import OCRCache
+from app.utils.profiler import init_profiler
+from app.utils.registry import ComponentRegistry
+from app.utils.scripts import detect_text_language, language_scores
+from app.utils.segmenter import segment_document, rebuild_document
+from app.utils.stage_executor import StagePipeline
+from app.utils.translation_cache import TranslationCache
 
 # Load environment variables
 load_dotenv()
@@ -17,19 +24,521 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
-# Initialize components
-print("Initializing Tourlingo components...")
-translator = IndicTranslator()
-ner_extractor = TravelNER()
-ocr_processor = OCRProcessor()
-maps_helper = GoogleMapsHelper(api_key=os.getenv('GOOGLE_MAPS_API_KEY'))
-print("Initialization complete!")
+# Per-stage latency, input size, batch size and cache metrics on /metrics
+init_metrics(app)
+
+# Optional sampling profiler: requests slower than PROFILE_SLOW_REQUESTS_MS
+# leave a folded-stack flame graph in PROFILE_DIR
+if os.getenv('PROFILE_SLOW_REQUESTS_MS'):
+    init_profiler(
+        app,
+        threshold_ms=float(os.getenv('PROFILE_SLOW_REQUESTS_MS')),
+        output_dir=os.getenv('PROFILE_DIR', 'profiles'),
+        interval_ms=float(os.getenv('PROFILE_INTERVAL_MS', 5))
+    )
+
+# Reject oversized request bodies before they are parsed (413)
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_MB', 10)) * 1024 * 1024
+MAX_IMAGE_PIXELS = int(os.getenv('MAX_IMAGE_PIXELS', 40_000_000))
+
+# Item limits for the /batch endpoints
+MAX_BATCH_ITEMS = int(os.getenv('MAX_BATCH_ITEMS', 64))
+MAX_OCR_BATCH_IMAGES = int(os.getenv('MAX_OCR_BATCH_IMAGES', 8))
+
+# Upper bounds for per-request num_beams and max_length (the translator's
+# MAX_BEAMS and MAX_LENGTH)
+MAX_NUM_BEAMS = 8
+MAX_GENERATION_LENGTH = 512
+
+# Shared pool for composite-endpoint stages and for work that overlaps
+# with a streaming response
+background_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('BACKGROUND_WORKERS', 8)),
+    thread_name_prefix='background'
+)
+
+# Per-stage deadlines (seconds) for the composite endpoints, counted from
+# when a stage starts running; a stage that overruns is reported and the
+# response carries whatever else finished. STAGE_DEADLINE bounds the whole
+# request, including time stages spend queued on background_executor.
+STAGE_TIMEOUTS = {
+    'entities': float(os.getenv('STAGE_TIMEOUT_ENTITIES', 5)),
+    'translation': float(os.getenv('STAGE_TIMEOUT_TRANSLATION', 30)),
+    'suggestions': float(os.getenv('STAGE_TIMEOUT_SUGGESTIONS', 8)),
+    'ocr': float(os.getenv('STAGE_TIMEOUT_OCR', 30)),
+}
+STAGE_DEADLINE = float(os.getenv('STAGE_DEADLINE', 60))
+# Languages /api/image-assist reads in its single OCR pass; each one adds
+# a tesseract model to that pass, so keep the list to what signs use
+IMAGE_ASSIST_LANGUAGES = os.getenv('IMAGE_ASSIST_LANGUAGES', 'english,hindi')
+# Locate lines of text and OCR only those, instead of the whole frame. Off
+# until benchmarks/bench_text_regions.py has measured it against full-frame
+# OCR with tesseract installed
+OCR_TEXT_REGIONS = os.getenv('OCR_TEXT_REGIONS', 'false').lower() in ('1', 'true')
+# Hosts job callback_url may point at (comma-separated); empty allows any
+# host that resolves only to public addresses
+JOB_CALLBACK_HOSTS = [
+    host.strip() for host in os.getenv('JOB_CALLBACK_HOSTS', '').split(',') if host.strip()
+]
+# Translation model directions to serve (en-indic, indic-en, indic-indic);
+# language pairs needing another direction answer 400
+TRANSLATE_DIRECTIONS = [
+    direction.strip()
+    for direction in os.getenv('TRANSLATE_DIRECTIONS', 'en-indic,indic-en,indic-indic').split(',')
+    if direction.strip()
+]
+# Always include stage timings, not only when a request asks with "debug"
+DEBUG_TIMINGS = os.getenv('DEBUG_TIMINGS', '').lower() in ('1', 'true')
+
+# Heavy components are registered here and only built on first use (or by
+# the background preloader), so importing this module stays cheap.
+components = ComponentRegistry()
+
+translation_cache = TranslationCache(
+    max_entries=int(os.getenv('TRANSLATION_CACHE_SIZE', 10000)),
+    db_path=os.getenv('TRANSLATION_CACHE_DB', 'data/translation_cache.db') or None
+)
+
+# OCR results for near-duplicate uploads (same photo re-sent, re-compressed
+# or resized); kept in memory unless OCR_CACHE_DB is set
+ocr_cache = OCRCache(
+    max_entries=int(os.getenv('OCR_CACHE_SIZE', 2048)),
+    max_distance=int(os.getenv('OCR_CACHE_MAX_DISTANCE', 20)),
+    db_path=os.getenv('OCR_CACHE_DB') or None
+)
+
+def _load_translator():
+    from app.utils.model_pool import TranslatorPool
+    from app.utils.translator import IndicTranslator
+    
+    # One lazily loaded checkpoint per direction; converted ctranslate2
+    # models for indic-en and indic-indic live next to the en-indic one
+    model_dir = os.getenv('TRANSLATE_MODEL_DIR', 'models/indictrans2')
+    directions = TRANSLATE_DIRECTIONS
+    translator = TranslatorPool(
+        {
+            direction: IndicTranslator(
+                model_dir=model_dir if direction == 'en-indic' else f"{model_dir}-{direction}",
+                cache=translation_cache,
+                backend=os.getenv('TRANSLATE_BACKEND', 'torch'),
+                num_threads=int(os.getenv('TRANSLATE_NUM_THREADS', 0)) or None,
+                interop_threads=int(os.getenv('TRANSLATE_INTEROP_THREADS', 0)) or None,
+                num_beams=int(os.getenv('TRANSLATE_NUM_BEAMS', 5)),
+                max_length=int(os.getenv('TRANSLATE_MAX_LENGTH', 512)),
+                direction=direction,
+                lazy=True
+            )
+            for direction in directions
+        },
+        # Enforced per process: each gunicorn worker that loads models on
+        # demand may hold up to this much, so size it as total / workers
+        memory_budget_mb=float(os.getenv('TRANSLATE_MEMORY_BUDGET_MB', 0)) or None
+    )
+    
+    # Loaded now (in the gunicorn master when preloading, so workers share
+    # the weights); the other directions load on first use
+    translator.preload([
+        direction.strip()
+        for direction in os.getenv('TRANSLATE_PRELOAD_DIRECTIONS', 'en-indic').split(',')
+        if direction.strip() in directions
+    ])
+    
+    if not _before_fork:
+        prewarm_translation_cache(translator)
+    return translator
+
+def prewarm_translation_cache(translator):
+    """Translate TRANSLATION_PREWARM_FILE's phrases into the cache, if it is set"""
+    if os.getenv('TRANSLATION_PREWARM_FILE'):
+        warmed = translation_cache.prewarm(
+            translator,
+            TranslationCache.load_phrases(os.getenv('TRANSLATION_PREWARM_FILE'))
+        )
+        print(f"Pre-warmed translation cache with {warmed} entries")
+
+def _load_translation_batcher():
+    from app.utils.batching import ModelRoutedBatcher
+    
+    return ModelRoutedBatcher(
+        components.get('translator'),
+        max_batch_size=int(os.getenv('TRANSLATE_MAX_BATCH_SIZE', 16)),
+        max_wait_ms=float(os.getenv('TRANSLATE_MAX_WAIT_MS', 10))
+    )
+
+def _load_ner():
+    from app.utils.ner_extractor import TravelNER
+    return TravelNER()
+
+def _load_ocr():
+    from app.utils.ocr_processor import OCRProcessor
+    return OCRProcessor(
+        mode=os.getenv('OCR_MODE', 'parallel'),
+        max_workers=int(os.getenv('OCR_MAX_WORKERS', 4)),
+        profile=os.getenv('OCR_PREPROCESS_PROFILE', 'balanced')
+    )
+
+def _load_maps():
+    from app.utils.maps_helper import GoogleMapsHelper
+    gazetteer = _load_gazetteer()
+    return GoogleMapsHelper(
+        api_key=os.getenv('GOOGLE_MAPS_API_KEY'),
+        timeout=float(os.getenv('GOOGLE_MAPS_TIMEOUT', 5)),
+        cache_ttl=float(os.getenv('GOOGLE_MAPS_CACHE_TTL', 3600)),
+        gazetteer=gazetteer,
+        spatial_index=_load_spatial_index(gazetteer)
+    )
+
+def _load_gazetteer():
+    # Built with `python -m app.gazetteer_build`; without it every lookup goes to the API
+    path = os.getenv('GAZETTEER_DB', 'data/gazetteer.db')
+    if not path or not os.path.exists(path):
+        return None
+    from app.utils.gazetteer import Gazetteer
+    return Gazetteer(path, fuzzy_threshold=float(os.getenv('GAZETTEER_FUZZY_THRESHOLD', 0.82)))
+
+def _load_spatial_index(gazetteer):
+    # Seeded with the gazetteer, then filled with every place the API returns
+    from app.utils.spatial_index import SpatialIndex
+    index = SpatialIndex()
+    if gazetteer is not None:
+        index.add_places(gazetteer.iter_places())
+    return index
+
+def _load_phrasebooks():
+    # City packs built with `python -m app.phrasebook_build`; rebuilt or new
+    # packs in PHRASEBOOK_DIR are picked up every PHRASEBOOK_REFRESH_SECONDS
+    from app.utils.phrasebook import Phrasebooks
+    return Phrasebooks(
+        os.getenv('PHRASEBOOK_DIR', 'data/phrasebooks'),
+        refresh_seconds=float(os.getenv('PHRASEBOOK_REFRESH_SECONDS', 60))
+    )
+
+def _load_jobs():
+    # Built per worker (threads do not survive fork); JOB_DB lets every
+    # worker answer polls for jobs another worker is running
+    from app.utils.job_queue import JobQueue
+    return JobQueue(
+        max_workers=int(os.getenv('JOB_WORKERS', 2)),
+        max_queued=int(os.getenv('JOB_QUEUE_SIZE', 32)),
+        result_ttl=float(os.getenv('JOB_RESULT_TTL', 600)),
+        db_path=os.getenv('JOB_DB') or None,
+        callback_hosts=JOB_CALLBACK_HOSTS
+    )
+
+components.register('translator', _load_translator)
+components.register('translation_batcher', _load_translation_batcher)
+components.register('ner', _load_ner)
+components.register('ocr', _load_ocr)
+components.register('maps', _load_maps)
+components.register('jobs', _load_jobs)
+components.register('phrasebooks', _load_phrasebooks)
+
+# Comma-separated component names to build in the background at startup,
+# e.g. PRELOAD_COMPONENTS=translation_batcher,ner
+PRELOAD_COMPONENTS = [
+    name.strip() for name in os.getenv('PRELOAD_COMPONENTS', '').split(',') if name.strip()
+]
+
+# Set while the gunicorn master preloads: running generate there would start
+# torch's OpenMP thread pool, which forked workers can hang on, so the
+# translation cache is pre-warmed in each worker by after_fork instead
+_before_fork = False
+
+def preload_components(background=True, before_fork=False):
+    """
+    Build PRELOAD_COMPONENTS now, on a daemon thread unless background is False
+    
+    before_fork=True (the gunicorn master) loads weights only; call
+    after_fork in each worker to finish what must not run before fork.
+    """
+    global _before_fork
+    _before_fork = before_fork
+    if PRELOAD_COMPONENTS:
+        return components.preload(PRELOAD_COMPONENTS, background=background)
+
+def after_fork():
+    """
+    Per-worker half of preload_components(before_fork=True)
+    
+    The pre-warm runs on a daemon thread, so the worker boots and starts
+    heartbeating at once instead of being killed for missing its timeout.
+    """
+    global _before_fork
+    if _before_fork:
+        _before_fork = False
+        if components.is_loaded('translator'):
+            threading.Thread(
+                target=prewarm_translation_cache,
+                args=(components.get('translator'),),
+                name='background-prewarm',
+                daemon=True
+            ).start()
+
+# gunicorn.conf.py sets TOURLINGO_DEFER_PRELOAD and preloads synchronously in
+# the master instead, so weights are loaded once and shared by forked workers
+if not os.getenv('TOURLINGO_DEFER_PRELOAD'):
+    preload_components()
+
+def shutdown():
+    """Stop background work; called on worker exit for a graceful shutdown"""
+    background_executor.shutdown(wait=True, cancel_futures=True)
+    if components.is_loaded('jobs'):
+        components.get('jobs').close()
+    if components.is_loaded('translation_batcher'):
+        components.get('translation_batcher').close()
+    if components.is_loaded('maps'):
+        components.get('maps').close()
+    translation_cache.close()
+    ocr_cache.close()
+
+def resolve_source_lang(text, source_lang):
+    """Detect the language of text from its script when source_lang is 'auto' or missing"""
+    if not source_lang or source_lang == 'auto':
+        return detect_text_language(text)
+    return source_lang
+
+def direction_error(source_lang, target_lang):
+    """400 response when a language pair's model direction is not enabled, or None"""
+    from app.utils.model_pool import TranslatorPool
+    
+    direction = TranslatorPool.direction_for(source_lang, target_lang)
+    if direction is not None and direction not in TRANSLATE_DIRECTIONS:
+        return jsonify({
+            'error': f"Translation direction '{direction}' ({source_lang} to {target_lang}) is not enabled"
+        }), 400
+    return None
+
+def is_long_text(text):
+    """Whether text has more than one line or sentence and should be translated as a document"""
+    lines = segment_document(text)
+    return len(lines) > 1 or sum(len(line) for line in lines) > 1
+
+def sse_event(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def sse_response(events):
+    """Stream an iterator of SSE strings without proxy buffering"""
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def stream_translation(text, source_lang, target_lang, num_beams=None, max_length=None):
+    """Yield a 'sentence' event per translated sentence, then 'translation' with the full text"""
+    if source_lang == target_lang:
+        yield sse_event('translation', {'translation': text})
+        return
+    
+    lines = [[None] * len(line) for line in segment_document(text)]
+    results = components.get('translator').iter_translate_document(
+        text, source_lang, target_lang, num_beams=num_beams, max_length=max_length
+    )
+    
+    for line_index, sentence_index, source, translation in results:
+        lines[line_index][sentence_index] = translation
+        yield sse_event('sentence', {
+            'line': line_index,
+            'index': sentence_index,
+            'source': source,
+            'translation': translation
+        })
+    
+    yield sse_event('translation', {'translation': rebuild_document(lines)})
+
+def get_batch_texts(data):
+    """Validate the "texts" array of a batch request; returns (texts, error_response)"""
+    texts = (data or {}).get('texts')
+    
+    if not isinstance(texts, list) or not texts:
+        return None, (jsonify({'error': 'No texts provided'}), 400)
+    if len(texts) > MAX_BATCH_ITEMS:
+        return None, (jsonify({'error': f'Too many texts: {len(texts)} (limit {MAX_BATCH_ITEMS})'}), 400)
+    if not all(isinstance(text, str) for text in texts):
+        return None, (jsonify({'error': 'Every item in texts must be a string'}), 400)
+    
+    return texts, None
+
+def get_generation_options(data):
+    """
+    Validate a request's optional num_beams and max_length
+    
+    Returns ({'num_beams': ..., 'max_length': ...}, error_response); absent
+    values stay None (the translator's defaults), others are clamped to
+    MAX_NUM_BEAMS and MAX_GENERATION_LENGTH.
+    """
+    options = {}
+    for name, limit in (('num_beams', MAX_NUM_BEAMS), ('max_length', MAX_GENERATION_LENGTH)):
+        value = (data or {}).get(name)
+        if value is None:
+            options[name] = None
+            continue
+        try:
+            if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+                raise ValueError
+            value = int(value)
+        except (TypeError, ValueError):
+            return None, (jsonify({'error': f'{name} must be a positive integer'}), 400)
+        if value < 1:
+            return None, (jsonify({'error': f'{name} must be a positive integer'}), 400)
+        options[name] = min(value, limit)
+    return options, None
+
+def upload_size(image):
+    """(width, height) of the image as uploaded, before open_image downscaled it"""
+    return tuple(image.info.get('upload_size', image.size))
+
+def fit_cached_lines(ocr_processor, result, image):
+    """
+    A cached OCR result with its line boxes moved onto this upload
+    
+    Near-duplicate hits can come from a resized copy of the photo, whose
+    boxes are in that copy's coordinates.
+    """
+    if not result.get('lines') or 'image_size' not in result:
+        return result
+    size = upload_size(image)
+    return {
+        **result,
+        'lines': ocr_processor.rescale_lines(result['lines'], result['image_size'], size),
+        'image_size': list(size)
+    }
+
+def run_ocr(ocr_processor, image, languages, mode=None, profile=None, regions=OCR_TEXT_REGIONS,
+            timings=None):
+    """
+    OCR an uploaded image for /api/ocr and /api/ocr/batch
+    
+    Returns the cacheable part of the response: text per language and, when
+    text regions were detected, the lines with their bounding boxes in the
+    uploaded image's coordinates, plus that image's [width, height].
+    """
+    if regions:
+        gray = ocr_processor.preprocess_gray(image, profile, timings)
+        size = upload_size(image)
+        texts, lines = ocr_processor.extract_text_regions(gray, languages, size, timings)
+        if lines:
+            return {'extracted_texts': texts, 'lines': lines, 'image_size': list(size)}
+        # Nothing that looks like a line of text; fall back to the whole frame
+    
+    return {
+        'extracted_texts': ocr_processor.extract_text(
+            image, languages, mode=mode, profile=profile, timings=timings
+        )
+    }
+
+def check_ocr_options(ocr_processor, profile=None, mode=None):
+    """Error response for an unknown OCR form option, or None if all are valid"""
+    if mode and mode not in ocr_processor.MODES:
+        return jsonify({
+            'error': f"Unknown mode '{mode}', expected one of {list(ocr_processor.MODES)}"
+        }), 400
+    if profile and profile not in ocr_processor.PREPROCESS_PROFILES:
+        return jsonify({
+            'error': f"Unknown profile '{profile}', expected one of {list(ocr_processor.PREPROCESS_PROFILES)}"
+        }), 400
+    return None
+
+def submit_job(kind, fn, options):
+    """
+    Queue fn on the job queue and answer 202 with the job's id and status URL
+    
+    options (request JSON or form) may carry "priority" (high, normal or
+    low) and "callback_url", which receives the finished job as a JSON POST.
+    A callback_url outside JOB_CALLBACK_HOSTS, or resolving to a loopback,
+    private or link-local address, answers 400. A full queue answers 429
+    with Retry-After.
+    """
+    from app.utils.job_queue import QueueFullError
+    
+    priority = options.get('priority', 'normal')
+    callback_url = options.get('callback_url')
+    
+    try:
+        job = components.get('jobs').submit(kind, fn, priority, callback_url)
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), e.status_code, {'Retry-After': '5'}
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    status_url = f"/api/jobs/{job['id']}"
+    return jsonify({**job, 'status_url': status_url}), 202, {'Location': status_url}
+
+def add_stage_report(response, outcomes, debug=False):
+    """Flag partial results and, in debug mode, attach per-stage timings"""
+    incomplete = {}
+    for outcome in outcomes:
+        incomplete.update(outcome.incomplete())
+    if incomplete:
+        response['partial'] = True
+        response['incomplete_stages'] = incomplete
+    
+    if debug in (True, 1, '1', 'true') or DEBUG_TIMINGS:
+        timings = {}
+        for outcome in outcomes:
+            timings.update(outcome.timings)
+        response['stage_timings_ms'] = timings
+
+def phrasebook_entry(text, source_lang, city=None):
+    """Precomputed phrasebook entry for text, or None (never raises)"""
+    try:
+        return components.get('phrasebooks').lookup(text, source_lang, city)
+    except Exception as e:
+        print(f"Phrasebook lookup failed: {e}")
+        return None
+
+def packed_suggestions(packed, city=None, location=None):
+    """
+    A phrasebook entry's stored suggestions, when they fit the request, or None
+    
+    They were looked up around the pack's city, so they only answer a
+    request without a location that names that city, or a landmark (whose
+    places are the landmark itself wherever the request comes from).
+    """
+    if packed is None or packed['suggestions'] is None or location:
+        return None
+    if city or packed['kind'] == 'landmark':
+        # A request naming a city only ever gets that city's pack
+        return packed['suggestions']
+    return None
+
+def lookup_suggestions(queries, location=None, radius=5000):
+    """Search Maps concurrently for each query, keeping those with results"""
+    suggestions = []
+    results = components.get('maps').search_places_many(queries, location, radius)
+    for query, places in zip(queries, results):
+        if places:
+            suggestions.append({
+                'query': query,
+                'places': places
+            })
+    return suggestions
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    """Body over MAX_UPLOAD_MB: answer 413 as JSON like the other API errors"""
+    return jsonify({'error': f"Request body too large (limit {app.config['MAX_CONTENT_LENGTH']} bytes)"}), 413
 
 @app.route('/')
 def home():
     """Home page"""
     return render_template('index.html')
 
+@app.route('/healthz')
+def liveness():
+    """Liveness probe: the process is up and serving requests"""
+    return jsonify({'status': 'alive', 'components': components.status()})
+
+@app.route('/readyz')
+def readiness():
+    """Readiness probe: preloads finished and no component failed to load"""
+    ready = components.is_ready()
+    return jsonify({
+        'status': 'ready' if ready else 'not_ready',
+        'components': components.status()
+    }), 200 if ready else 503
+
 @app.route('/api/translate', methods=['POST'])
 def translate_text():
     """
@@ -38,31 +547,206 @@ def translate_text():
     Request JSON:
     {
         "text": "Hello, where is the nearest restaurant?",
-        "source_lang": "english",
-        "target_lang": "hindi"
+        "source_lang": "english",  (optional; "auto" or omitted detects it)
+        "target_lang": "hindi",
+        "num_beams": 1,        (optional; 1 = greedy, at most 8)
+        "max_length": 256,     (optional; at most 512)
+        "city": "Delhi",       (optional; only consult this city's phrasebook)
+        "async": true          (optional; run as a background job, see submit_job)
     }
     """
     try:
         data = request.json
         text = data.get('text')
-        source_lang = data.get('source_lang', 'english')
         target_lang = data.get('target_lang', 'hindi')
         
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
-        translation = translator.translate(text, source_lang, target_lang)
+        generation, error = get_generation_options(data)
+        if error:
+            return error
+        
+        source_lang = resolve_source_lang(text, data.get('source_lang'))
+        disabled = direction_error(source_lang, target_lang)
+        if disabled:
+            return disabled
+        
+        def translate():
+            packed = None
+            if source_lang != target_lang:
+                packed = phrasebook_entry(text, source_lang, data.get('city'))
+            
+            if source_lang == target_lang:
+                # Already in the target language; nothing to translate
+                translation = text
+            elif packed is not None and target_lang in packed['translations']:
+                # Landmark or stock phrase translated when the pack was built
+                translation = packed['translations'][target_lang]
+            elif is_long_text(text):
+                # Multi-sentence input is segmented and batched on its own
+                translation = components.get('translator').translate_document(
+                    text,
+                    source_lang,
+                    target_lang,
+                    **generation
+                )
+            else:
+                translation = components.get('translation_batcher').translate(
+                    text,
+                    source_lang,
+                    target_lang,
+                    **generation
+                )
+            
+            return {
+                'original': text,
+                'translation': translation,
+                'source_lang': source_lang,
+                'target_lang': target_lang
+            }, 200
+        
+        if data.get('async') in (True, 1, '1', 'true'):
+            return submit_job('translate', translate, data)
+        
+        body, status = translate()
+        return jsonify(body), status
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/translate/batch', methods=['POST'])
+def translate_batch():
+    """
+    Translate many texts in one request with batched generate calls
+    
+    Request JSON:
+    {
+        "texts": ["Where is the station?", "How much is this?"],
+        "source_lang": "english",  (optional; "auto" or omitted detects it per text)
+        "target_lang": "hindi",
+        "num_beams": 1,        (optional; 1 = greedy, at most 8)
+        "max_length": 256      (optional; at most 512)
+    }
+    
+    Response "translations" (and "source_langs") are aligned with "texts".
+    """
+    try:
+        data = request.json
+        texts, error = get_batch_texts(data)
+        if error:
+            return error
+        generation, error = get_generation_options(data)
+        if error:
+            return error
+        
+        target_lang = data.get('target_lang', 'hindi')
+        source_langs = [resolve_source_lang(text, data.get('source_lang')) for text in texts]
+        for source_lang in set(source_langs):
+            disabled = direction_error(source_lang, target_lang)
+            if disabled:
+                return disabled
+        
+        # One batched call per source language; texts already in the target pass through
+        translations = list(texts)
+        for source_lang in set(source_langs) - {target_lang}:
+            indices = [i for i, lang in enumerate(source_langs) if lang == source_lang]
+            outputs = components.get('translator').batch_translate(
+                [texts[i] for i in indices],
+                source_lang,
+                target_lang,
+                **generation
+            )
+            for i, output in zip(indices, outputs):
+                translations[i] = output
         
         return jsonify({
-            'original': text,
-            'translation': translation,
-            'source_lang': source_lang,
+            'translations': translations,
+            'source_langs': source_langs,
             'target_lang': target_lang
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/translate/stream', methods=['POST'])
+def translate_text_stream():
+    """
+    Translate text, streaming each sentence as a server-sent event
+    
+    Request JSON: same as /api/translate
+    
+    Events:
+    - sentence: {"line": 0, "index": 0, "source": "...", "translation": "..."}
+    - translation: {"translation": "<full translation with original line breaks>"}
+    - done: {}
+    - error: {"error": "..."}
+    """
+    data = request.json or {}
+    text = data.get('text')
+    target_lang = data.get('target_lang', 'hindi')
+    
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    generation, error = get_generation_options(data)
+    if error:
+        return error
+    
+    source_lang = resolve_source_lang(text, data.get('source_lang'))
+    disabled = direction_error(source_lang, target_lang)
+    if disabled:
+        return disabled
+    
+    def events():
+        try:
+            yield from stream_translation(text, source_lang, target_lang, **generation)
+            yield sse_event('done', {})
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+    
+    return sse_response(events())
+
+@app.route('/api/translate/models', methods=['GET'])
+def translation_models():
+    """Load state, memory and load/unload counts of each translation model"""
+    if not components.is_loaded('translator'):
+        return jsonify({'loaded': False})
+    return jsonify(components.get('translator').status())
+
+@app.route('/api/translate/cache-stats', methods=['GET'])
+def translation_cache_stats():
+    """Hit/miss/eviction counters for the translation cache"""
+    return jsonify(translation_cache.stats())
+
+@app.route('/api/ocr/cache-stats', methods=['GET'])
+def ocr_cache_stats():
+    """Hit/miss/eviction counters for the OCR result cache"""
+    return jsonify(ocr_cache.stats())
+
+@app.route('/api/jobs', methods=['GET'])
+def job_queue_stats():
+    """Queue depth, running jobs and submission counters"""
+    return jsonify(components.get('jobs').stats())
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    State of a background job; once finished, "result" holds the response
+    the synchronous endpoint would have returned, with its "status_code"
+    """
+    job = components.get('jobs').get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a background job; a running job finishes but its result is discarded"""
+    job = components.get('jobs').cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job)
+
 @app.route('/api/extract-entities', methods=['POST'])
 def extract_entities():
     """
@@ -80,7 +764,7 @@ def extract_entities():
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
-        entities = ner_extractor.extract_entities(text)
+        entities = components.get('ner').extract_entities(text)
         
         return jsonify({
             'text': text,
@@ -90,6 +774,32 @@ def extract_entities():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/extract-entities/batch', methods=['POST'])
+def extract_entities_batch():
+    """
+    Extract entities from many texts in one request via nlp.pipe
+    
+    Request JSON:
+    {
+        "texts": ["Visit the Taj Mahal in Agra", "Is the Red Fort open today?"]
+    }
+    
+    Response "entities" is aligned with "texts".
+    """
+    try:
+        texts, error = get_batch_texts(request.json)
+        if error:
+            return error
+        
+        entities = list(components.get('ner').extract_entities_stream(texts, batch_size=len(texts)))
+        
+        return jsonify({
+            'entities': entities
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/ocr', methods=['POST'])
 def process_image():
     """
@@ -98,6 +808,15 @@ def process_image():
     Form data:
     - image: Image file
     - languages: Comma-separated language codes (optional)
+    - mode: Multi-language OCR strategy: sequential, parallel or combined (optional)
+    - profile: Preprocessing profile: fast, balanced or accurate (optional)
+    - regions: 1 to OCR only detected lines of text and return their boxes,
+      0 to OCR the whole frame (optional, default OCR_TEXT_REGIONS)
+    
+    With regions, each line is OCR'd with all languages at once and
+    binarized with its own Otsu threshold, so mode and the profile's
+    threshold setting do not apply; they only take effect when no lines
+    are found and the whole frame is OCR'd.
     """
     try:
         if 'image' not in request.files:
@@ -105,18 +824,128 @@ def process_image():
         
         image_file = request.files['image']
         languages = request.form.get('languages', 'english,hindi').split(',')
+        mode = request.form.get('mode')  # sequential, parallel or combined
+        profile = request.form.get('profile')  # fast, balanced or accurate
+        regions = request.form.get('regions', '1' if OCR_TEXT_REGIONS else '0') in ('1', 'true')
+        
+        ocr_processor = components.get('ocr')
+        invalid = check_ocr_options(ocr_processor, profile, mode)
+        if invalid:
+            return invalid
         
-        # Load image
-        image = Image.open(image_file.stream)
+        # Load image, decoding only as much resolution as preprocessing keeps
+        image = open_image(
+            image_file.stream,
+            max_pixels=MAX_IMAGE_PIXELS,
+            max_side=ocr_processor.max_side(profile)
+        )
+        
+        # Near-duplicates of an earlier upload skip preprocessing and OCR
+        image_hash = ocr_cache.image_hash(image)
+        cache_key = OCRCache.make_key(
+            'extract', languages,
+            mode=mode or ocr_processor.mode, profile=profile or ocr_processor.profile, regions=regions
+        )
+        result = ocr_cache.get(image_hash, cache_key)
         
         # Extract text
-        extracted_texts = ocr_processor.extract_text(image, languages)
+        timings = {}
+        cached = result is not None
+        if cached:
+            result = fit_cached_lines(ocr_processor, result, image)
+        else:
+            result = run_ocr(ocr_processor, image, languages, mode, profile, regions, timings)
+            if any(result['extracted_texts'].values()):
+                ocr_cache.set(image_hash, cache_key, result)
+        
+        return jsonify({
+            **result,
+            'languages': languages,
+            'cached': cached,
+            'timings_ms': timings
+        })
+        
+    except ImageIngestError as e:
+        return jsonify({'error': str(e)}), e.status_code
+        
+    except HTTPException:
+        # e.g. 413 from MAX_CONTENT_LENGTH while reading request.files
+        raise
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/ocr/batch', methods=['POST'])
+def process_images_batch():
+    """
+    Extract text from several uploaded images in one request
+    
+    Form data:
+    - images: Image files (repeat the field for each image)
+    - languages: Comma-separated language codes (optional)
+    - mode, profile, regions: as for /api/ocr (optional)
+    
+    Response "results" is aligned with the uploaded images; an image that
+    fails gets an "error" entry instead of failing the whole batch.
+    """
+    try:
+        image_files = request.files.getlist('images')
+        if not image_files:
+            return jsonify({'error': 'No images provided'}), 400
+        if len(image_files) > MAX_OCR_BATCH_IMAGES:
+            return jsonify({
+                'error': f'Too many images: {len(image_files)} (limit {MAX_OCR_BATCH_IMAGES})'
+            }), 400
+        
+        languages = request.form.get('languages', 'english,hindi').split(',')
+        mode = request.form.get('mode')
+        profile = request.form.get('profile')
+        regions = request.form.get('regions', '1' if OCR_TEXT_REGIONS else '0') in ('1', 'true')
+        ocr_processor = components.get('ocr')
+        invalid = check_ocr_options(ocr_processor, profile, mode)
+        if invalid:
+            return invalid
+        cache_key = OCRCache.make_key(
+            'extract', languages,
+            mode=mode or ocr_processor.mode, profile=profile or ocr_processor.profile, regions=regions
+        )
+        
+        def process(image_file):
+            try:
+                image = open_image(
+                    image_file.stream,
+                    max_pixels=MAX_IMAGE_PIXELS,
+                    max_side=ocr_processor.max_side(profile)
+                )
+                image_hash = ocr_cache.image_hash(image)
+                result = ocr_cache.get(image_hash, cache_key)
+                cached = result is not None
+                if cached:
+                    result = fit_cached_lines(ocr_processor, result, image)
+                else:
+                    result = run_ocr(ocr_processor, image, languages, mode, profile, regions)
+                    if any(result['extracted_texts'].values()):
+                        ocr_cache.set(image_hash, cache_key, result)
+                return {
+                    'filename': image_file.filename,
+                    **result,
+                    'cached': cached
+                }
+            except Exception as e:
+                return {'filename': image_file.filename, 'error': str(e)}
+        
+        # Images are independent; tesseract runs as subprocesses, so threads overlap well
+        results = list(background_executor.map(process, image_files))
         
         return jsonify({
-            'extracted_texts': extracted_texts,
+            'results': results,
             'languages': languages
         })
         
+    except HTTPException:
+        # e.g. 413 from MAX_CONTENT_LENGTH while reading request.files
+        raise
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -125,58 +954,396 @@ def travel_assist():
     """
     Complete travel assistance pipeline:
     1. Extract entities from query
-    2. Translate if needed
-    3. Get location suggestions
+    2. Translate if needed (concurrently with 1)
+    3. Get location suggestions (once 1 is done)
     
     Request JSON:
     {
         "text": "Where can I find good restaurants near India Gate?",
+        "source_lang": "english",   (optional; detected when omitted)
         "target_lang": "hindi",
-        "include_suggestions": true
+        "include_suggestions": true,
+        "location": "28.61,77.21",  (optional; bias suggestions to this point)
+        "radius": 5000,             (optional; meters around location)
+        "city": "Delhi",            (optional; only consult this city's phrasebook)
+        "debug": false         (optional; include per-stage timings)
     }
+    
+    Landmarks and stock phrases found in a phrasebook pack are answered from
+    it (entities, translation and, without a location, suggestions for
+    landmarks or when "city" names the pack's city) instead of running the
+    models and Maps; the response then names the pack.
     """
     try:
         data = request.json
         text = data.get('text')
         target_lang = data.get('target_lang')
         include_suggestions = data.get('include_suggestions', True)
+        location = data.get('location')
+        radius = int(data.get('radius', 5000))
         
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
+        source_lang = resolve_source_lang(text, data.get('source_lang'))
+        if target_lang:
+            disabled = direction_error(source_lang, target_lang)
+            if disabled:
+                return disabled
+        packed = phrasebook_entry(text, source_lang, data.get('city'))
+        
+        # Entities and translation are independent; suggestions need entities
+        pipeline = StagePipeline(background_executor, deadline=STAGE_DEADLINE)
+        if packed is not None:
+            pipeline.add('entities', lambda: packed, timeout=STAGE_TIMEOUTS['entities'])
+        else:
+            pipeline.add(
+                'entities',
+                lambda: components.get('ner').analyze(text),
+                timeout=STAGE_TIMEOUTS['entities']
+            )
+        if target_lang and target_lang != source_lang:
+            if packed is not None and target_lang in packed['translations']:
+                translation = packed['translations'][target_lang]
+                pipeline.add('translation', lambda: translation, timeout=STAGE_TIMEOUTS['translation'])
+            else:
+                pipeline.add(
+                    'translation',
+                    lambda: components.get('translation_batcher').translate(text, source_lang, target_lang),
+                    timeout=STAGE_TIMEOUTS['translation']
+                )
+        if include_suggestions:
+            stored_suggestions = packed_suggestions(packed, data.get('city'), location)
+            if stored_suggestions is not None:
+                # Looked up around the pack's city when it was built
+                pipeline.add(
+                    'suggestions',
+                    lambda: stored_suggestions,
+                    timeout=STAGE_TIMEOUTS['suggestions']
+                )
+            else:
+                # Limit to 3 locations, searched concurrently
+                pipeline.add(
+                    'suggestions',
+                    lambda analysis: lookup_suggestions(analysis['map_locations'][:3], location, radius),
+                    deps=['entities'],
+                    timeout=STAGE_TIMEOUTS['suggestions']
+                )
+        outcome = pipeline.run()
+        
         response = {
             'original_text': text
         }
+        if packed is not None:
+            response['phrasebook'] = {'city': packed['city'], 'version': packed['version']}
         
-        # Extract entities
-        entities = ner_extractor.extract_entities(text)
-        response['entities'] = entities
+        analysis = outcome.get('entities')
+        if analysis is not None:
+            response['entities'] = analysis['entities']
+        if outcome.get('translation') is not None:
+            response['translation'] = outcome.get('translation')
+        if outcome.get('suggestions') is not None:
+            response['suggestions'] = outcome.get('suggestions')
         
-        # Translate if requested
-        if target_lang and target_lang != 'english':
-            translation = translator.translate(text, 'english', target_lang)
-            response['translation'] = translation
-        
-        # Get location suggestions
-        if include_suggestions:
-            locations = ner_extractor.extract_locations_for_maps(text)
-            suggestions = []
-            
-            for location in locations[:3]:  # Limit to 3 locations
-                places = maps_helper.search_places(location)
-                if places:
-                    suggestions.append({
-                        'query': location,
-                        'places': places
-                    })
-            
-            response['suggestions'] = suggestions
+        add_stage_report(response, [outcome], data.get('debug'))
         
         return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/travel-assist/stream', methods=['POST'])
+def travel_assist_stream():
+    """
+    Travel assistance pipeline as server-sent events
+    
+    Request JSON: same as /api/travel-assist (phrasebook entries included)
+    
+    Events, each sent as soon as it is ready:
+    - entities: {"entities": {...}}
+    - sentence: one per translated sentence (if target_lang is set)
+    - translation: {"translation": "..."}
+    - suggestions: {"suggestions": [...]}
+    - done: {}
+    """
+    data = request.json or {}
+    text = data.get('text')
+    target_lang = data.get('target_lang')
+    include_suggestions = data.get('include_suggestions', True)
+    location = data.get('location')
+    radius = int(data.get('radius', 5000))
+    
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    
+    source_lang = resolve_source_lang(text, data.get('source_lang'))
+    if target_lang:
+        disabled = direction_error(source_lang, target_lang)
+        if disabled:
+            return disabled
+    packed = phrasebook_entry(text, source_lang, data.get('city'))
+    
+    def events():
+        try:
+            analysis = packed if packed is not None else components.get('ner').analyze(text)
+            yield sse_event('entities', {'entities': analysis['entities']})
+            
+            # Start map lookups in the background while translation streams
+            suggestions = None
+            if include_suggestions:
+                stored_suggestions = packed_suggestions(packed, data.get('city'), location)
+                if stored_suggestions is not None:
+                    yield sse_event('suggestions', {'suggestions': stored_suggestions})
+                else:
+                    suggestions = background_executor.submit(
+                        lookup_suggestions, analysis['map_locations'][:3], location, radius
+                    )
+            
+            stored = packed['translations'].get(target_lang) if packed is not None else None
+            if target_lang and target_lang != source_lang:
+                translations = (
+                    [sse_event('translation', {'translation': stored})] if stored is not None
+                    else stream_translation(text, source_lang, target_lang)
+                )
+                for event in translations:
+                    yield event
+                    if suggestions is not None and suggestions.done():
+                        yield sse_event('suggestions', {'suggestions': suggestions.result()})
+                        suggestions = None
+            
+            if suggestions is not None:
+                yield sse_event('suggestions', {'suggestions': suggestions.result()})
+            
+            yield sse_event('done', {})
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+    
+    return sse_response(events())
+
+@app.route('/api/nearby', methods=['GET'])
+def nearby_places():
+    """
+    Places near a point, served from the in-process spatial index
+    
+    Query parameters:
+    - lat, lng: Center point
+    - radius: Meters (default 2000)
+    - type: Optional place type, e.g. restaurant
+    - min_rating: Optional minimum rating
+    - limit: Maximum results (default 20)
+    """
+    try:
+        lat = float(request.args['lat'])
+        lng = float(request.args['lng'])
+        radius = int(request.args.get('radius', 2000))
+        min_rating = request.args.get('min_rating', type=float)
+        limit = int(request.args.get('limit', 20))
+    except (KeyError, ValueError):
+        return jsonify({'error': 'lat and lng are required numbers'}), 400
+    
+    try:
+        places = components.get('maps').search_nearby(
+            lat, lng, radius, request.args.get('type'), min_rating, limit
+        )
+        return jsonify({'places': places, 'count': len(places)})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/phrasebooks', methods=['GET'])
+def list_phrasebooks():
+    """Offline phrasebook packs this server has, with their versions and download URLs"""
+    try:
+        packs = [
+            {**pack.info(), 'download_url': f"/api/phrasebooks/{pack.slug}"}
+            for pack in components.get('phrasebooks').packs()
+        ]
+        return jsonify({'phrasebooks': packs, 'count': len(packs)})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/phrasebooks/<city>', methods=['GET'])
+def download_phrasebook(city):
+    """
+    Download a city's phrasebook pack (SQLite) for offline use
+    
+    Supports If-None-Match/If-Modified-Since and Range, so a client holding
+    the current version gets a 304. The version is also in the
+    X-Phrasebook-Version header.
+    """
+    pack = components.get('phrasebooks').get(city)
+    if pack is None:
+        return jsonify({'error': f"No phrasebook for {city}"}), 404
+    
+    try:
+        # Read again: the file may have been rebuilt since the pack was opened
+        from app.utils.phrasebook import read_meta
+        version = read_meta(pack.db_path).get('version', pack.version)
+        response = send_file(
+            pack.db_path,
+            mimetype='application/vnd.sqlite3',
+            as_attachment=True,
+            download_name=f"{pack.slug}-v{version}.db",
+            conditional=True
+        )
+        response.headers['X-Phrasebook-Version'] = str(version)
+        return response
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/phrasebooks/<city>/search', methods=['GET'])
+def search_phrasebook(city):
+    """
+    Landmarks and phrases in a city's pack starting with a prefix
+    
+    Query parameters:
+    - q: Prefix, matched case- and accent-insensitively
+    - lang: Optional language to include translations in
+    - limit: Maximum results (default 10)
+    """
+    pack = components.get('phrasebooks').get(city)
+    if pack is None:
+        return jsonify({'error': f"No phrasebook for {city}"}), 404
+    
+    try:
+        limit = min(int(request.args.get('limit', 10)), 100)
+    except ValueError:
+        return jsonify({'error': 'limit must be a number'}), 400
+    
+    try:
+        results = pack.search(request.args.get('q', ''), limit, request.args.get('lang'))
+        return jsonify({
+            'city': pack.city,
+            'version': pack.version,
+            'results': results,
+            'count': len(results)
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def run_image_assist(image, target_lang, languages, debug=False):
+    """
+    OCR + translation + entity extraction for /api/image-assist
+    
+    Returns:
+        (response body, HTTP status code)
+    """
+    ocr_processor = components.get('ocr')
+    
+    # A near-duplicate of an earlier upload skips preprocessing and OCR
+    image_hash = ocr_cache.image_hash(image)
+    cache_key = OCRCache.make_key(
+        'detect', languages, profile=ocr_processor.profile, regions=OCR_TEXT_REGIONS
+    )
+    cached = ocr_cache.get(image_hash, cache_key)
+    
+    def read_text(prepared):
+        # Lines of text only when any are found, else the whole frame
+        if OCR_TEXT_REGIONS:
+            texts, lines = ocr_processor.extract_text_regions(prepared, languages, upload_size(image))
+            if lines:
+                return detect_text_language('\n'.join(texts.values()), languages), texts, lines
+            prepared = ocr_processor.preprocess_image(image)
+        detected, texts = ocr_processor.extract_text_with_language(prepared, languages)
+        return detected, texts, []
+    
+    outcomes = []
+    if cached is not None:
+        cached = fit_cached_lines(ocr_processor, cached, image)
+        detected_lang, texts, lines = cached['language'], cached['texts'], cached['lines']
+    else:
+        # Preprocess once, then a single combined OCR pass over every
+        # candidate language; the language is read off the scripts in the
+        # recognized text, so no separate OSD pass is needed
+        ocr_pipeline = StagePipeline(background_executor, deadline=STAGE_DEADLINE)
+        ocr_pipeline.add(
+            'preprocess',
+            lambda: (ocr_processor.preprocess_gray if OCR_TEXT_REGIONS else ocr_processor.preprocess_image)(image),
+            timeout=STAGE_TIMEOUTS['ocr']
+        )
+        ocr_pipeline.add(
+            'ocr',
+            read_text,
+            deps=['preprocess'],
+            timeout=STAGE_TIMEOUTS['ocr']
+        )
+        ocr_outcome = ocr_pipeline.run()
+        outcomes.append(ocr_outcome)
+        
+        detected_lang, texts, lines = ocr_outcome.get('ocr', ('english', {}, []))
+        if any(texts.values()):
+            ocr_cache.set(image_hash, cache_key, {
+                'language': detected_lang, 'texts': texts, 'lines': lines,
+                'image_size': list(upload_size(image))
+            })
+    
+    # Languages sharing a script get the same text; keep it once
+    extracted_text = '\n'.join(text for text in dict.fromkeys(texts.values()) if text)
+    
+    if not extracted_text:
+        if outcomes and outcomes[0].partial:
+            return {
+                'error': 'Text extraction did not complete',
+                'stages': outcomes[0].incomplete()
+            }, 504
+        return {'error': 'No text detected in image'}, 400
+    
+    # Translate the most prominent text not already in the target
+    # language (e.g. the English half of a bilingual Hindi/English sign)
+    scores = language_scores(extracted_text, languages)
+    source_lang = max(
+        (lang for lang in scores if lang != target_lang and texts.get(lang)),
+        key=scores.get,
+        default=None
+    )
+    english_text = texts.get('english')
+    
+    # Entity extraction and translation only need the text. The NER model is
+    # English-only: without English on the sign it reads the English
+    # translation if there is one, and is skipped otherwise
+    text_pipeline = StagePipeline(background_executor, deadline=STAGE_DEADLINE)
+    if english_text:
+        text_pipeline.add(
+            'entities',
+            lambda: components.get('ner').extract_entities(english_text),
+            timeout=STAGE_TIMEOUTS['entities']
+        )
+    elif source_lang is not None and target_lang == 'english':
+        text_pipeline.add(
+            'entities',
+            lambda translation: components.get('ner').extract_entities(translation),
+            deps=['translation'],
+            timeout=STAGE_TIMEOUTS['entities']
+        )
+    if source_lang is not None:
+        # OCR output (menus, notice boards) is usually multi-line
+        text_pipeline.add(
+            'translation',
+            lambda: components.get('translator').translate_document(
+                texts[source_lang], source_lang, target_lang
+            ),
+            timeout=STAGE_TIMEOUTS['translation']
+        )
+    text_outcome = text_pipeline.run()
+    
+    response = {
+        'detected_language': detected_lang,
+        'extracted_text': extracted_text,
+        'lines': lines,
+        'image_size': list(upload_size(image)),
+        'source_lang': source_lang,
+        'translation': text_outcome.get('translation'),
+        'entities': text_outcome.get('entities'),
+        'ocr_cached': cached is not None
+    }
+    
+    add_stage_report(response, outcomes + [text_outcome], debug)
+    
+    return response, 200
+
 @app.route('/api/image-assist', methods=['POST'])
 def image_assist():
     """
@@ -185,6 +1352,10 @@ def image_assist():
     Form data:
     - image: Image file
     - target_lang: Target language for translation
+    - languages: Comma-separated candidate languages to read (optional,
+      default IMAGE_ASSIST_LANGUAGES)
+    - debug: 1 to include per-stage timings (optional)
+    - async, priority, callback_url: run as a background job (see submit_job)
     """
     try:
         if 'image' not in request.files:
@@ -192,40 +1363,51 @@ def image_assist():
         
         image_file = request.files['image']
         target_lang = request.form.get('target_lang', 'english')
+        languages = [
+            lang.strip().lower()
+            for lang in request.form.get('languages', IMAGE_ASSIST_LANGUAGES).split(',')
+            if lang.strip()
+        ]
         
-        # Load image
-        image = Image.open(image_file.stream)
+        debug = request.form.get('debug')
+        ocr_processor = components.get('ocr')
         
-        # Detect language and extract text
-        detected_lang = ocr_processor.detect_language(image)
-        extracted_texts = ocr_processor.extract_text(
-            image, 
-            languages=['english', detected_lang]
+        # Load image, decoding only as much resolution as preprocessing keeps
+        image = open_image(
+            image_file.stream,
+            max_pixels=MAX_IMAGE_PIXELS,
+            max_side=ocr_processor.max_side()
         )
         
-        # Process the extracted text
-        primary_text = extracted_texts.get('english') or extracted_texts.get(detected_lang)
+        if request.form.get('async') in ('1', 'true'):
+            return submit_job(
+                'image-assist',
+                lambda: run_image_assist(image, target_lang, languages, debug),
+                request.form
+            )
         
-        if not primary_text:
-            return jsonify({'error': 'No text detected in image'}), 400
+        body, status = run_image_assist(image, target_lang, languages, debug)
+        return jsonify(body), status
         
-        # Extract entities
-        entities = ner_extractor.extract_entities(primary_text)
+    except ImageIngestError as e:
+        return jsonify({'error': str(e)}), e.status_code
         
-        # Translate if needed
-        translation = None
-        if target_lang != 'english':
-            translation = translator.translate(primary_text, 'english', target_lang)
-        
-        return jsonify({
-            'detected_language': detected_lang,
-            'extracted_text': primary_text,
-            'translation': translation,
-            'entities': entities
-        })
+    except HTTPException:
+        # e.g. 413 from MAX_CONTENT_LENGTH while reading request.files
+        raise
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; use `gunicorn -c gunicorn.conf.py app.main:app`
+    # in production. The reloader is off by default because it imports (and
+    # loads models in) a second process.
+    debug = os.getenv('FLASK_DEBUG', '').lower() in ('1', 'true')
+    app.run(
+        debug=debug,
+        use_reloader=debug and os.getenv('FLASK_RELOAD', '').lower() in ('1', 'true'),
+        host='0.0.0.0',
+        port=int(os.getenv('PORT', 5000)),
+        threaded=True
+    )
@@ -0,0 +1,72 @@
+"""
+Bulk entity extraction over JSONL dumps
+
+Reads one JSON object per line, extracts travel entities from its text
+field with TravelNER.extract_entities_stream and writes the record back
+out with an added "entities" field.
+
+Usage (from the tourlingo/ directory):
+    python -m app.ner_batch reviews.jsonl -o reviews.entities.jsonl --n-process 4
+"""
+import argparse
+import json
+import sys
+
+from app.utils.ner_extractor import TravelNER
+
+
+def iter_records(lines, text_field='text'):
+    """Yield (text, record) pairs, skipping blank lines and records without text"""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Skipping line {line_number}: {e}", file=sys.stderr)
+            continue
+
+        text = record.get(text_field)
+        if isinstance(text, str) and text:
+            yield text, record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract travel entities from a JSONL file")
+    parser.add_argument('input', help="JSONL file, or - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="Output JSONL file (default: stdout)")
+    parser.add_argument('--text-field', default='text')
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--model', default='en_core_web_md')
+    args = parser.parse_args()
+
+    ner = TravelNER(model_name=args.model)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+
+    count = 0
+    try:
+        results = ner.extract_entities_stream(
+            iter_records(source, args.text_field),
+            batch_size=args.batch_size,
+            n_process=args.n_process,
+            as_tuples=True
+        )
+        for entities, record in results:
+            record['entities'] = entities
+            sink.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(f"Processed {count} documents", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+Build an offline phrasebook pack for one city
+
+Runs the city's landmark list and a stock phrase list (in English) through
+TravelNER, IndicTranslator (into every language it supports, or
+--languages) and GoogleMapsHelper once, and writes a versioned SQLite pack
+the server answers matching requests from (PHRASEBOOK_DIR) and clients
+download from /api/phrasebooks/<city>.
+
+Rebuilds are incremental: an entry's entities are only recomputed when its
+text or the NER model changed, a translation when the text, model, backend
+or generation settings changed, and Maps suggestions when their queries
+changed or they are older than --places-max-age-days. Landmarks and
+phrases dropped from the lists are removed. The pack version only goes up
+when something changed.
+
+Input files have one landmark or phrase per line; blank lines and lines
+starting with # are skipped.
+
+Usage (from the tourlingo/ directory):
+    python -m app.phrasebook_build Delhi --landmarks data/phrasebook_delhi.txt --phrases data/phrasebook_phrases.txt
+    python -m app.phrasebook_build Delhi --landmarks data/phrasebook_delhi.txt --languages hindi,tamil --no-places
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from app.utils.gazetteer import normalize
+from app.utils.phrasebook import PhrasebookBuilder, pack_slug
+from app.utils.translation_cache import TranslationCache
+
+# Landmark and phrase lists are written in English; the en-indic model
+# translates them into every other language it supports
+SOURCE_LANG = 'english'
+
+
+def fingerprint(*parts) -> str:
+    """Short stable hash of a build input, stored next to the result it produced"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def read_entries(landmarks_path, phrases_path):
+    """(kind, text) pairs, landmarks first; the first of two equal normalized texts wins"""
+    entries, seen = [], set()
+    for kind, path in (('landmark', landmarks_path), ('phrase', phrases_path)):
+        if not path:
+            continue
+        for text in TranslationCache.load_phrases(path):
+            key = normalize(text)
+            if key and key not in seen:
+                seen.add(key)
+                entries.append((kind, text))
+    return entries
+
+
+def build_analyses(builder, entries, previous, ner, ner_version):
+    """Entities for new or changed entries; returns {normalized text: (entry id, analysis)}"""
+    results, todo = {}, []
+    for kind, text in entries:
+        key = normalize(text)
+        stored = previous.get(key)
+        entry_fingerprint = fingerprint(kind, text, ner_version)
+        if stored is not None and stored['analysis_fingerprint'] == entry_fingerprint:
+            results[key] = (stored['id'], stored['analysis'])
+        else:
+            todo.append((kind, text, entry_fingerprint))
+
+    texts = [text for _, text, _ in todo]
+    for (kind, text, entry_fingerprint), entities in zip(todo, ner.extract_entities_stream(texts)):
+        analysis = {
+            'entities': entities,
+            'map_locations': ner.extract_locations_for_maps(text, entities)
+        }
+        results[normalize(text)] = (builder.put_entry(kind, text, analysis, entry_fingerprint), analysis)
+    return results, len(todo)
+
+
+def build_translations(builder, entries, ids, previous, translator, languages, batch_size=16):
+    """
+    Translate new or changed entries into each language
+
+    A batch whose generate call fails is reported and not written, so its
+    entries keep their old fingerprint and the next build retries them.
+
+    Returns:
+        (number translated, number that failed)
+    """
+    src_code = translator.lang_codes[SOURCE_LANG]
+    model = f"{translator.model_name}:{translator.backend.name}"
+    translated = failed = 0
+
+    for lang in languages:
+        tgt_code = translator.lang_codes[lang]
+        todo = []
+        for _, text in entries:
+            key = normalize(text)
+            stored = previous.get(key, {}).get('translations', {})
+            entry_fingerprint = fingerprint(text, src_code, tgt_code, model, translator.generation_params)
+            if stored.get(lang) != entry_fingerprint:
+                todo.append((ids[key], text, entry_fingerprint))
+        if not todo:
+            continue
+
+        if not translator.is_loaded:
+            translator.load_model()
+        done = 0
+        for start in range(0, len(todo), batch_size):
+            chunk = todo[start:start + batch_size]
+            try:
+                outputs = translator.batch_translate(
+                    [text for _, text, _ in chunk], SOURCE_LANG, lang, batch_size=batch_size
+                )
+            except Exception as e:
+                failed += len(chunk)
+                print(f"{lang}: {len(chunk)} translations failed: {e}", file=sys.stderr)
+                continue
+            for (entry_id, _, entry_fingerprint), output in zip(chunk, outputs):
+                builder.put_translation(entry_id, lang, output, entry_fingerprint)
+            done += len(chunk)
+        translated += done
+        print(f"{lang}: {done} translated", file=sys.stderr)
+    return translated, failed
+
+
+def build_suggestions(builder, entries, analyses, previous, maps, location, radius, max_age):
+    """Maps suggestions for entries whose queries changed or went stale; returns the number looked up"""
+    looked_up = 0
+    for kind, text in entries:
+        key = normalize(text)
+        entry_id, analysis = analyses[key]
+        # A landmark is its own query; a phrase is searched like /api/travel-assist does
+        queries = [text] if kind == 'landmark' else analysis['map_locations'][:3]
+        entry_fingerprint = fingerprint(queries, location, radius)
+
+        stored = previous.get(key)
+        if (stored is not None and stored['suggestions_fingerprint'] == entry_fingerprint
+                and time.time() - (stored['suggestions_built'] or 0) < max_age):
+            continue
+
+        results = maps.search_places_many(queries, location, radius) if queries else []
+        suggestions = [
+            {'query': query, 'places': places}
+            for query, places in zip(queries, results) if places
+        ]
+        builder.put_suggestions(entry_id, suggestions, entry_fingerprint)
+        looked_up += 1
+    return looked_up
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an offline phrasebook pack for one city")
+    parser.add_argument('city', help="City name, e.g. Delhi")
+    parser.add_argument('--landmarks', help="File with one landmark name per line")
+    parser.add_argument('--phrases', help="File with one stock phrase per line")
+    parser.add_argument('-o', '--output', help="Pack file (default data/phrasebooks/<city>.db)")
+    parser.add_argument('--languages', help="Comma-separated targets (default: every supported language)")
+    parser.add_argument('--backend', default=os.getenv('TRANSLATE_BACKEND', 'torch'))
+    parser.add_argument('--model-dir', default=os.getenv('TRANSLATE_MODEL_DIR', 'models/indictrans2'))
+    parser.add_argument('--num-beams', type=int, default=5)
+    parser.add_argument('--ner-model', default='en_core_web_md')
+    parser.add_argument('--no-places', action='store_true', help="Skip Maps lookups (offline build)")
+    parser.add_argument('--gazetteer', default=os.getenv('GAZETTEER_DB', 'data/gazetteer.db'))
+    parser.add_argument('--radius', type=int, default=15000, help="Suggestion radius around the city, meters")
+    parser.add_argument('--places-max-age-days', type=float, default=30,
+                        help="Redo Maps lookups older than this")
+    parser.add_argument('--force', action='store_true', help="Recompute every entry")
+    args = parser.parse_args()
+
+    if not args.landmarks and not args.phrases:
+        parser.error("give --landmarks, --phrases or both")
+
+    from app.utils.ner_extractor import TravelNER
+    from app.utils.translator import IndicTranslator
+
+    # Translations go into every en-indic target; the model only loads if
+    # something needs translating
+    translator = IndicTranslator(
+        model_dir=args.model_dir, backend=args.backend, num_beams=args.num_beams,
+        direction='en-indic', lazy=True
+    )
+    languages = [
+        lang.strip() for lang in (args.languages or ','.join(translator.lang_codes)).split(',')
+        if lang.strip() and lang.strip() != SOURCE_LANG
+    ]
+    unknown = [lang for lang in languages if lang not in translator.lang_codes]
+    if unknown:
+        parser.error(f"unknown languages {unknown}, expected some of {list(translator.lang_codes)}")
+
+    entries = read_entries(args.landmarks, args.phrases)
+    output = args.output or os.path.join('data', 'phrasebooks', f"{pack_slug(args.city)}.db")
+    builder = PhrasebookBuilder(output, force=args.force)
+    previous = builder.entries()
+
+    # Entities
+    ner = TravelNER(args.ner_model)
+    ner_version = f"{args.ner_model}:{ner.nlp.meta.get('version')}"
+    analyses, analysed = build_analyses(builder, entries, previous, ner, ner_version)
+    print(f"{analysed} of {len(entries)} entries analysed", file=sys.stderr)
+
+    ids = {key: entry_id for key, (entry_id, _) in analyses.items()}
+    translated, failed = build_translations(builder, entries, ids, previous, translator, languages)
+    print(f"{translated} translations", file=sys.stderr)
+
+    # Maps suggestions
+    if not args.no_places:
+        from app.utils.maps_helper import GoogleMapsHelper
+
+        gazetteer = None
+        if args.gazetteer and os.path.exists(args.gazetteer):
+            from app.utils.gazetteer import Gazetteer
+            gazetteer = Gazetteer(args.gazetteer)
+        maps = GoogleMapsHelper(gazetteer=gazetteer)
+        center = maps.geocode_address(args.city)
+        location = f"{center['lat']},{center['lng']}" if center else None
+        looked_up = build_suggestions(
+            builder, entries, analyses, previous, maps, location, args.radius,
+            args.places_max_age_days * 86400
+        )
+        maps.close()
+        print(f"{looked_up} entries looked up on Maps", file=sys.stderr)
+
+    removed = builder.keep_only([text for _, text in entries], languages)
+    summary = builder.finish(
+        args.city, SOURCE_LANG, languages,
+        source=','.join(filter(None, [args.landmarks, args.phrases]))
+    )
+    print(f"Wrote {summary['path']} version {summary['version']} "
+          f"({summary['changes']} changes, {removed} rows removed)", file=sys.stderr)
+    if failed:
+        # The pack is still usable; the failed entries are retried next run
+        print(f"{failed} translations failed; rerun the build to retry them", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
+
+
+class _PendingRequest:
+    """A single queued translation waiting for its batch"""
+
+    __slots__ = ('text', 'source_lang', 'target_lang', 'num_beams', 'max_length', 'future')
+
+    def __init__(self, text: str, source_lang: str, target_lang: str,
+                 num_beams: int = None, max_length: int = None):
+        self.text = text
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.num_beams = num_beams
+        self.max_length = max_length
+        self.future = Future()
+
+
+class MicroBatcher:
+    def __init__(self, translator, max_batch_size: int = 16, max_wait_ms: float = 10,
+                 length_bucket: int = 64, name: str = 'translate-batcher'):
+        """
+        Coalesce concurrent translation requests into batched generate calls
+
+        Args:
+            translator: IndicTranslator (anything with batch_translate)
+            max_batch_size: Maximum number of texts per generate call
+            max_wait_ms: How long to hold the first request while collecting more
+            length_bucket: Character width of a length bucket; texts in the
+                same bucket are padded together
+            name: Worker thread name
+        """
+        self.translator = translator
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.length_bucket = length_bucket
+
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name=name, daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, text: str, source_lang: str = 'english', target_lang: str = 'hindi',
+               num_beams: int = None, max_length: int = None) -> Future:
+        """Queue a translation and return a Future for its result"""
+        cached_translation = getattr(self.translator, 'cached_translation', None)
+        if cached_translation is not None:
+            cached = cached_translation(text, source_lang, target_lang, num_beams, max_length)
+            if cached is not None:
+                # Cache hits skip the batching window entirely
+                future = Future()
+                future.set_result(cached)
+                return future
+
+        pending = _PendingRequest(
+            text, source_lang.lower(), target_lang.lower(), num_beams, max_length
+        )
+        self._queue.put(pending)
+        return pending.future
+
+    def translate(self, text: str, source_lang: str = 'english', target_lang: str = 'hindi',
+                  num_beams: int = None, max_length: int = None, timeout: float = None) -> str:
+        """Blocking helper with the same signature as IndicTranslator.translate"""
+        return self.submit(
+            text, source_lang, target_lang, num_beams, max_length
+        ).result(timeout=timeout)
+
+    def close(self, timeout: float = 30):
+        """Finish queued requests, then stop the worker thread"""
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            stop = None in batch
+            batch = [pending for pending in batch if pending is not None]
+            for group in self._group(batch).values():
+                self._execute(group)
+            if stop:
+                return
+
+    def _collect(self) -> List[_PendingRequest]:
+        """Block for one request, then gather more until full or the window closes"""
+        batch = [self._queue.get()]
+        if batch[0] is None:
+            return batch
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(pending)
+            if pending is None:
+                break
+
+        return batch
+
+    def _group(self, batch: List[_PendingRequest]) -> Dict[Tuple, List[_PendingRequest]]:
+        """Group requests by language pair, generation settings and similar length"""
+        groups = {}
+        for pending in batch:
+            key = (
+                pending.source_lang,
+                pending.target_lang,
+                pending.num_beams,
+                pending.max_length,
+                len(pending.text) // self.length_bucket
+            )
+            groups.setdefault(key, []).append(pending)
+        return groups
+
+    def _execute(self, group: List[_PendingRequest]):
+        first = group[0]
+
+        try:
+            translations = self.translator.batch_translate(
+                [pending.text for pending in group],
+                first.source_lang,
+                first.target_lang,
+                batch_size=self.max_batch_size,
+                check_cache=False,
+                num_beams=first.num_beams,
+                max_length=first.max_length
+            )
+        except Exception as e:
+            for pending in group:
+                pending.future.set_exception(e)
+            return
+
+        for pending, translation in zip(group, translations):
+            pending.future.set_result(translation)
+
+
+class ModelRoutedBatcher:
+    """
+    One MicroBatcher per model of a TranslatorPool
+
+    Each checkpoint gets its own queue and worker thread, so requests are
+    batched only with others for the same model, and loading one model on
+    demand never holds up requests for another.
+    """
+
+    def __init__(self, pool, **batcher_options):
+        """
+        Args:
+            pool: TranslatorPool routing language pairs to models
+            batcher_options: MicroBatcher settings used for every model
+        """
+        self.pool = pool
+        self.batcher_options = batcher_options
+        self._batchers = {}
+        self._lock = threading.Lock()
+
+    def submit(self, text: str, source_lang: str = 'english', target_lang: str = 'hindi',
+               num_beams: int = None, max_length: int = None) -> Future:
+        # Raises DirectionNotEnabledError here, not in the worker thread
+        direction = self.pool.check_direction(source_lang, target_lang)
+        if direction is None:
+            future = Future()
+            future.set_result(text)
+            return future
+        return self._batcher(direction).submit(text, source_lang, target_lang, num_beams, max_length)
+
+    def translate(self, text: str, source_lang: str = 'english', target_lang: str = 'hindi',
+                  num_beams: int = None, max_length: int = None, timeout: float = None) -> str:
+        """Blocking helper with the same signature as IndicTranslator.translate"""
+        return self.submit(
+            text, source_lang, target_lang, num_beams, max_length
+        ).result(timeout=timeout)
+
+    def close(self, timeout: float = 30):
+        """Finish queued requests on every model, then stop the worker threads"""
+        with self._lock:
+            batchers = list(self._batchers.values())
+        for batcher in batchers:
+            batcher.close(timeout)
+
+    def _batcher(self, direction: str) -> MicroBatcher:
+        with self._lock:
+            if direction not in self._batchers:
+                self._batchers[direction] = MicroBatcher(
+                    self.pool, name=f'translate-batcher-{direction}', **self.batcher_options
+                )
+            return self._batchers[direction]
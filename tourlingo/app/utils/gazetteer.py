@@ -0,0 +1,282 @@
+import difflib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, Iterator, List
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS places (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        address TEXT,
+        lat REAL NOT NULL,
+        lng REAL NOT NULL,
+        types TEXT NOT NULL DEFAULT '',
+        population INTEGER NOT NULL DEFAULT 0,
+        source_id TEXT UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS aliases (
+        id INTEGER PRIMARY KEY,
+        place_id INTEGER NOT NULL REFERENCES places(id),
+        alias TEXT NOT NULL,
+        normalized TEXT NOT NULL,
+        UNIQUE (normalized, place_id)
+    )""",
+    # External-content FTS index over the normalized aliases, used to find
+    # fuzzy-match candidates by token prefix
+    """CREATE VIRTUAL TABLE IF NOT EXISTS aliases_fts USING fts5(
+        normalized, content='aliases', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+]
+
+PLACE_COLUMNS = "p.id, p.name, p.address, p.lat, p.lng, p.types, a.normalized"
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize a place name for matching
+
+    Case-folds, strips accents from Latin letters (Indic vowel signs and
+    nuktas are kept), turns punctuation into spaces and drops a leading
+    "the", so "The Humayun's Tomb" and "humayun s tomb" compare equal.
+    """
+    text = unicodedata.normalize('NFKC', text).casefold()
+
+    chars = []
+    for ch in unicodedata.normalize('NFD', text):
+        # Drop combining marks on Latin letters only (below U+0250)
+        if unicodedata.combining(ch) and chars and chars[-1] < '\u0250':
+            continue
+        chars.append(' ' if unicodedata.category(ch)[0] in 'PSZ' else ch)
+
+    words = unicodedata.normalize('NFC', ''.join(chars)).split()
+    if len(words) > 1 and words[0] == 'the':
+        words = words[1:]
+    return ' '.join(words)
+
+
+class Gazetteer:
+    def __init__(self, db_path: str, fuzzy_threshold: float = 0.82,
+                 mmap_size: int = 256 * 1024 * 1024):
+        """
+        Read-only offline index of places, queried before the Maps API
+
+        Args:
+            db_path: SQLite file built with app.gazetteer_build
+            fuzzy_threshold: Minimum similarity (0-1) for a fuzzy match
+            mmap_size: Bytes of the file SQLite may memory-map
+        """
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Gazetteer not found: {db_path}")
+
+        self.db_path = db_path
+        self.fuzzy_threshold = fuzzy_threshold
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+
+    def search(self, query: str, limit: int = 5, prefix: bool = True,
+               fuzzy: bool = True) -> List[Dict]:
+        """
+        Find places by name or alias, in any indexed script
+
+        Tries an exact alias match, then (if prefix) aliases starting with
+        the query, then (if fuzzy) near matches. Fuzzy candidates come from
+        the first three letters of each query word, so a typo there is not
+        found. Prefix matching suits autocomplete, but "India" would also
+        match "India Gate", so callers resolving a whole name turn it off.
+
+        Returns:
+            Places in the same shape as GoogleMapsHelper.search_places, plus
+            'source' and 'match' ('exact', 'prefix' or 'fuzzy')
+        """
+        key = normalize(query)
+        if not key:
+            return []
+
+        connection = self._connection()
+
+        rows = connection.execute(
+            f"SELECT {PLACE_COLUMNS} FROM aliases a JOIN places p ON p.id = a.place_id "
+            "WHERE a.normalized = ? ORDER BY p.population DESC LIMIT ?",
+            (key, limit)
+        ).fetchall()
+        if rows:
+            return self._format(rows, 'exact', limit)
+
+        if prefix:
+            # Range scan on the unique index: every alias that starts with key
+            rows = connection.execute(
+                f"SELECT {PLACE_COLUMNS} FROM aliases a JOIN places p ON p.id = a.place_id "
+                "WHERE a.normalized > ? AND a.normalized < ? "
+                "ORDER BY length(a.normalized), p.population DESC LIMIT ?",
+                (key, key + '\U0010ffff', limit * 4)
+            ).fetchall()
+            if rows:
+                return self._format(rows, 'prefix', limit)
+
+        if fuzzy:
+            return self._fuzzy_search(connection, key, limit)
+        return []
+
+    def geocode(self, query: str) -> Dict:
+        """Coordinates of an exact match, like GoogleMapsHelper.geocode_address"""
+        places = self.search(query, limit=1, prefix=False, fuzzy=False)
+        if not places:
+            return {}
+        place = places[0]
+        return {
+            'lat': place['location']['lat'],
+            'lng': place['location']['lng'],
+            'formatted_address': place['address'] or place['name']
+        }
+
+    def iter_places(self) -> Iterator[Dict]:
+        """Every place, shaped like search() results (e.g. to fill a SpatialIndex)"""
+        rows = self._connection().execute(
+            "SELECT id, name, address, lat, lng, types, NULL FROM places"
+        )
+        for row in rows:
+            yield self._format([row], 'exact', 1)[0]
+
+    def stats(self) -> Dict:
+        """Place and alias counts plus build metadata"""
+        connection = self._connection()
+        stats = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+        stats['places'] = connection.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+        stats['aliases'] = connection.execute("SELECT COUNT(*) FROM aliases").fetchone()[0]
+        return stats
+
+    def close(self):
+        """Close this thread's SQLite connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _fuzzy_search(self, connection, key: str, limit: int) -> List[Dict]:
+        prefixes = dict.fromkeys(word[:3] for word in key.split())
+        match = ' OR '.join(f'"{prefix}"*' for prefix in prefixes)
+
+        candidates = connection.execute(
+            f"SELECT {PLACE_COLUMNS} FROM aliases_fts f "
+            "JOIN aliases a ON a.id = f.rowid JOIN places p ON p.id = a.place_id "
+            "WHERE aliases_fts MATCH ? ORDER BY bm25(aliases_fts) LIMIT 200",
+            (match,)
+        ).fetchall()
+
+        scored = []
+        for row in candidates:
+            score = difflib.SequenceMatcher(None, key, row[-1]).ratio()
+            if score >= self.fuzzy_threshold:
+                scored.append((score, row))
+        scored.sort(key=lambda item: item[0], reverse=True)
+
+        return self._format([row for _, row in scored], 'fuzzy', limit)
+
+    @staticmethod
+    def _format(rows, match: str, limit: int) -> List[Dict]:
+        places = []
+        seen = set()
+        for place_id, name, address, lat, lng, types, _ in rows:
+            if place_id in seen:
+                continue
+            seen.add(place_id)
+            places.append({
+                'name': name,
+                'address': address,
+                'rating': None,
+                'place_id': f"gazetteer:{place_id}",
+                'types': types.split('|') if types else [],
+                'location': {'lat': lat, 'lng': lng},
+                'source': 'gazetteer',
+                'match': match
+            })
+            if len(places) == limit:
+                break
+        return places
+
+    def _connection(self) -> sqlite3.Connection:
+        """One read-only connection per thread and process"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+
+class GazetteerBuilder:
+    def __init__(self, db_path: str):
+        """
+        Writes a new gazetteer file
+
+        The index is built next to db_path and moved into place by
+        finish(), so a running server never sees a half-built file.
+        """
+        self.db_path = db_path
+        self._build_path = db_path + '.building'
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self._build_path):
+            os.remove(self._build_path)
+
+        self.connection = sqlite3.connect(self._build_path)
+        self.connection.execute("PRAGMA journal_mode=OFF")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        for statement in SCHEMA:
+            self.connection.execute(statement)
+
+        self.places = 0
+        self.aliases = 0
+
+    def add(self, name: str, lat: float, lng: float, types: Iterable[str] = (),
+            aliases: Iterable[str] = (), address: str = None, population: int = 0,
+            source_id: str = None) -> int:
+        """Add one place with its aliases; the name itself is always an alias"""
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO places (name, address, lat, lng, types, population, source_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, address, lat, lng, '|'.join(types), population or 0, source_id)
+        )
+        if not cursor.rowcount:
+            return 0
+        place_id = cursor.lastrowid
+        self.places += 1
+
+        rows = {}
+        for alias in [name, *aliases]:
+            key = normalize(alias)
+            if key and key not in rows:
+                rows[key] = alias.strip()
+
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO aliases (place_id, alias, normalized) VALUES (?, ?, ?)",
+            [(place_id, alias, key) for key, alias in rows.items()]
+        )
+        self.aliases += len(rows)
+        return place_id
+
+    def finish(self, source: str = None) -> Dict:
+        """Index the aliases, record metadata and atomically replace db_path"""
+        with self.connection:
+            self.connection.execute("INSERT INTO aliases_fts(aliases_fts) VALUES ('rebuild')")
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ('built_at', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())),
+                    ('source', source or ''),
+                ]
+            )
+        self.connection.execute("ANALYZE")
+        self.connection.execute("VACUUM")
+        self.connection.close()
+
+        os.replace(self._build_path, self.db_path)
+        return {'places': self.places, 'aliases': self.aliases, 'path': self.db_path}
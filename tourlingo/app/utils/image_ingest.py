@@ -0,0 +1,75 @@
+from PIL import Image, UnidentifiedImageError
+from typing import IO, Tuple
+
+
+class ImageIngestError(ValueError):
+    """Raised when an upload cannot be turned into an image for OCR"""
+    status_code = 400
+
+
+class ImageTooLargeError(ImageIngestError):
+    """Raised when an upload exceeds the configured pixel limit"""
+    status_code = 413
+
+
+def open_image(stream: IO, max_pixels: int = 40_000_000, max_side: int = None) -> Image.Image:
+    """
+    Open an uploaded image without decoding more than OCR needs
+
+    The header is parsed first so oversized images are rejected before any
+    pixel data is decoded. JPEGs are then decoded straight to grayscale at a
+    reduced scale with draft(); other formats are shrunk with reduce().
+    The stream is read in place, so the upload is never copied into a second
+    in-memory buffer.
+
+    Args:
+        stream: Binary file-like object (e.g. werkzeug FileStorage.stream)
+        max_pixels: Reject images with more pixels than this
+        max_side: Longest side needed downstream; decoding stops near it
+
+    Returns:
+        Loaded PIL Image (grayscale for JPEG input). The upload's own
+        (width, height), before any downscaling, is in info['upload_size'],
+        so coordinates can be reported against the uploaded image.
+    """
+    try:
+        image = Image.open(stream)
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError(str(e))
+    except (UnidentifiedImageError, OSError) as e:
+        raise ImageIngestError(f"Unsupported or corrupt image: {e}")
+
+    width, height = image.size
+    if width * height > max_pixels:
+        raise ImageTooLargeError(
+            f"Image is {width}x{height} ({width * height} pixels), limit is {max_pixels} pixels"
+        )
+
+    target = _target_size(image.size, max_side)
+
+    if image.format == 'JPEG':
+        # DCT-domain downscale (1/2, 1/4, 1/8) and grayscale decode in one step
+        image.draft('L', target)
+
+    try:
+        image.load()
+    except OSError as e:
+        raise ImageIngestError(f"Could not decode image: {e}")
+
+    # Integer box reduction for formats without a scaled decoder
+    factor = min(image.size[0] // target[0], image.size[1] // target[1])
+    if factor >= 2 and image.mode in ('L', 'LA', 'RGB', 'RGBA'):
+        image = image.reduce(factor)
+
+    image.info['upload_size'] = (width, height)
+    return image
+
+
+def _target_size(size: Tuple[int, int], max_side: int = None) -> Tuple[int, int]:
+    """Size with the longest side capped at max_side, keeping aspect ratio"""
+    width, height = size
+    if not max_side or max(width, height) <= max_side:
+        return width, height
+
+    scale = max_side / max(width, height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
@@ -0,0 +1,216 @@
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from typing import List
+import os
+import torch
+
+from app.utils.instrumentation import measure
+
+try:
+    import ctranslate2
+except ImportError:
+    ctranslate2 = None
+
+
+def configure_torch_threads(num_threads: int = None, interop_threads: int = None):
+    """Set torch intra-op and inter-op thread pools (inter-op only works before first use)"""
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    if interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            print(f"Could not set inter-op threads: {e}")
+
+
+class TorchBackend:
+    def __init__(self, model_name: str, device: str = 'cpu', quantize: bool = False):
+        """
+        Hugging Face PyTorch inference, optionally dynamically int8-quantized
+
+        Args:
+            model_name: Hugging Face model id
+            device: torch device
+            quantize: Apply dynamic int8 quantization to Linear layers (CPU only)
+        """
+        self.model_name = model_name
+        self.device = device
+        self.quantize = quantize and device == 'cpu'
+        self.name = 'torch-int8' if self.quantize else 'torch'
+
+    def load(self):
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            self.model_name,
+            trust_remote_code=True
+        )
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(
+            self.model_name,
+            trust_remote_code=True
+        ).to(self.device)
+        self.model.eval()
+
+        if self.quantize:
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+    def unload(self):
+        """Drop the weights; load() brings them back"""
+        self.model = None
+        if self.device == 'cuda':
+            torch.cuda.empty_cache()
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the weights (including packed int8 weights)"""
+        if getattr(self, 'model', None) is None:
+            return 0
+
+        def tensor_bytes(value):
+            if isinstance(value, torch.Tensor):
+                return value.numel() * value.element_size()
+            if isinstance(value, (tuple, list)):
+                return sum(tensor_bytes(item) for item in value)
+            return 0
+
+        return sum(tensor_bytes(value) for value in self.model.state_dict().values())
+
+    def generate(self, input_texts: List[str], tgt_code: str, num_beams: int,
+                 max_length: int) -> List[str]:
+        """Run one padded generate call over already-tagged input texts"""
+        with measure('translator', 'tokenize', batch_size=len(input_texts)):
+            inputs = self.tokenizer(
+                input_texts,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=max_length
+            ).to(self.device)
+
+        # Generate translation
+        with measure('translator', 'model_generate', input_size=inputs['input_ids'].numel(),
+                     batch_size=len(input_texts)):
+            with torch.no_grad():
+                generated_tokens = self.model.generate(
+                    **inputs,
+                    forced_bos_token_id=self.tokenizer.convert_tokens_to_ids(tgt_code),
+                    max_length=max_length,
+                    num_beams=num_beams,
+                    num_return_sequences=1
+                )
+
+        # Decode output
+        with measure('translator', 'decode', batch_size=len(input_texts)):
+            return self.tokenizer.batch_decode(
+                generated_tokens,
+                skip_special_tokens=True
+            )
+
+
+class CTranslate2Backend:
+    def __init__(self, model_name: str, model_dir: str, device: str = 'cpu',
+                 compute_type: str = 'int8', intra_threads: int = 0, inter_threads: int = 1):
+        """
+        CTranslate2 inference over a converted IndicTrans2 checkpoint
+
+        Convert once with:
+            ct2-transformers-converter --model ai4bharat/indictrans2-en-indic-dist-200M \\
+                --trust_remote_code --quantization int8 --output_dir models/indictrans2
+
+        Args:
+            model_name: Hugging Face model id, used for the tokenizer
+            model_dir: Directory holding the converted CTranslate2 model
+            compute_type: int8, int8_float16, float16 or float32
+            intra_threads: Threads per translation (0 lets CTranslate2 decide)
+            inter_threads: Translations run in parallel
+        """
+        if ctranslate2 is None:
+            raise ImportError("The ctranslate2 backend requires `pip install ctranslate2`")
+
+        self.model_name = model_name
+        self.model_dir = model_dir
+        self.device = device
+        self.compute_type = compute_type
+        self.intra_threads = intra_threads
+        self.inter_threads = inter_threads
+        self.name = f'ctranslate2-{compute_type}'
+
+    def load(self):
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            self.model_name,
+            trust_remote_code=True
+        )
+        self.model = ctranslate2.Translator(
+            self.model_dir,
+            device=self.device,
+            compute_type=self.compute_type,
+            intra_threads=self.intra_threads,
+            inter_threads=self.inter_threads
+        )
+
+    def unload(self):
+        """Drop the weights; load() brings them back"""
+        self.model = None
+
+    def memory_bytes(self) -> int:
+        """Approximate weight memory: the size of the converted model files"""
+        if getattr(self, 'model', None) is None:
+            return 0
+        return sum(
+            os.path.getsize(os.path.join(self.model_dir, name))
+            for name in os.listdir(self.model_dir)
+            if os.path.isfile(os.path.join(self.model_dir, name))
+        )
+
+    def generate(self, input_texts: List[str], tgt_code: str, num_beams: int,
+                 max_length: int) -> List[str]:
+        source_tokens = [
+            self.tokenizer.convert_ids_to_tokens(
+                self.tokenizer(text, truncation=True, max_length=max_length)['input_ids']
+            )
+            for text in input_texts
+        ]
+
+        results = self.model.translate_batch(
+            source_tokens,
+            target_prefix=[[tgt_code]] * len(source_tokens),
+            beam_size=num_beams,
+            max_decoding_length=max_length
+        )
+
+        return [
+            self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]),
+                skip_special_tokens=True
+            )
+            for result in results
+        ]
+
+
+BACKENDS = ('torch', 'torch-int8', 'ctranslate2')
+
+
+def create_backend(backend, model_name: str, model_dir: str, device: str,
+                   num_threads: int = None, interop_threads: int = None):
+    """
+    Build an inference backend by name (one of BACKENDS)
+
+    An object that already implements the backend interface (name, model,
+    tokenizer, load, unload, memory_bytes, generate) is returned as is, so
+    benchmarks can plug in a stub model.
+    """
+    if not isinstance(backend, str):
+        return backend
+    if backend == 'torch':
+        configure_torch_threads(num_threads, interop_threads)
+        return TorchBackend(model_name, device)
+    if backend == 'torch-int8':
+        configure_torch_threads(num_threads, interop_threads)
+        return TorchBackend(model_name, device, quantize=True)
+    if backend == 'ctranslate2':
+        return CTranslate2Backend(
+            model_name,
+            model_dir,
+            device=device,
+            intra_threads=num_threads or 0,
+            inter_threads=interop_threads or 1
+        )
+    raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
@@ -0,0 +1,90 @@
+import functools
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+# Observers notified of every measured operation and cache lookup. The
+# components only call measure()/record_cache(); exporters such as
+# app.utils.metrics subscribe with add_hook().
+_hooks: List[Callable[[Dict], None]] = []
+
+
+def add_hook(hook: Callable[[Dict], None]):
+    """
+    Subscribe to instrumentation events
+
+    The hook receives one dict per event:
+      {'kind': 'timing', 'component', 'operation', 'duration', 'input_size',
+       'batch_size', 'error'}
+      {'kind': 'cache', 'component', 'cache', 'hit'}
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[Dict], None]):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+@contextmanager
+def measure(component: str, operation: str, input_size: float = None, batch_size: int = None):
+    """
+    Time a block and report it to the hooks
+
+    The yielded dict can be updated inside the block (e.g. batch_size once
+    it is known). Costs almost nothing when no hook is installed.
+    """
+    event = {
+        'kind': 'timing',
+        'component': component,
+        'operation': operation,
+        'input_size': input_size,
+        'batch_size': batch_size,
+        'error': False
+    }
+    if not _hooks:
+        yield event
+        return
+
+    start = time.perf_counter()
+    try:
+        yield event
+    except Exception:
+        event['error'] = True
+        raise
+    finally:
+        event['duration'] = time.perf_counter() - start
+        _emit(event)
+
+
+def timed(component: str, operation: str, input_size: Callable = None):
+    """
+    Decorator form of measure()
+
+    Args:
+        input_size: Optional callable receiving the decorated function's
+            arguments and returning the input size to record
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            size = input_size(*args, **kwargs) if input_size is not None and _hooks else None
+            with measure(component, operation, input_size=size):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_cache(component: str, cache: str, hit: bool):
+    """Report a cache hit or miss to the hooks"""
+    if _hooks:
+        _emit({'kind': 'cache', 'component': component, 'cache': cache, 'hit': hit})
+
+
+def _emit(event: Dict):
+    for hook in list(_hooks):
+        try:
+            hook(event)
+        except Exception as e:
+            print(f"Instrumentation hook error: {e}")
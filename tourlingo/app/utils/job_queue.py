@@ -0,0 +1,404 @@
+import heapq
+import ipaddress
+import itertools
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job queue is at capacity; the client should retry later"""
+    status_code = 429
+
+
+def check_callback_url(url: str, allowed_hosts: Iterable[str] = ()):
+    """
+    Refuse callback URLs the server must not POST to
+
+    With allowed_hosts, only those hosts are accepted. Without, the host is
+    resolved and every address it maps to must be public: loopback,
+    private, link-local (cloud metadata), reserved and multicast addresses
+    are rejected so a callback cannot reach the server's own network.
+
+    Raises:
+        ValueError: The URL is not http(s) or its host is not allowed
+    """
+    if not isinstance(url, str):
+        raise ValueError("callback_url must be a string")
+    parsed = urlparse(url)
+    host = parsed.hostname
+    if parsed.scheme not in ('http', 'https') or not host:
+        raise ValueError(f"callback_url not allowed: {url}")
+
+    allowed_hosts = list(allowed_hosts)
+    if allowed_hosts:
+        if host not in allowed_hosts:
+            raise ValueError(f"callback_url not allowed: {url}")
+        return
+
+    try:
+        addresses = {
+            info[4][0] for info in socket.getaddrinfo(host, parsed.port or 0, proto=socket.IPPROTO_TCP)
+        }
+    except (socket.gaierror, UnicodeError, ValueError):
+        raise ValueError(f"callback_url host does not resolve: {url}")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%')[0])
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"callback_url not allowed: {url} resolves to {ip}")
+
+
+class _Job:
+    """A submitted unit of work and its outcome"""
+
+    __slots__ = ('id', 'kind', 'priority', 'fn', 'callback_url', 'status', 'result',
+                 'status_code', 'error', 'created', 'started', 'finished', 'cancel_requested')
+
+    def __init__(self, kind: str, fn: Callable, priority: int, callback_url: str = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.priority = priority
+        self.fn = fn
+        self.callback_url = callback_url
+        self.status = JobQueue.QUEUED
+        self.result = None
+        self.status_code = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_requested = False
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'priority': self.priority,
+            'result': self.result,
+            'status_code': self.status_code,
+            'error': self.error,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished
+        }
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue for slow requests
+
+    Work is submitted as a zero-argument callable returning (body,
+    status_code) and runs on a small pool of worker threads, highest
+    priority first, so slow OCR and translation jobs never hold a web
+    worker. Submissions beyond max_queued waiting jobs raise QueueFullError.
+    Finished jobs are kept for result_ttl seconds, then dropped.
+
+    With db_path, every job's state and result is also written to SQLite,
+    so any server process can answer a poll or cancel a queued job; the
+    work itself always runs in the process that accepted it.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+    # Lower runs first
+    PRIORITIES = {'high': 0, 'normal': 1, 'low': 2}
+
+    def __init__(self, max_workers: int = 2, max_queued: int = 32, result_ttl: float = 600,
+                 db_path: str = None, callback_timeout: float = 5,
+                 callback_hosts: Iterable[str] = ()):
+        """
+        Args:
+            max_workers: Jobs run at the same time
+            max_queued: Jobs allowed to wait; more are rejected with QueueFullError
+            result_ttl: Seconds a finished job's result stays available
+            db_path: SQLite file shared by server processes; None keeps jobs in memory
+            callback_timeout: Timeout for POSTing a finished job to its callback_url
+            callback_hosts: Hosts callback_url may point at; empty allows any
+                public address (see check_callback_url)
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.db_path = db_path
+        self.callback_timeout = callback_timeout
+        self.callback_hosts = list(callback_hosts)
+
+        self._jobs = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._closed = False
+
+        self.submitted = 0
+        self.rejected = 0
+
+        if self.db_path:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS jobs ("
+                    "id TEXT PRIMARY KEY, data TEXT NOT NULL, status TEXT NOT NULL, "
+                    "expires REAL)"
+                )
+
+        self._workers = [
+            threading.Thread(target=self._run, name=f'job-worker-{i}', daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, kind: str, fn: Callable[[], Tuple[Dict, int]], priority: str = 'normal',
+               callback_url: str = None) -> Dict:
+        """
+        Queue a job and return its initial state
+
+        Args:
+            kind: Label for the job (e.g. 'image-assist')
+            fn: Work to run; returns (JSON-serializable body, HTTP status code)
+            priority: One of PRIORITIES
+            callback_url: Optional URL the finished job is POSTed to
+
+        Raises:
+            QueueFullError: max_queued jobs are already waiting
+            ValueError: Unknown priority or disallowed callback_url
+        """
+        if priority not in self.PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}', expected one of {tuple(self.PRIORITIES)}")
+        if callback_url:
+            check_callback_url(callback_url, self.callback_hosts)
+
+        job = _Job(kind, fn, self.PRIORITIES[priority], callback_url)
+        with self._condition:
+            if self._closed:
+                raise QueueFullError("Job queue is shutting down")
+            self._expire()
+            if len(self._heap) >= self.max_queued:
+                self.rejected += 1
+                raise QueueFullError(f"Job queue is full ({self.max_queued} jobs waiting)")
+            self._jobs[job.id] = job
+            heapq.heappush(self._heap, (job.priority, next(self._sequence), job))
+            self.submitted += 1
+            # Written before any worker can pick the job up and persist a later state
+            self._persist(job)
+            self._condition.notify()
+            return self._describe(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """A job's state, and its result once finished; None if unknown or expired"""
+        with self._condition:
+            self._expire()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self._describe(job)
+
+        if self.db_path:
+            row = self._connection().execute(
+                "SELECT data FROM jobs WHERE id = ? AND (expires IS NULL OR expires > ?)",
+                (job_id, time.time())
+            ).fetchone()
+            if row is not None:
+                return json.loads(row[0])
+        return None
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """
+        Cancel a job; None if unknown or expired
+
+        A queued job never runs. A running job cannot be interrupted, but
+        its result is discarded and it is reported as cancelled.
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                if job.status == self.QUEUED:
+                    self._heap = [entry for entry in self._heap if entry[2] is not job]
+                    heapq.heapify(self._heap)
+                    self._finish(job, self.CANCELLED)
+                    self._persist(job)
+                elif job.status == self.RUNNING:
+                    job.cancel_requested = True
+                description = self._describe(job)
+        if job is not None:
+            return description
+
+        if self.db_path:
+            # Queued in another process: it checks for this before running the job
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "UPDATE jobs SET status = ? WHERE id = ? AND status IN (?, ?)",
+                    (self.CANCELLED, job_id, self.QUEUED, self.RUNNING)
+                )
+            state = self.get(job_id)
+            if state is not None and state['status'] not in self.FINISHED:
+                state['status'] = self.CANCELLED
+            return state
+        return None
+
+    def stats(self) -> Dict:
+        """Queue depth, running jobs and submission counters"""
+        with self._condition:
+            self._expire()
+            running = sum(job.status == self.RUNNING for job in self._jobs.values())
+            return {
+                'queued': len(self._heap),
+                'running': running,
+                'max_queued': self.max_queued,
+                'max_workers': self.max_workers,
+                'retained': len(self._jobs),
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'persistent': bool(self.db_path)
+            }
+
+    def close(self, timeout: float = 30):
+        """Cancel waiting jobs, let running ones finish, then stop the workers"""
+        with self._condition:
+            self._closed = True
+            for _, _, job in self._heap:
+                self._finish(job, self.CANCELLED)
+                self._persist(job)
+            self._heap = []
+            self._condition.notify_all()
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(max(0, deadline - time.monotonic()))
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._heap and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+                job.status = self.RUNNING
+                job.started = time.time()
+
+            if self._cancelled_elsewhere(job):
+                with self._condition:
+                    self._finish(job, self.CANCELLED)
+                    self._persist(job)
+                continue
+            with self._condition:
+                self._persist(job)
+
+            try:
+                body, status_code = job.fn()
+                error = None
+            except Exception as e:
+                body, status_code, error = None, 500, str(e)
+
+            cancelled = self._cancelled_elsewhere(job)
+            with self._condition:
+                if job.cancel_requested or cancelled:
+                    self._finish(job, self.CANCELLED)
+                else:
+                    job.result, job.status_code, job.error = body, status_code, error
+                    self._finish(job, self.FAILED if error or status_code >= 400 else self.DONE)
+                self._persist(job)
+            if job.callback_url:
+                self._callback(job)
+
+    def _finish(self, job: _Job, status: str):
+        """Record a final status (caller holds _condition)"""
+        job.status = status
+        job.finished = time.time()
+        job.fn = None
+
+    def _expire(self):
+        """Drop finished jobs older than result_ttl (caller holds _condition)"""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in self.FINISHED and job.finished < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _describe(self, job: _Job) -> Dict:
+        """Public view of a job, with its place in line while queued (caller holds _condition)"""
+        description = job.to_dict()
+        if job.status == self.QUEUED:
+            entry = next(entry[:2] for entry in self._heap if entry[2] is job)
+            description['position'] = sum(other[:2] < entry for other in self._heap)
+        elif job.status == self.RUNNING and job.cancel_requested:
+            description['cancel_requested'] = True
+        return description
+
+    def _cancelled_elsewhere(self, job: _Job) -> bool:
+        """Whether another process cancelled this job through the database"""
+        if not self.db_path:
+            return False
+        row = self._connection().execute("SELECT status FROM jobs WHERE id = ?", (job.id,)).fetchone()
+        return row is not None and row[0] == self.CANCELLED
+
+    def _persist(self, job: _Job):
+        """
+        Write a job's current state (caller holds _condition, so writes for
+        one job land in the order its states changed). A row another
+        process marked cancelled is never overwritten with another status.
+        """
+        if not self.db_path:
+            return
+        expires = job.finished + self.result_ttl if job.finished else None
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT INTO jobs (id, data, status, expires) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET data = excluded.data, status = excluded.status, "
+                    "expires = excluded.expires "
+                    "WHERE jobs.status != ? OR excluded.status = ?",
+                    (job.id, json.dumps(job.to_dict(), ensure_ascii=False), job.status, expires,
+                     self.CANCELLED, self.CANCELLED)
+                )
+                connection.execute("DELETE FROM jobs WHERE expires < ?", (time.time(),))
+        except sqlite3.Error as e:
+            print(f"Job store write error: {e}")
+
+    def _callback(self, job: _Job):
+        import requests
+
+        try:
+            # Checked again: the host may resolve elsewhere by now. Redirects
+            # are not followed, since they could lead to an internal address.
+            check_callback_url(job.callback_url, self.callback_hosts)
+            requests.post(job.callback_url, json=job.to_dict(), timeout=self.callback_timeout,
+                          allow_redirects=False)
+        except ValueError as e:
+            print(f"Job callback refused: {e}")
+        except requests.RequestException as e:
+            print(f"Job callback to {job.callback_url} failed: {e}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        One SQLite connection per thread and process; WAL lets worker
+        processes share the file. Connections inherited across fork() are
+        never reused.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.db_path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
@@ -1,12 +1,102 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from copy import deepcopy
 from typing import List, Dict
+import threading
+import math
+import time
 import os
 
+from app.utils.instrumentation import measure, record_cache
+
+class TTLCache:
+    def __init__(self, ttl: float = 3600, max_entries: int = 2048):
+        """
+        Small thread-safe LRU cache whose entries expire after ttl seconds
+        
+        Values are deep-copied in and out, so a caller that edits a response
+        it got never changes what later lookups return.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+        return deepcopy(value)
+    
+    def set(self, key, value):
+        value = deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
 class GoogleMapsHelper:
-    def __init__(self, api_key: str = None):
-        """Initialize with Google Maps API key"""
+    def __init__(self, api_key: str = None, base_url: str = None, timeout: float = 5.0,
+                 retries: int = 2, backoff_factor: float = 0.3, pool_size: int = 10,
+                 cache_ttl: float = 3600, cache_size: int = 2048, gazetteer=None,
+                 spatial_index=None):
+        """
+        Initialize with Google Maps API key
+        
+        Args:
+            api_key: Google Maps API key
+            base_url: API root; point this at a local stub server for testing
+            timeout: Per-request timeout in seconds
+            retries: Retries for connection errors and 429/5xx responses
+            backoff_factor: Exponential backoff factor between retries
+            pool_size: Pooled connections kept open to the API host
+            cache_ttl: Seconds a successful response stays cached (0 disables)
+            cache_size: Maximum number of cached responses
+            gazetteer: Optional offline Gazetteer consulted before the API
+            spatial_index: Optional SpatialIndex filled with every place the
+                API returns, answering search_nearby without a network call
+        """
         self.api_key = api_key or os.getenv('GOOGLE_MAPS_API_KEY')
-        self.base_url = "https://maps.googleapis.com/maps/api"
+        self.base_url = (
+            base_url or os.getenv('GOOGLE_MAPS_BASE_URL') or "https://maps.googleapis.com/maps/api"
+        ).rstrip('/')
+        self.timeout = timeout
+        self.pool_size = pool_size
+        
+        # One pooled session reused by every call, with retry and backoff
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET']
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Concurrent searches share one executor, one thread per pooled connection
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='maps')
+        
+        self.cache = TTLCache(ttl=cache_ttl, max_entries=cache_size) if cache_ttl > 0 else None
+        self.gazetteer = gazetteer
+        self.spatial_index = spatial_index
     
     def search_places(self, query: str, location: str = None, radius: int = 5000) -> List[Dict]:
         """
@@ -20,6 +110,12 @@ class GoogleMapsHelper:
         Returns:
             List of place dictionaries
         """
+        # Well-known places are answered offline, without a round trip, as
+        # long as they lie inside the requested area
+        places = self._gazetteer_search(query, location, radius)
+        if places:
+            return places
+        
         endpoint = f"{self.base_url}/place/textsearch/json"
         
         params = {
@@ -32,20 +128,60 @@ class GoogleMapsHelper:
             params['radius'] = radius
         
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(endpoint, params)
             
             if data['status'] == 'OK':
                 return self._format_places(data['results'])
             else:
                 print(f"Maps API error: {data['status']}")
                 return []
-                
+        
         except Exception as e:
             print(f"Error searching places: {e}")
             return []
     
+    def search_places_many(self, queries: List[str], location: str = None,
+                           radius: int = 5000) -> List[List[Dict]]:
+        """
+        Run several place searches concurrently
+        
+        Returns:
+            One list of places per query, in the same order as queries
+        """
+        if not queries:
+            return []
+        if len(queries) == 1:
+            return [self.search_places(queries[0], location, radius)]
+        
+        return list(self.executor.map(
+            lambda query: self.search_places(query, location, radius),
+            queries
+        ))
+    
+    def search_nearby(self, lat: float, lng: float, radius: int = 2000, place_type: str = None,
+                      min_rating: float = None, limit: int = 20, min_results: int = 1) -> List[Dict]:
+        """
+        Places within radius meters of lat,lng, best rated first
+        
+        Answered from the spatial index; only when it has fewer than
+        min_results matches is the API searched (which also fills the index).
+        
+        Returns:
+            List of place dictionaries with 'distance_m'
+        """
+        if self.spatial_index is None:
+            places = self.search_places(place_type or 'tourist attraction', f"{lat},{lng}", radius)
+            return places[:limit]
+        
+        places = self.spatial_index.nearby(lat, lng, radius, place_type, min_rating, limit)
+        record_cache('maps', 'nearby', len(places) >= min_results)
+        if len(places) >= min_results:
+            return places
+        
+        query = place_type.replace('_', ' ') if place_type else 'tourist attraction'
+        self.search_places(query, f"{lat},{lng}", radius)
+        return self.spatial_index.nearby(lat, lng, radius, place_type, min_rating, limit)
+    
     def get_place_details(self, place_id: str) -> Dict:
         """Get detailed information about a specific place"""
         endpoint = f"{self.base_url}/place/details/json"
@@ -57,21 +193,29 @@ class GoogleMapsHelper:
         }
         
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(endpoint, params)
             
             if data['status'] == 'OK':
                 return data['result']
             else:
                 return {}
-                
+        
         except Exception as e:
             print(f"Error getting place details: {e}")
             return {}
     
     def geocode_address(self, address: str) -> Dict:
         """Convert address to lat/lng coordinates"""
+        if self.gazetteer is not None:
+            try:
+                location = self.gazetteer.geocode(address)
+            except Exception as e:
+                print(f"Gazetteer error: {e}")
+                location = {}
+            record_cache('maps', 'gazetteer', bool(location))
+            if location:
+                return location
+        
         endpoint = f"{self.base_url}/geocode/json"
         
         params = {
@@ -80,9 +224,7 @@ class GoogleMapsHelper:
         }
         
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(endpoint, params)
             
             if data['status'] == 'OK' and data['results']:
                 location = data['results'][0]['geometry']['location']
@@ -93,16 +235,92 @@ class GoogleMapsHelper:
                 }
             else:
                 return {}
-                
+        
         except Exception as e:
             print(f"Error geocoding: {e}")
             return {}
     
+    def close(self):
+        """Stop the search threads and close pooled connections"""
+        self.executor.shutdown(wait=True)
+        self.session.close()
+    
+    def _gazetteer_search(self, query: str, location: str = None, radius: int = 5000) -> List[Dict]:
+        """
+        Exact or fuzzy offline match for a whole place name
+        
+        With a location, only matches within radius meters of it count, so
+        a well-known name elsewhere in the country never replaces a local
+        API result.
+        """
+        if self.gazetteer is None:
+            return []
+        
+        center = None
+        if location:
+            try:
+                center = tuple(float(part) for part in location.split(','))
+            except ValueError:
+                center = None
+            if center is None or len(center) != 2:
+                # Leave a malformed location for the API to reject
+                return []
+        
+        try:
+            places = self.gazetteer.search(query, prefix=False)
+        except Exception as e:
+            print(f"Gazetteer error: {e}")
+            return []
+        
+        if center is not None:
+            places = [
+                place for place in places
+                if self._distance_m(center, place['location']) <= radius
+            ]
+        
+        record_cache('maps', 'gazetteer', bool(places))
+        return places
+    
+    @staticmethod
+    def _distance_m(center, location: Dict) -> float:
+        """Great-circle distance in meters from (lat, lng) to a {'lat', 'lng'} dict"""
+        lat1, lng1 = map(math.radians, center)
+        lat2, lng2 = math.radians(location['lat']), math.radians(location['lng'])
+        a = (math.sin((lat2 - lat1) / 2) ** 2
+             + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+        return 2 * 6_371_000 * math.asin(min(1.0, math.sqrt(a)))
+    
+    def _get_json(self, endpoint: str, params: Dict) -> Dict:
+        """GET an API endpoint through the pooled session and TTL cache"""
+        cache_key = (endpoint, tuple(sorted(
+            (name, str(value)) for name, value in params.items() if name != 'key'
+        )))
+        
+        # e.g. .../place/textsearch/json -> textsearch
+        operation = endpoint.rstrip('/').split('/')[-2]
+        
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            record_cache('maps', operation, cached is not None)
+            if cached is not None:
+                return cached
+        
+        with measure('maps', operation):
+            response = self.session.get(endpoint, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        
+        # Only cache definitive answers, never quota or transient errors
+        if self.cache is not None and data.get('status') in ('OK', 'ZERO_RESULTS'):
+            self.cache.set(cache_key, data)
+        
+        return data
+    
     def _format_places(self, places: List) -> List[Dict]:
         """Format place results for easier consumption"""
         formatted = []
         
-        for place in places[:10]:  # Limit to top 10
+        for place in places:
             formatted.append({
                 'name': place.get('name'),
                 'address': place.get('formatted_address'),
@@ -112,4 +330,8 @@ class GoogleMapsHelper:
                 'location': place.get('geometry', {}).get('location', {})
             })
         
-        return formatted
+        # Index every result for nearby search, return the top 10
+        if self.spatial_index is not None:
+            self.spatial_index.add_places(formatted)
+        
+        return formatted[:10]
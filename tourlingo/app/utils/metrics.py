@@ -0,0 +1,86 @@
+import os
+import time
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+)
+
+from app.utils import instrumentation
+
+# Per-worker registry; with PROMETHEUS_MULTIPROC_DIR set, /metrics instead
+# aggregates the files written by every gunicorn worker
+REGISTRY = CollectorRegistry()
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10_000, 100_000, 1_000_000, 10_000_000)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+STAGE_DURATION = Histogram(
+    'tourlingo_stage_duration_seconds', 'Duration of instrumented component operations',
+    ['component', 'operation'], buckets=DURATION_BUCKETS, registry=REGISTRY
+)
+STAGE_INPUT_SIZE = Histogram(
+    'tourlingo_stage_input_size', 'Input size of component operations (characters or pixels)',
+    ['component', 'operation'], buckets=SIZE_BUCKETS, registry=REGISTRY
+)
+STAGE_BATCH_SIZE = Histogram(
+    'tourlingo_stage_batch_size', 'Items per batched component operation',
+    ['component', 'operation'], buckets=BATCH_BUCKETS, registry=REGISTRY
+)
+STAGE_ERRORS = Counter(
+    'tourlingo_stage_errors_total', 'Component operations that raised',
+    ['component', 'operation'], registry=REGISTRY
+)
+CACHE_LOOKUPS = Counter(
+    'tourlingo_cache_lookups_total', 'Cache lookups by result',
+    ['component', 'cache', 'result'], registry=REGISTRY
+)
+REQUEST_DURATION = Histogram(
+    'tourlingo_http_request_duration_seconds', 'HTTP request latency',
+    ['endpoint', 'method', 'status'], buckets=DURATION_BUCKETS, registry=REGISTRY
+)
+
+
+def _record(event):
+    if event['kind'] == 'cache':
+        CACHE_LOOKUPS.labels(event['component'], event['cache'], 'hit' if event['hit'] else 'miss').inc()
+        return
+
+    labels = (event['component'], event['operation'])
+    STAGE_DURATION.labels(*labels).observe(event['duration'])
+    if event['input_size'] is not None:
+        STAGE_INPUT_SIZE.labels(*labels).observe(event['input_size'])
+    if event['batch_size'] is not None:
+        STAGE_BATCH_SIZE.labels(*labels).observe(event['batch_size'])
+    if event['error']:
+        STAGE_ERRORS.labels(*labels).inc()
+
+
+def init_metrics(app):
+    """Record component and request metrics and serve them on /metrics"""
+    instrumentation.add_hook(_record)
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        start = getattr(g, 'metrics_start', None)
+        if start is not None and request.endpoint != 'metrics':
+            REQUEST_DURATION.labels(
+                request.endpoint or 'unknown', request.method, str(response.status_code)
+            ).observe(time.perf_counter() - start)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus metrics in text exposition format"""
+        if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+            from prometheus_client import multiprocess
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,226 @@
+import gc
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+from app.utils.segmenter import segment_document
+
+
+class DirectionNotEnabledError(ValueError):
+    """Raised for a language pair whose checkpoint direction the pool does not hold"""
+    status_code = 400
+
+
+class TranslatorPool:
+    """
+    Routes translations to the IndicTrans2 checkpoint for their direction
+
+    Holds one lazily loaded IndicTranslator per direction (en-indic,
+    indic-en, indic-indic). A model's weights load on the first request that
+    needs them; when a memory budget is set, the least recently used models
+    that are not serving a request are unloaded to stay under it. Exposes
+    the IndicTranslator interface, so MicroBatcher and the endpoints can use
+    it in place of a single translator.
+    """
+
+    def __init__(self, translators: Dict[str, object], memory_budget_mb: float = None):
+        """
+        Args:
+            translators: IndicTranslator per direction, created with lazy=True
+            memory_budget_mb: Total weight memory to keep loaded; None for no limit
+        """
+        self.translators = translators
+        self.memory_budget = memory_budget_mb * 1024 * 1024 if memory_budget_mb else None
+
+        self.lang_codes = {}
+        for translator in translators.values():
+            self.lang_codes.update(translator.lang_codes)
+
+        self._lock = threading.Lock()
+        self._load_locks = {direction: threading.Lock() for direction in translators}
+        self._in_use = {direction: 0 for direction in translators}
+        self._last_used = {direction: 0.0 for direction in translators}
+        self._footprints = {}
+        self._stats = {
+            direction: {'loads': 0, 'unloads': 0, 'load_seconds': None}
+            for direction in translators
+        }
+
+    @staticmethod
+    def direction_for(source_lang: str, target_lang: str) -> Optional[str]:
+        """Checkpoint direction for a language pair, or None if there is nothing to translate"""
+        source_lang, target_lang = source_lang.lower(), target_lang.lower()
+        if source_lang == target_lang:
+            return None
+        if source_lang == 'english':
+            return 'en-indic'
+        if target_lang == 'english':
+            return 'indic-en'
+        return 'indic-indic'
+
+    def check_direction(self, source_lang: str, target_lang: str) -> Optional[str]:
+        """
+        Like direction_for, but raises DirectionNotEnabledError when the
+        direction has no translator in this pool
+        """
+        direction = self.direction_for(source_lang, target_lang)
+        if direction is not None and direction not in self.translators:
+            raise DirectionNotEnabledError(
+                f"Translation direction '{direction}' ({source_lang} to {target_lang}) is not enabled"
+            )
+        return direction
+
+    def preload(self, directions: Iterable[str]):
+        """Load these directions now (e.g. in the gunicorn master, to share them after fork)"""
+        for direction in directions:
+            with self._use(direction):
+                pass
+
+    def translate(self, text, source_lang='english', target_lang='hindi', num_beams=None, max_length=None):
+        return self.batch_translate([text], source_lang, target_lang, num_beams=num_beams,
+                                    max_length=max_length)[0]
+
+    def batch_translate(self, texts, source_lang='english', target_lang='hindi', batch_size=16,
+                        check_cache=True, num_beams=None, max_length=None):
+        """Like IndicTranslator.batch_translate; cache hits never load a model"""
+        direction = self.check_direction(source_lang, target_lang)
+        if direction is None:
+            return list(texts)
+
+        translations = list(texts)
+        pending = list(range(len(texts)))
+        if check_cache:
+            pending = []
+            for i, text in enumerate(texts):
+                cached = self.cached_translation(text, source_lang, target_lang, num_beams, max_length)
+                if cached is None:
+                    pending.append(i)
+                else:
+                    translations[i] = cached
+        if not pending:
+            return translations
+
+        with self._use(direction) as translator:
+            outputs = translator.batch_translate(
+                [texts[i] for i in pending], source_lang, target_lang, batch_size,
+                check_cache=False, num_beams=num_beams, max_length=max_length
+            )
+        for i, output in zip(pending, outputs):
+            translations[i] = output
+        return translations
+
+    def translate_document(self, text, source_lang='english', target_lang='hindi', batch_size=16,
+                           num_beams=None, max_length=None):
+        direction = self.check_direction(source_lang, target_lang)
+        if direction is None:
+            return text
+        with self._use(direction) as translator:
+            return translator.translate_document(
+                text, source_lang, target_lang, batch_size, num_beams, max_length
+            )
+
+    def iter_translate_document(self, text, source_lang='english', target_lang='hindi', batch_size=16,
+                                num_beams=None, max_length=None):
+        direction = self.check_direction(source_lang, target_lang)
+        if direction is None:
+            # Nothing to translate: every sentence comes back unchanged
+            for line_index, line in enumerate(segment_document(text)):
+                for sentence_index, sentence in enumerate(line):
+                    yield line_index, sentence_index, sentence, sentence
+            return
+        # The model stays pinned (never unloaded) until the stream is done
+        with self._use(direction) as translator:
+            yield from translator.iter_translate_document(
+                text, source_lang, target_lang, batch_size, num_beams, max_length
+            )
+
+    def cached_translation(self, text, source_lang='english', target_lang='hindi',
+                           num_beams=None, max_length=None):
+        """Cache lookup that never loads a model"""
+        direction = self.check_direction(source_lang, target_lang)
+        if direction is None:
+            return text
+        return self.translators[direction].cached_translation(
+            text, source_lang, target_lang, num_beams, max_length
+        )
+
+    def unload(self, direction: str) -> bool:
+        """Unload one direction now, unless it is serving a request"""
+        with self._lock:
+            if self._in_use[direction] or not self.translators[direction].is_loaded:
+                return False
+            self._unload(direction)
+            return True
+
+    def status(self) -> Dict:
+        """Per-direction load state, weight memory and load/unload counts"""
+        with self._lock:
+            return {
+                direction: {
+                    'model': translator.model_name,
+                    'loaded': translator.is_loaded,
+                    'memory_mb': round(translator.memory_bytes() / 1024 / 1024, 1),
+                    'footprint_mb': round(self._footprints.get(direction, 0) / 1024 / 1024, 1),
+                    'in_use': self._in_use[direction],
+                    **self._stats[direction]
+                }
+                for direction, translator in self.translators.items()
+            }
+
+    @contextmanager
+    def _use(self, direction: str):
+        """Pin a direction's model for the duration of a call, loading it if needed"""
+        if direction not in self.translators:
+            raise DirectionNotEnabledError(f"Translation direction '{direction}' is not enabled")
+        translator = self.translators[direction]
+
+        with self._lock:
+            self._in_use[direction] += 1
+            self._last_used[direction] = time.monotonic()
+        try:
+            if not translator.is_loaded:
+                with self._load_locks[direction]:
+                    if not translator.is_loaded:
+                        # Make room first when the model's size is known from an earlier load
+                        with self._lock:
+                            self._enforce_budget(reserve=self._footprints.get(direction, 0))
+                        start = time.perf_counter()
+                        translator.load_model()
+                        with self._lock:
+                            self._footprints[direction] = translator.memory_bytes()
+                            self._stats[direction]['loads'] += 1
+                            self._stats[direction]['load_seconds'] = round(time.perf_counter() - start, 3)
+                            self._enforce_budget()
+            yield translator
+        finally:
+            with self._lock:
+                self._in_use[direction] -= 1
+                self._last_used[direction] = time.monotonic()
+
+    def _enforce_budget(self, reserve: int = 0):
+        """
+        Unload idle models, least recently used first, until the loaded
+        weights plus reserve bytes fit the budget (caller holds _lock)
+        """
+        if self.memory_budget is None:
+            return
+
+        loaded = [d for d, translator in self.translators.items() if translator.is_loaded]
+        total = reserve + sum(self.translators[d].memory_bytes() for d in loaded)
+        for direction in sorted(loaded, key=self._last_used.get):
+            if total <= self.memory_budget:
+                return
+            if self._in_use[direction]:
+                continue
+            total -= self.translators[direction].memory_bytes()
+            self._unload(direction)
+
+        if total > self.memory_budget:
+            print(f"Translation models use {total / 1024 / 1024:.0f}MB, over the "
+                  f"{self.memory_budget / 1024 / 1024:.0f}MB budget; all are in use")
+
+    def _unload(self, direction: str):
+        self.translators[direction].unload_model()
+        self._stats[direction]['unloads'] += 1
+        gc.collect()
@@ -1,8 +1,15 @@
 import spacy
+from spacy.matcher import PhraseMatcher
 from spacy.tokens import Doc
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Iterable, Iterator
+
+from app.utils.instrumentation import measure
 
 class TravelNER:
+    # Components the entity mapping never reads; noun_chunks still needs the
+    # tagger, attribute_ruler and parser, and entities need ner
+    UNUSED_PIPES = ['lemmatizer', 'senter', 'textcat', 'textcat_multilabel', 'entity_linker']
+    
     def __init__(self, model_name="en_core_web_md"):
         """Initialize spaCy with travel-specific entity extraction"""
         self.nlp = spacy.load(model_name)
@@ -16,6 +23,43 @@ class TravelNER:
             'food': ['restaurant', 'cafe', 'dhaba', 'food court', 'street food']
         }
         
+        # Prebuilt keyword index, matched case-insensitively on token text.
+        # Plurals are registered too ("restaurants near India Gate"); LEMMA
+        # matching would need the lemmatizer, which the bulk path disables.
+        self.keyword_matcher = PhraseMatcher(self.nlp.vocab, attr='LOWER')
+        for category, keywords in self.travel_keywords.items():
+            self.keyword_matcher.add(
+                category,
+                [
+                    self.nlp.make_doc(form)
+                    for keyword in keywords
+                    for form in (keyword, self._plural(keyword))
+                ]
+            )
+    
+    @staticmethod
+    def _plural(keyword: str) -> str:
+        """English plural of a keyword's last word ("bus stand" -> "bus stands")"""
+        if keyword.endswith(('s', 'x', 'z', 'ch', 'sh')):
+            return keyword + 'es'
+        return keyword + 's'
+        
+    def analyze(self, text: str) -> Dict:
+        """
+        Run the full pipeline over a single parse of text
+        
+        Returns:
+            Dict with 'entities' (as extract_entities) and 'map_locations'
+            (as extract_locations_for_maps)
+        """
+        with measure('ner', 'analyze', input_size=len(text)):
+            entities = self.extract_entities_from_doc(self.nlp(text))
+        
+        return {
+            'entities': entities,
+            'map_locations': self.extract_locations_for_maps(text, entities)
+        }
+    
     def extract_entities(self, text: str) -> Dict[str, List[str]]:
         """
         Extract travel-relevant entities from text
@@ -23,8 +67,47 @@ class TravelNER:
         Returns:
             Dict with categories: locations, attractions, organizations, misc
         """
-        doc = self.nlp(text)
+        with measure('ner', 'extract_entities', input_size=len(text)):
+            return self.extract_entities_from_doc(self.nlp(text))
+    
+    def extract_entities_stream(self, texts: Iterable, batch_size: int = 64,
+                                n_process: int = 1, as_tuples: bool = False) -> Iterator:
+        """
+        Extract entities from a stream of texts with nlp.pipe
+        
+        Documents are parsed lazily in batches, so memory stays bounded no
+        matter how long the input iterable is.
+        
+        Args:
+            texts: Iterable of strings, or of (text, context) tuples when
+                as_tuples is True
+            batch_size: Documents per spaCy batch
+            n_process: Worker processes for nlp.pipe
+            as_tuples: Carry a context object (e.g. the source record)
+                alongside each text
+        
+        Yields:
+            Entity dicts, or (entities, context) tuples when as_tuples is True
+        """
+        disable = [name for name in self.UNUSED_PIPES if name in self.nlp.pipe_names]
+        
+        docs = self.nlp.pipe(
+            texts,
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=disable,
+            as_tuples=as_tuples
+        )
         
+        if as_tuples:
+            for doc, context in docs:
+                yield self.extract_entities_from_doc(doc), context
+        else:
+            for doc in docs:
+                yield self.extract_entities_from_doc(doc)
+    
+    def extract_entities_from_doc(self, doc: Doc) -> Dict[str, List[str]]:
+        """Extract travel-relevant entities from an already parsed Doc"""
         entities = {
             'locations': [],
             'attractions': [],
@@ -47,7 +130,7 @@ class TravelNER:
                 entities['misc'].append(entity_text)
         
         # Enhance with travel keyword matching
-        entities = self._enhance_with_keywords(text, entities)
+        entities = self._enhance_with_keywords(doc, entities)
         
         # Remove duplicates
         for key in entities:
@@ -55,25 +138,32 @@ class TravelNER:
         
         return entities
     
-    def _enhance_with_keywords(self, text: str, entities: Dict) -> Dict:
+    def _enhance_with_keywords(self, doc: Doc, entities: Dict) -> Dict:
         """Use travel keywords to find additional attractions"""
-        text_lower = text.lower()
+        keyword_tokens = set()
+        for _, start, end in self.keyword_matcher(doc):
+            keyword_tokens.update(range(start, end))
         
-        for category, keywords in self.travel_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    # Extract noun phrases containing the keyword
-                    doc = self.nlp(text)
-                    for chunk in doc.noun_chunks:
-                        if keyword in chunk.text.lower():
-                            if category in ['attractions', 'transport', 'accommodation', 'food']:
-                                entities['attractions'].append(chunk.text)
+        if not keyword_tokens:
+            return entities
+        
+        # Noun phrases containing a keyword (attractions, transport,
+        # accommodation and food all count as attractions)
+        for chunk in doc.noun_chunks:
+            if any(i in keyword_tokens for i in range(chunk.start, chunk.end)):
+                entities['attractions'].append(chunk.text)
         
         return entities
     
-    def extract_locations_for_maps(self, text: str) -> List[str]:
-        """Extract location names suitable for Google Maps API queries"""
-        entities = self.extract_entities(text)
+    def extract_locations_for_maps(self, text: str, entities: Dict[str, List[str]] = None) -> List[str]:
+        """
+        Extract location names suitable for Google Maps API queries
+        
+        Pass entities already returned by extract_entities to skip parsing
+        text a second time.
+        """
+        if entities is None:
+            entities = self.extract_entities(text)
         
         # Combine locations and attractions
         all_locations = entities['locations'] + entities['attractions']
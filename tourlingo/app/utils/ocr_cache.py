@@ -0,0 +1,245 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.utils.instrumentation import measure, record_cache
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so a 2-D DCT is two matrix products"""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    basis = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    basis[0] /= np.sqrt(2)
+    return basis
+
+
+def phash(image: Image.Image, hash_size: int = 24) -> int:
+    """
+    Perceptual hash of an image as a hash_size**2-bit integer
+
+    The image is reduced to a (4 * hash_size)-pixel grayscale square and
+    each of the lowest-frequency DCT coefficients becomes one bit (above or
+    below their median). Re-encoding, rescaling and brightness or colour
+    changes move only a few bits.
+    """
+    side = hash_size * 4
+    # Cheap integer shrink first, so large photos are not converted at full size
+    factor = min(image.size) // (side * 4)
+    if factor >= 2 and image.mode in ('L', 'LA', 'RGB', 'RGBA'):
+        image = image.reduce(factor)
+    pixels = np.asarray(image.convert('L').resize((side, side), Image.BOX), dtype=np.float64)
+    basis = _dct_matrix(side)
+    low = (basis @ pixels @ basis.T)[:hash_size, :hash_size].ravel()
+    # The DC term is overall brightness; keep it out of the median
+    bits = low > np.median(low[1:])
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+class OCRCache:
+    def __init__(self, max_entries: int = 2048, max_distance: int = 20, hash_size: int = 24,
+                 db_path: str = None):
+        """
+        OCR result cache for near-duplicate images
+
+        Photos of the same placard or menu rarely match byte for byte, so
+        entries are keyed by a perceptual hash: a lookup hits when a stored
+        image's hash is within max_distance bits of the new one, for the same
+        OCR settings (languages, mode, profile). That covers re-uploads,
+        forwarded (re-compressed) and resized copies of a photo; a re-framed
+        shot of the same sign moves the hash as far as a one-character
+        difference between two signs does, so it is a miss rather than a
+        risk of returning another sign's text.
+
+        Args:
+            max_entries: Size of the in-process LRU tier
+            max_distance: Largest Hamming distance (out of hash_size**2 bits)
+                still treated as the same image; 0 only matches identical hashes
+            hash_size: Hash side; larger hashes separate signs that differ in
+                a few characters better
+            db_path: SQLite file for the persistent tier; None keeps results
+                in memory only
+        """
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self.db_path = db_path
+
+        # (settings key, image hash) -> result, in LRU order
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.hits = 0
+        self.near_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.db_path:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS ocr_results ("
+                    "key TEXT NOT NULL, image_hash TEXT NOT NULL, result TEXT NOT NULL, "
+                    "created REAL NOT NULL, PRIMARY KEY (key, image_hash))"
+                )
+            self._load_recent()
+
+    def image_hash(self, image: Image.Image) -> int:
+        """Perceptual hash of an uploaded image, computed before any OCR work"""
+        with measure('ocr_cache', 'hash', input_size=image.size[0] * image.size[1]):
+            return phash(image, self.hash_size)
+
+    @staticmethod
+    def make_key(operation: str, languages: Iterable[str], **settings) -> str:
+        """Settings part of a key: what was run on the image and with which languages"""
+        return json.dumps(
+            [operation, sorted(dict.fromkeys(lang.lower() for lang in languages)), settings],
+            sort_keys=True
+        )
+
+    def get(self, image_hash: int, key: str):
+        """Result for the closest stored image within max_distance, or None"""
+        with self._lock:
+            result, distance = self._nearest(image_hash, key)
+            if result is not None:
+                self.hits += 1
+                self.near_hits += distance > 0
+                record_cache('ocr', 'memory', True)
+                # Copies in and out, so callers cannot edit the cached result
+                return deepcopy(result)
+        record_cache('ocr', 'memory', False)
+
+        if self.db_path:
+            # Another worker may have stored this exact image
+            row = self._connection().execute(
+                "SELECT result FROM ocr_results WHERE key = ? AND image_hash = ?",
+                (key, format(image_hash, 'x'))
+            ).fetchone()
+            record_cache('ocr', 'disk', row is not None)
+            if row is not None:
+                result = json.loads(row[0])
+                self._remember(key, image_hash, deepcopy(result))
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return result
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, image_hash: int, key: str, result):
+        """Store a JSON-serializable OCR result in both tiers"""
+        self._remember(key, image_hash, deepcopy(result))
+
+        if self.db_path:
+            try:
+                connection = self._connection()
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO ocr_results (key, image_hash, result, created) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, format(image_hash, 'x'), json.dumps(result, ensure_ascii=False), time.time())
+                    )
+            except sqlite3.Error as e:
+                print(f"OCR cache write error: {e}")
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and tier sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'near_hits': self.near_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'max_distance': self.max_distance,
+                'hash_bits': self.hash_size ** 2,
+                'persistent': bool(self.db_path)
+            }
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+
+        if self.db_path:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM ocr_results")
+
+    def close(self):
+        """Close this thread's SQLite connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _nearest(self, image_hash: int, key: str) -> Tuple[Optional[object], int]:
+        """Closest entry for key within max_distance (caller holds _lock)"""
+        exact = self._memory.get((key, image_hash))
+        if exact is not None:
+            self._memory.move_to_end((key, image_hash))
+            return exact, 0
+
+        best, best_distance = None, self.max_distance + 1
+        for entry_key, entry_hash in self._memory:
+            if entry_key != key:
+                continue
+            distance = (entry_hash ^ image_hash).bit_count()
+            if distance < best_distance:
+                best, best_distance = (entry_key, entry_hash), distance
+        if best is None:
+            return None, 0
+        self._memory.move_to_end(best)
+        return self._memory[best], best_distance
+
+    def _remember(self, key: str, image_hash: int, result):
+        with self._lock:
+            self._memory[(key, image_hash)] = result
+            self._memory.move_to_end((key, image_hash))
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.evictions += 1
+
+    def _load_recent(self):
+        """Fill the memory tier with the newest persisted results, so near matches work after a restart"""
+        rows = self._connection().execute(
+            "SELECT key, image_hash, result FROM ocr_results ORDER BY created DESC LIMIT ?",
+            (self.max_entries,)
+        ).fetchall()
+        with self._lock:
+            for key, image_hash, result in reversed(rows):
+                self._memory[(key, int(image_hash, 16))] = json.loads(result)
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        One SQLite connection per thread and process; WAL lets worker
+        processes share the file. Connections inherited across fork() are
+        never reused.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.db_path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
@@ -2,11 +2,57 @@ import pytesseract
 from PIL import Image
 import cv2
 import numpy as np
-from typing import Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+import math
+import os
+import tempfile
+import time
+
+from app.utils.instrumentation import measure, timed
+from app.utils.scripts import detect_text_language, split_by_language
+from app.utils.text_regions import crop_region, detect_text_regions
 
 class OCRProcessor:
-    def __init__(self):
-        """Initialize OCR processor with language support"""
+    # Multi-language OCR strategies:
+    #   sequential - one tesseract run per language, one after another
+    #   parallel   - one tesseract run per language on a bounded thread pool
+    #   combined   - a single run with all languages (e.g. 'hin+eng'), split
+    #                back into per-language text by script
+    MODES = ('sequential', 'parallel', 'combined')
+    
+    # Preprocessing profiles, trading accuracy for latency:
+    #   max_side  - longest image side after downscaling, in pixels
+    #   denoise   - none, median, gaussian or nlmeans (applied to grayscale)
+    #   threshold - otsu (global) or adaptive (local Gaussian)
+    PREPROCESS_PROFILES = {
+        'fast': {'max_side': 1600, 'denoise': 'median', 'threshold': 'otsu'},
+        'balanced': {'max_side': 2400, 'denoise': 'gaussian', 'threshold': 'adaptive'},
+        'accurate': {'max_side': 3500, 'denoise': 'nlmeans', 'threshold': 'adaptive'},
+    }
+    
+    def __init__(self, mode: str = 'parallel', max_workers: int = 4, profile: str = 'balanced'):
+        """
+        Initialize OCR processor with language support
+        
+        Args:
+            mode: Default multi-language strategy, one of MODES
+            max_workers: Maximum concurrent tesseract processes in parallel mode
+            profile: Default preprocessing profile, one of PREPROCESS_PROFILES
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown OCR mode '{mode}', expected one of {self.MODES}")
+        if profile not in self.PREPROCESS_PROFILES:
+            raise ValueError(
+                f"Unknown preprocessing profile '{profile}', expected one of {tuple(self.PREPROCESS_PROFILES)}"
+            )
+        self.mode = mode
+        self.profile = profile
+        self.max_workers = max_workers
+        # Tesseract runs as a subprocess, so threads are enough to use every core
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ocr')
+        
         # IndicTrans2 supported languages mapped to Tesseract codes
         self.lang_map = {
             'hindi': 'hin',
@@ -20,76 +66,405 @@ class OCRProcessor:
             'english': 'eng'
         }
     
-    def preprocess_image(self, image: Image.Image) -> np.ndarray:
+    @timed('ocr', 'preprocess', input_size=lambda self, image, *args, **kwargs: image.size[0] * image.size[1])
+    def preprocess_image(self, image: Image.Image, profile: str = None,
+                         timings: Dict[str, float] = None) -> np.ndarray:
         """
         Preprocess image for better OCR accuracy
         
         Steps:
-        1. Convert to grayscale
-        2. Apply thresholding
-        3. Denoise
+        1. Convert to grayscale (RGB, RGBA, palette, grayscale and 16-bit input)
+        2. Downscale to the profile's working resolution
+        3. Denoise the grayscale image
+        4. Apply thresholding
+        
+        Args:
+            image: PIL Image object
+            profile: One of PREPROCESS_PROFILES (defaults to self.profile)
+            timings: Optional dict that receives per-stage durations in ms
         """
-        # Convert PIL Image to numpy array
-        img_array = np.array(image)
+        settings = self.PREPROCESS_PROFILES[profile or self.profile]
+        if timings is None:
+            timings = {}
+        
+        gray = self.preprocess_gray(image, profile, timings)
+        
+        stage_start = time.perf_counter()
+        if settings['threshold'] == 'otsu':
+            _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        else:
+            # Apply adaptive thresholding
+            thresh = cv2.adaptiveThreshold(
+                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
+                cv2.THRESH_BINARY, 11, 2
+            )
+        timings['threshold'] = round((time.perf_counter() - stage_start) * 1000, 3)
+        
+        return thresh
+    
+    @timed('ocr', 'preprocess_gray', input_size=lambda self, image, *args, **kwargs: image.size[0] * image.size[1])
+    def preprocess_gray(self, image: Image.Image, profile: str = None,
+                        timings: Dict[str, float] = None) -> np.ndarray:
+        """
+        Steps 1-3 of preprocess_image: grayscale, downscaled and denoised,
+        but not yet thresholded (the input for extract_text_regions)
+        """
+        settings = self.PREPROCESS_PROFILES[profile or self.profile]
+        if timings is None:
+            timings = {}
+        
+        stage_start = time.perf_counter()
+        
+        def mark(stage):
+            nonlocal stage_start
+            now = time.perf_counter()
+            timings[stage] = round((now - stage_start) * 1000, 3)
+            stage_start = now
         
         # Convert to grayscale
-        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+        gray = self._to_grayscale(image)
+        mark('grayscale')
+        
+        # Downscale very large photos; tesseract gains nothing from 12MP input
+        height, width = gray.shape[:2]
+        longest = max(height, width)
+        if longest > settings['max_side']:
+            scale = settings['max_side'] / longest
+            gray = cv2.resize(
+                gray, (max(1, round(width * scale)), max(1, round(height * scale))),
+                interpolation=cv2.INTER_AREA
+            )
+        mark('resize')
+        
+        # Denoise before binarization, where it still has grey levels to work with
+        denoise = settings['denoise']
+        if denoise == 'median':
+            gray = cv2.medianBlur(gray, 3)
+        elif denoise == 'gaussian':
+            gray = cv2.GaussianBlur(gray, (3, 3), 0)
+        elif denoise == 'nlmeans':
+            gray = cv2.fastNlMeansDenoising(gray, None, 10, 7, 15)
+        mark('denoise')
         
-        # Apply adaptive thresholding
-        thresh = cv2.adaptiveThreshold(
-            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY, 11, 2
-        )
+        return gray
+    
+    def max_side(self, profile: str = None) -> int:
+        """Longest image side preprocessing keeps for a profile"""
+        return self.PREPROCESS_PROFILES[profile or self.profile]['max_side']
+    
+    def _to_grayscale(self, image: Image.Image) -> np.ndarray:
+        """Convert any PIL image mode to a 2-D uint8 grayscale array"""
+        if image.mode == 'L':
+            return np.asarray(image)
+        
+        if image.mode == 'P':
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        
+        if image.mode in ('RGBA', 'LA'):
+            # Flatten transparency onto white, as signage is usually dark on light
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image.convert('RGBA'), mask=image.getchannel('A'))
+            image = background
+        
+        if image.mode == 'RGB':
+            return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+        
+        if image.mode.startswith('I;16'):
+            # convert('L') would clip at 255; keep the high byte instead
+            return (np.asarray(image).astype(np.uint16) >> 8).astype(np.uint8)
         
-        # Denoise
-        denoised = cv2.fastNlMeansDenoising(thresh, None, 10, 7, 21)
+        if image.mode in ('I', 'F'):
+            # 32-bit int or float: stretch the value range onto 0-255
+            values = np.asarray(image, dtype=np.float64)
+            low, high = values.min(), values.max()
+            if high <= low:
+                return np.zeros(values.shape, dtype=np.uint8)
+            return ((values - low) * (255.0 / (high - low))).round().astype(np.uint8)
         
-        return denoised
+        # CMYK, YCbCr and other modes
+        return np.asarray(image.convert('L'))
     
-    def extract_text(self, image: Image.Image, languages: List[str] = None) -> Dict[str, str]:
+    def extract_text(self, image: Image.Image, languages: List[str] = None,
+                     mode: str = None, profile: str = None,
+                     timings: Dict[str, float] = None) -> Dict[str, str]:
         """
         Extract text from image in multiple languages
         
         Args:
             image: PIL Image object
             languages: List of language names (e.g., ['english', 'hindi'])
+            mode: Multi-language strategy (defaults to self.mode)
+            profile: Preprocessing profile (defaults to self.profile)
+            timings: Optional dict that receives per-stage durations in ms
         
         Returns:
             Dict with extracted text for each language
         """
+        # Preprocess image
+        processed_img = self.preprocess_image(image, profile, timings)
+        
+        start = time.perf_counter()
+        results = self.extract_text_from_processed(processed_img, languages, mode)
+        if timings is not None:
+            timings['ocr'] = round((time.perf_counter() - start) * 1000, 3)
+        
+        return results
+    
+    def extract_text_from_processed(self, processed_img: np.ndarray, languages: List[str] = None,
+                                    mode: str = None) -> Dict[str, str]:
+        """
+        Extract text from an image already run through preprocess_image
+        
+        The image is encoded to a temporary file once and every tesseract
+        invocation reads that same file.
+        """
         if languages is None:
             languages = ['english', 'hindi']
+        mode = mode or self.mode
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown OCR mode '{mode}', expected one of {self.MODES}")
         
-        # Preprocess image
-        processed_img = self.preprocess_image(image)
-        
-        results = {}
+        # Deduplicate while keeping the caller's order
+        languages = list(dict.fromkeys(languages))
         
-        for lang in languages:
-            tesseract_lang = self.lang_map.get(lang.lower(), 'eng')
+        with measure('ocr', f'extract_{mode}', input_size=processed_img.size, batch_size=len(languages)), \
+                self._encoded_image(processed_img) as image_path:
+            if len(languages) == 1:
+                return {languages[0]: self._ocr_single(image_path, languages[0])}
             
-            try:
-                # Extract text
+            if mode == 'combined':
+                return self._ocr_combined(image_path, languages)
+            
+            if mode == 'parallel':
+                texts = self._pool.map(lambda lang: self._ocr_single(image_path, lang), languages)
+                return dict(zip(languages, texts))
+            
+            return {lang: self._ocr_single(image_path, lang) for lang in languages}
+    
+    def extract_text_with_language(self, processed_img: np.ndarray,
+                                   candidates: List[str] = None) -> Tuple[str, Dict[str, str]]:
+        """
+        OCR once with every candidate language and classify what comes back
+        
+        One combined tesseract pass reads all candidate scripts; the text is
+        split per language by script and the language with the most letters
+        wins. This replaces an OSD pass (detect_language) followed by a
+        separate OCR run per language.
+        
+        Returns:
+            (detected language, dict with extracted text for each candidate)
+        """
+        candidates = list(dict.fromkeys(candidates or ['english', 'hindi']))
+        texts = self.extract_text_from_processed(processed_img, candidates, mode='combined')
+        language = detect_text_language('\n'.join(texts.values()), candidates)
+        return language, texts
+    
+    def extract_text_regions(self, gray: np.ndarray, languages: List[str] = None,
+                             image_size: Tuple[int, int] = None,
+                             timings: Dict[str, float] = None) -> Tuple[Dict[str, str], List[Dict]]:
+        """
+        Locate lines of text first, then OCR only those
+        
+        Each detected line is cut out, rotated level, scaled to the text
+        height tesseract reads best and binarized on its own. The lines are
+        stacked into at most max_workers strips, which are OCR'd in parallel
+        with every language at once, so a street photo costs a few tesseract
+        runs over text instead of one over the whole frame.
+        
+        Args:
+            gray: Output of preprocess_gray
+            languages: List of language names (e.g., ['english', 'hindi'])
+            image_size: (width, height) boxes are reported in, e.g. the
+                uploaded image's size; defaults to gray's own size
+            timings: Optional dict that receives per-stage durations in ms
+        
+        Returns:
+            (dict with extracted text for each language, list of lines with
+            their text, box, angle and words with boxes and confidence)
+        """
+        languages = list(dict.fromkeys(languages or ['english', 'hindi']))
+        tesseract_langs = '+'.join(dict.fromkeys(
+            self.lang_map.get(lang.lower(), 'eng') for lang in languages
+        ))
+        height, width = gray.shape[:2]
+        box_scale = (image_size[0] / width, image_size[1] / height) if image_size else (1.0, 1.0)
+        
+        start = time.perf_counter()
+        regions = detect_text_regions(gray)
+        crops = []
+        for region in regions:
+            crop, matrix = crop_region(gray, region)
+            _, crop = cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            crops.append((crop, cv2.invertAffineTransform(matrix)))
+        if timings is not None:
+            timings['detect'] = round((time.perf_counter() - start) * 1000, 3)
+        
+        start = time.perf_counter()
+        # Consecutive lines share a strip; each strip is one tesseract run
+        per_strip = max(4, math.ceil(len(crops) / self.max_workers))
+        groups = [list(range(i, min(i + per_strip, len(crops)))) for i in range(0, len(crops), per_strip)]
+        words = {}
+        with measure('ocr', 'extract_regions', input_size=sum(crop.size for crop, _ in crops),
+                     batch_size=len(crops)):
+            for group_words in self._pool.map(
+                lambda group: self._ocr_strip([crops[i] for i in group], group, tesseract_langs), groups
+            ):
+                words.update(group_words)
+        if timings is not None:
+            timings['ocr'] = round((time.perf_counter() - start) * 1000, 3)
+        
+        lines = []
+        for index, region in enumerate(regions):
+            line_words = [
+                {'text': text, 'box': self._scale_box(box, box_scale), 'confidence': confidence}
+                for text, box, confidence in words.get(index, [])
+            ]
+            if not line_words:
+                continue
+            lines.append({
+                'text': ' '.join(word['text'] for word in line_words),
+                'box': self._scale_box(region.box, box_scale),
+                'angle': round(region.angle, 1),
+                'words': line_words
+            })
+        
+        texts = split_by_language('\n'.join(line['text'] for line in lines), languages)
+        return texts, lines
+    
+    def _ocr_strip(self, crops: List[Tuple[np.ndarray, np.ndarray]], indexes: List[int],
+                   tesseract_langs: str) -> Dict[int, List]:
+        """
+        OCR line crops stacked into one image and map the words back
+        
+        Returns:
+            {line index: [(word, [x, y, width, height] in gray coordinates, confidence)]}
+        """
+        margin = 20
+        strip_width = max(crop.shape[1] for crop, _ in crops) + 2 * margin
+        strip_height = sum(crop.shape[0] + margin for crop, _ in crops) + margin
+        strip = np.full((strip_height, strip_width), 255, dtype=np.uint8)
+        
+        slots = []
+        top = margin
+        for crop, inverse in crops:
+            crop_height, crop_width = crop.shape
+            strip[top:top + crop_height, margin:margin + crop_width] = crop
+            slots.append((top, top + crop_height, inverse))
+            top += crop_height + margin
+        
+        try:
+            with self._encoded_image(strip) as image_path, measure('ocr', 'tesseract', batch_size=len(crops)):
+                data = pytesseract.image_to_data(
+                    image_path,
+                    lang=tesseract_langs,
+                    config='--psm 6',  # Lines stacked as one block of text
+                    output_type=pytesseract.Output.DICT
+                )
+        except Exception as e:
+            print(f"OCR error for {tesseract_langs}: {e}")
+            return {}
+        
+        words = {}
+        for text, left, word_top, word_width, word_height, confidence in zip(
+                data['text'], data['left'], data['top'], data['width'], data['height'], data['conf']):
+            text = text.strip()
+            if not text:
+                continue
+            center = word_top + word_height / 2
+            for index, (slot_top, slot_bottom, inverse) in zip(indexes, slots):
+                if slot_top <= center < slot_bottom:
+                    # Word corners in crop coordinates, back through the deskew and scaling
+                    corners = np.array([
+                        [left - margin, word_top - slot_top],
+                        [left - margin + word_width, word_top - slot_top],
+                        [left - margin, word_top - slot_top + word_height],
+                        [left - margin + word_width, word_top - slot_top + word_height],
+                    ], dtype=np.float32)
+                    mapped = cv2.transform(corners[None], inverse)[0]
+                    x, y = mapped.min(axis=0)
+                    right, bottom = mapped.max(axis=0)
+                    words.setdefault(index, []).append(
+                        (text, [float(x), float(y), float(right - x), float(bottom - y)], float(confidence))
+                    )
+                    break
+        return words
+    
+    @classmethod
+    def rescale_lines(cls, lines: List[Dict], from_size: Tuple[int, int],
+                      to_size: Tuple[int, int]) -> List[Dict]:
+        """Copy of extract_text_regions lines with boxes moved from one image size to another"""
+        if tuple(from_size) == tuple(to_size):
+            return lines
+        scale = (to_size[0] / from_size[0], to_size[1] / from_size[1])
+        return [
+            {
+                **line,
+                'box': cls._scale_box(line['box'], scale),
+                'words': [{**word, 'box': cls._scale_box(word['box'], scale)} for word in line['words']]
+            }
+            for line in lines
+        ]
+    
+    @staticmethod
+    def _scale_box(box, scale: Tuple[float, float]) -> List[int]:
+        x, y, width, height = box
+        return [round(x * scale[0]), round(y * scale[1]), round(width * scale[0]), round(height * scale[1])]
+    
+    def _ocr_single(self, image_path: str, lang: str) -> str:
+        tesseract_lang = self.lang_map.get(lang.lower(), 'eng')
+        
+        try:
+            # Extract text
+            with measure('ocr', 'tesseract'):
                 text = pytesseract.image_to_string(
-                    processed_img,
+                    image_path,
                     lang=tesseract_lang,
                     config='--psm 6'  # Assume uniform block of text
                 )
-                
-                results[lang] = text.strip()
-                
-            except Exception as e:
-                print(f"OCR error for {lang}: {e}")
-                results[lang] = ""
+            return text.strip()
+            
+        except Exception as e:
+            print(f"OCR error for {lang}: {e}")
+            return ""
+    
+    def _ocr_combined(self, image_path: str, languages: List[str]) -> Dict[str, str]:
+        tesseract_langs = '+'.join(dict.fromkeys(
+            self.lang_map.get(lang.lower(), 'eng') for lang in languages
+        ))
         
-        return results
+        try:
+            with measure('ocr', 'tesseract', batch_size=len(languages)):
+                text = pytesseract.image_to_string(
+                    image_path,
+                    lang=tesseract_langs,
+                    config='--psm 6'  # Assume uniform block of text
+                )
+        except Exception as e:
+            print(f"OCR error for {tesseract_langs}: {e}")
+            return {lang: "" for lang in languages}
+        
+        return split_by_language(text, languages)
+    
+    @contextmanager
+    def _encoded_image(self, processed_img: np.ndarray):
+        """Write the image to one temporary PNG shared by every tesseract call"""
+        fd, path = tempfile.mkstemp(prefix='tourlingo_ocr_', suffix='.png')
+        os.close(fd)
+        try:
+            cv2.imwrite(path, processed_img)
+            yield path
+        finally:
+            os.remove(path)
     
     def detect_language(self, image: Image.Image) -> str:
         """
         Detect primary language in image using OSD (Orientation and Script Detection)
+        
+        Accepts a PIL image or an already preprocessed numpy array.
         """
         try:
-            osd_data = pytesseract.image_to_osd(image)
+            with measure('ocr', 'osd'):
+                osd_data = pytesseract.image_to_osd(image)
             # Parse script information
             for line in osd_data.split('\n'):
                 if 'Script:' in line:
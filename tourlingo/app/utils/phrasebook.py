@@ -0,0 +1,419 @@
+import glob
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app.utils.gazetteer import normalize
+from app.utils.instrumentation import record_cache
+
+# Bumped when the schema changes; readers refuse packs of another format
+PACK_FORMAT = 1
+
+SCHEMA = [
+    # One row per landmark or phrase; the unique index on normalized is
+    # also the prefix index (range scans on normalized)
+    """CREATE TABLE IF NOT EXISTS entries (
+        id INTEGER PRIMARY KEY,
+        normalized TEXT NOT NULL UNIQUE,
+        text TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        analysis TEXT NOT NULL,
+        analysis_fingerprint TEXT NOT NULL,
+        suggestions TEXT,
+        suggestions_fingerprint TEXT,
+        suggestions_built REAL
+    )""",
+    """CREATE TABLE IF NOT EXISTS translations (
+        entry_id INTEGER NOT NULL REFERENCES entries(id),
+        lang TEXT NOT NULL,
+        translation TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        PRIMARY KEY (entry_id, lang)
+    ) WITHOUT ROWID""",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+]
+
+
+def pack_slug(city: str) -> str:
+    """File name stem for a city's pack, e.g. "New Delhi" -> "new-delhi" """
+    return normalize(city).replace(' ', '-')
+
+
+def read_meta(db_path: str) -> Dict[str, str]:
+    """A pack's meta table, read through a short-lived connection"""
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return dict(connection.execute("SELECT key, value FROM meta").fetchall())
+    finally:
+        connection.close()
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class PhrasebookPack:
+    def __init__(self, db_path: str, mmap_size: int = 64 * 1024 * 1024):
+        """
+        Read-only offline phrasebook for one city, built with app.phrasebook_build
+
+        Holds the city's landmarks and stock phrases with their entities,
+        Maps suggestions and a translation into every pack language, keyed
+        by gazetteer.normalize(text), so a matching request is answered
+        without model inference or a Maps call. The file is also what
+        clients download for offline use.
+
+        Raises:
+            FileNotFoundError: db_path does not exist
+            ValueError: the pack was written in another PACK_FORMAT
+        """
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Phrasebook pack not found: {db_path}")
+
+        self.db_path = db_path
+        self.mmap_size = mmap_size
+        self.meta = read_meta(db_path)
+        if int(self.meta.get('format', 0)) != PACK_FORMAT:
+            raise ValueError(
+                f"{db_path} is phrasebook format {self.meta.get('format')}, expected {PACK_FORMAT}"
+            )
+
+        self.city = self.meta['city']
+        self.slug = pack_slug(self.city)
+        self.version = int(self.meta['version'])
+        self.source_lang = self.meta['source_lang']
+        self.languages = [lang for lang in self.meta.get('languages', '').split(',') if lang]
+        self._local = threading.local()
+
+    def lookup(self, text: str) -> Optional[Dict]:
+        """
+        The entry whose normalized text equals text's, or None
+
+        Returns:
+            Dict with 'text', 'kind' ('landmark' or 'phrase'), 'entities' and
+            'map_locations' (as TravelNER.analyze), 'suggestions' (as
+            /api/travel-assist; None if not looked up), 'translations'
+            ({language: text}), plus the pack's 'city' and 'version'
+        """
+        key = normalize(text)
+        if not key:
+            return None
+
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT id, text, kind, analysis, suggestions FROM entries WHERE normalized = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        entry_id, text, kind, analysis, suggestions = row
+        translations = dict(connection.execute(
+            "SELECT lang, translation FROM translations WHERE entry_id = ?", (entry_id,)
+        ).fetchall())
+        return {
+            **json.loads(analysis),
+            'text': text,
+            'kind': kind,
+            'suggestions': json.loads(suggestions) if suggestions is not None else None,
+            'translations': translations,
+            'city': self.city,
+            'version': self.version
+        }
+
+    def search(self, prefix: str, limit: int = 10, lang: str = None) -> List[Dict]:
+        """
+        Entries whose normalized text starts with prefix, shortest first
+
+        Args:
+            lang: Also return each entry's translation into this language
+        """
+        key = normalize(prefix)
+        if not key:
+            return []
+
+        rows = self._connection().execute(
+            "SELECT e.text, e.kind, t.translation FROM entries e "
+            "LEFT JOIN translations t ON t.entry_id = e.id AND t.lang = ? "
+            "WHERE e.normalized >= ? AND e.normalized < ? "
+            "ORDER BY length(e.normalized), e.normalized LIMIT ?",
+            (lang, key, key + '\U0010ffff', limit)
+        ).fetchall()
+
+        results = []
+        for text, kind, translation in rows:
+            result = {'text': text, 'kind': kind}
+            if lang:
+                result['translation'] = translation
+            results.append(result)
+        return results
+
+    def info(self) -> Dict:
+        """Build metadata plus entry count and file size, for the pack listing"""
+        entries = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            'city': self.city,
+            'slug': self.slug,
+            'version': self.version,
+            'format': PACK_FORMAT,
+            'built_at': self.meta.get('built_at'),
+            'source_lang': self.source_lang,
+            'languages': self.languages,
+            'entries': entries,
+            'size_bytes': os.path.getsize(self.db_path)
+        }
+
+    def close(self):
+        """Close this thread's SQLite connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """One read-only connection per thread and process"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+
+class Phrasebooks:
+    def __init__(self, directory: str, refresh_seconds: float = 60):
+        """
+        Every phrasebook pack (*.db) in a directory
+
+        The directory is rescanned at most every refresh_seconds, so a pack
+        rebuilt (atomically replaced) by app.phrasebook_build, or a new
+        city's pack, is picked up without a restart.
+        """
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        self._packs = {}
+        # path -> ((inode, mtime, size), pack)
+        self._files = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.refresh(force=True)
+
+    def lookup(self, text: str, source_lang: str = 'english', city: str = None) -> Optional[Dict]:
+        """
+        Precomputed entry for text (see PhrasebookPack.lookup), or None
+
+        Only packs built from source_lang are consulted; with city, only
+        that city's pack.
+        """
+        self.refresh()
+        if city:
+            pack = self._packs.get(pack_slug(city))
+            packs = [pack] if pack is not None else []
+        else:
+            packs = list(self._packs.values())
+
+        for pack in packs:
+            if pack.source_lang != source_lang:
+                continue
+            entry = pack.lookup(text)
+            if entry is not None:
+                record_cache('phrasebook', 'pack', True)
+                return entry
+        record_cache('phrasebook', 'pack', False)
+        return None
+
+    def get(self, city: str) -> Optional[PhrasebookPack]:
+        """A city's pack by name or slug"""
+        self.refresh()
+        return self._packs.get(pack_slug(city))
+
+    def packs(self) -> List[PhrasebookPack]:
+        self.refresh()
+        return sorted(self._packs.values(), key=lambda pack: pack.slug)
+
+    def refresh(self, force: bool = False):
+        """Open new or replaced pack files and drop deleted ones"""
+        now = time.monotonic()
+        if not force and now - self._checked < self.refresh_seconds:
+            return
+
+        with self._lock:
+            self._checked = now
+            files = {}
+            for path in sorted(glob.glob(os.path.join(self.directory, '*.db'))):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                previous = self._files.get(path)
+                if previous is not None and previous[0] == signature:
+                    files[path] = previous
+                    continue
+                try:
+                    files[path] = (signature, PhrasebookPack(path))
+                except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+                    print(f"Skipping phrasebook pack {path}: {e}")
+
+            self._files = files
+            self._packs = {pack.slug: pack for _, pack in files.values()}
+
+
+class PhrasebookBuilder:
+    def __init__(self, db_path: str, force: bool = False):
+        """
+        Writes a phrasebook pack, reusing unchanged entries of the last build
+
+        The existing pack (unless force) is copied next to db_path and
+        updated there; finish() moves it into place, so a running server
+        or a client download never sees a half-built file. Every stored
+        result carries a fingerprint of its inputs, and the build pipeline
+        only recomputes results whose fingerprint changed.
+        """
+        self.db_path = db_path
+        self._build_path = db_path + '.building'
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self._build_path):
+            os.remove(self._build_path)
+
+        self.previous_version = 0
+        if os.path.exists(db_path):
+            try:
+                meta = read_meta(db_path)
+                self.previous_version = int(meta.get('version', 0))
+                if not force and int(meta.get('format', 0)) == PACK_FORMAT:
+                    shutil.copyfile(db_path, self._build_path)
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Rebuilding {db_path} from scratch: {e}")
+
+        self.connection = sqlite3.connect(self._build_path)
+        self.connection.execute("PRAGMA synchronous=OFF")
+        for statement in SCHEMA:
+            self.connection.execute(statement)
+
+        self.changes = 0
+
+    def entries(self) -> Dict[str, Dict]:
+        """
+        What the previous build stored, by normalized text
+
+        Each value has 'id', 'analysis' (parsed), 'analysis_fingerprint',
+        'suggestions_fingerprint', 'suggestions_built' and 'translations'
+        ({language: fingerprint}).
+        """
+        entries = {}
+        for row in self.connection.execute(
+                "SELECT id, normalized, analysis, analysis_fingerprint, suggestions_fingerprint, "
+                "suggestions_built FROM entries"):
+            entry_id, key, analysis, analysis_fingerprint, suggestions_fingerprint, built = row
+            entries[key] = {
+                'id': entry_id,
+                'analysis': json.loads(analysis),
+                'analysis_fingerprint': analysis_fingerprint,
+                'suggestions_fingerprint': suggestions_fingerprint,
+                'suggestions_built': built,
+                'translations': {}
+            }
+        by_id = {entry['id']: entry for entry in entries.values()}
+        for entry_id, lang, fingerprint in self.connection.execute(
+                "SELECT entry_id, lang, fingerprint FROM translations"):
+            by_id[entry_id]['translations'][lang] = fingerprint
+        return entries
+
+    def put_entry(self, kind: str, text: str, analysis: Dict, fingerprint: str) -> int:
+        """Insert or update an entry's text and analysis; returns its id"""
+        key = normalize(text)
+        self.connection.execute(
+            "INSERT INTO entries (normalized, text, kind, analysis, analysis_fingerprint) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (normalized) DO UPDATE SET "
+            "text = excluded.text, kind = excluded.kind, analysis = excluded.analysis, "
+            "analysis_fingerprint = excluded.analysis_fingerprint",
+            (key, text, kind, _dumps(analysis), fingerprint)
+        )
+        self.changes += 1
+        return self.connection.execute(
+            "SELECT id FROM entries WHERE normalized = ?", (key,)
+        ).fetchone()[0]
+
+    def put_translation(self, entry_id: int, lang: str, translation: str, fingerprint: str):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO translations (entry_id, lang, translation, fingerprint) "
+            "VALUES (?, ?, ?, ?)",
+            (entry_id, lang, translation, fingerprint)
+        )
+        self.changes += 1
+
+    def put_suggestions(self, entry_id: int, suggestions: List[Dict], fingerprint: str):
+        self.connection.execute(
+            "UPDATE entries SET suggestions = ?, suggestions_fingerprint = ?, suggestions_built = ? "
+            "WHERE id = ?",
+            (_dumps(suggestions), fingerprint, time.time(), entry_id)
+        )
+        self.changes += 1
+
+    def keep_only(self, texts: Iterable[str], languages: Iterable[str]) -> int:
+        """Delete entries not in texts and translations not in languages; returns rows removed"""
+        keys = {normalize(text) for text in texts}
+        languages = set(languages)
+
+        stale = [
+            entry_id for entry_id, key in self.connection.execute("SELECT id, normalized FROM entries")
+            if key not in keys
+        ]
+        removed = 0
+        for entry_id in stale:
+            removed += self.connection.execute(
+                "DELETE FROM translations WHERE entry_id = ?", (entry_id,)
+            ).rowcount
+            removed += self.connection.execute("DELETE FROM entries WHERE id = ?", (entry_id,)).rowcount
+
+        for (lang,) in self.connection.execute("SELECT DISTINCT lang FROM translations").fetchall():
+            if lang not in languages:
+                removed += self.connection.execute(
+                    "DELETE FROM translations WHERE lang = ?", (lang,)
+                ).rowcount
+
+        self.changes += removed
+        return removed
+
+    def finish(self, city: str, source_lang: str, languages: List[str], source: str = None) -> Dict:
+        """
+        Record metadata and atomically replace db_path
+
+        The version only goes up when something changed; an unchanged pack
+        is left as it was, so clients holding it need not download again.
+        """
+        summary = {'path': self.db_path, 'changes': self.changes}
+        if not self.changes and self.previous_version:
+            self.connection.close()
+            os.remove(self._build_path)
+            return {**summary, 'version': self.previous_version}
+
+        version = self.previous_version + 1
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ('format', str(PACK_FORMAT)),
+                    ('city', city),
+                    ('version', str(version)),
+                    ('built_at', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())),
+                    ('source_lang', source_lang),
+                    ('languages', ','.join(languages)),
+                    ('source', source or ''),
+                ]
+            )
+        self.connection.execute("ANALYZE")
+        self.connection.execute("VACUUM")
+        self.connection.close()
+
+        os.replace(self._build_path, self.db_path)
+        return {**summary, 'version': version}
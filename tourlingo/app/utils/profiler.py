@@ -0,0 +1,127 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Iterable
+
+from flask import g, request
+
+# Threads doing work on behalf of requests off the request thread: the
+# composite-endpoint stage pool, OCR pool, translation batchers and jobs
+SHARED_THREAD_PREFIXES = ('background', 'ocr', 'translate-batcher', 'job-worker')
+
+
+class StackSampler(threading.Thread):
+    """
+    One process-wide sampler of Python stacks, shared by all profiled requests
+
+    Each profiled request registers its thread. Every interval the sampler
+    walks the stacks once: a request thread's stack is counted only in that
+    request's profile, and stacks of shared worker threads (see
+    SHARED_THREAD_PREFIXES), which cannot be tied to one request, are
+    counted in every active profile under their thread name. Nothing is
+    walked while no request is registered, so the cost per interval does
+    not grow with concurrency.
+    """
+
+    def __init__(self, interval_ms: float = 5, shared_prefixes: Iterable[str] = SHARED_THREAD_PREFIXES):
+        super().__init__(name='stack-sampler', daemon=True)
+        self.interval = interval_ms / 1000
+        self.shared_prefixes = tuple(shared_prefixes)
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def register(self, ident: int) -> Counter:
+        """Start collecting a profile for the request running on thread ident"""
+        samples = Counter()
+        with self._lock:
+            self._profiles[ident] = samples
+        return samples
+
+    def unregister(self, ident: int) -> Counter:
+        """Stop collecting for thread ident and return its samples"""
+        with self._lock:
+            return self._profiles.pop(ident, Counter())
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                profiles = dict(self._profiles)
+            if not profiles:
+                continue
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident in profiles:
+                    profiles[ident][self._fold(names.get(ident, str(ident)), frame)] += 1
+                elif names.get(ident, '').startswith(self.shared_prefixes):
+                    stack = self._fold(names[ident], frame)
+                    for samples in profiles.values():
+                        samples[stack] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    @staticmethod
+    def _fold(thread_name, frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        stack.append(thread_name)
+        return ';'.join(reversed(stack)).replace(' ', '_')
+
+    @staticmethod
+    def write_folded(samples: Counter, path: str):
+        """Write collapsed stacks, the input of flamegraph.pl and speedscope"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def init_profiler(app, threshold_ms: float, output_dir: str = 'profiles', interval_ms: float = 5):
+    """
+    Sample every request and keep a flame graph of the slow ones
+
+    Requests taking at least threshold_ms leave a <endpoint>-<timestamp>.folded
+    file in output_dir. Meant for debugging: sampling adds overhead to
+    every request. Streamed responses are only profiled up to the first byte.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    state = {'sampler': None, 'pid': None}
+    state_lock = threading.Lock()
+
+    def _sampler():
+        # Started on first use in each process; threads do not survive fork
+        with state_lock:
+            if state['pid'] != os.getpid():
+                state['sampler'] = StackSampler(interval_ms)
+                state['sampler'].start()
+                state['pid'] = os.getpid()
+            return state['sampler']
+
+    @app.before_request
+    def _start_sampler():
+        g.profile_start = time.perf_counter()
+        g.profile_sampler = _sampler()
+        g.profile_sampler.register(threading.get_ident())
+
+    @app.after_request
+    def _stop_sampler(response):
+        sampler = getattr(g, 'profile_sampler', None)
+        if sampler is None:
+            return response
+
+        samples = sampler.unregister(threading.get_ident())
+        elapsed_ms = (time.perf_counter() - g.profile_start) * 1000
+        if elapsed_ms >= threshold_ms and samples:
+            name = f"{request.endpoint or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}-{int(elapsed_ms)}ms.folded"
+            try:
+                StackSampler.write_folded(samples, os.path.join(output_dir, name))
+            except OSError as e:
+                print(f"Profile write error: {e}")
+        return response
@@ -0,0 +1,98 @@
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Iterable
+
+
+class ComponentRegistry:
+    """
+    Lazily constructs heavy components (models, API clients) on first use
+
+    Each component is registered with a zero-argument factory. The first
+    get() builds it under a per-component lock; later calls return the
+    same instance. preload() builds selected components on a background
+    thread so the server can start accepting connections immediately.
+    """
+
+    NOT_LOADED = 'not_loaded'
+    LOADING = 'loading'
+    READY = 'ready'
+    FAILED = 'failed'
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._locks = {}
+        self._state = {}
+        self._preloading = set()
+
+    def register(self, name: str, factory: Callable):
+        """Register a factory; nothing is built until get() or preload()"""
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+        self._state[name] = {
+            'state': self.NOT_LOADED,
+            'load_seconds': None,
+            'error': None
+        }
+
+    def get(self, name: str):
+        """Return the component, building it on first use"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._locks[name]:
+            if name in self._instances:
+                return self._instances[name]
+
+            self._state[name].update(state=self.LOADING, error=None)
+            print(f"Loading component '{name}'...")
+            start = time.perf_counter()
+            try:
+                instance = self._factories[name]()
+            except Exception as e:
+                self._state[name].update(state=self.FAILED, error=str(e))
+                print(f"Error loading component '{name}': {e}")
+                raise
+
+            elapsed = time.perf_counter() - start
+            self._instances[name] = instance
+            self._state[name].update(state=self.READY, load_seconds=round(elapsed, 3))
+            print(f"Component '{name}' ready in {elapsed:.2f}s")
+            return instance
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def preload(self, names: Iterable[str], background: bool = True):
+        """Build the named components now, optionally on a daemon thread"""
+        names = [name for name in names if name in self._factories]
+        self._preloading.update(names)
+
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception:
+                    traceback.print_exc()
+                finally:
+                    self._preloading.discard(name)
+
+        if background:
+            thread = threading.Thread(target=load_all, name='component-preload', daemon=True)
+            thread.start()
+            return thread
+
+        load_all()
+        return None
+
+    def status(self) -> Dict[str, Dict]:
+        """Per-component load state"""
+        return {name: dict(state) for name, state in self._state.items()}
+
+    def is_ready(self) -> bool:
+        """Ready once nothing is still preloading and no component has failed"""
+        if self._preloading:
+            return False
+        return all(state['state'] != self.FAILED for state in self._state.values())
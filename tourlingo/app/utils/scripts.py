@@ -0,0 +1,147 @@
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Unicode blocks for the scripts Tourlingo handles
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, 'Latin'),
+    (0x0061, 0x007A, 'Latin'),
+    (0x00C0, 0x024F, 'Latin'),
+    (0x0600, 0x06FF, 'Arabic'),
+    (0x0900, 0x097F, 'Devanagari'),
+    (0x0980, 0x09FF, 'Bengali'),
+    (0x0A00, 0x0A7F, 'Gurmukhi'),
+    (0x0A80, 0x0AFF, 'Gujarati'),
+    (0x0B80, 0x0BFF, 'Tamil'),
+    (0x0C00, 0x0C7F, 'Telugu'),
+    (0x0C80, 0x0CFF, 'Kannada'),
+    (0x0D00, 0x0D7F, 'Malayalam'),
+]
+
+# Script each supported language is written in
+LANGUAGE_SCRIPTS = {
+    'english': 'Latin',
+    'hindi': 'Devanagari',
+    'marathi': 'Devanagari',
+    'bengali': 'Bengali',
+    'punjabi': 'Gurmukhi',
+    'gujarati': 'Gujarati',
+    'tamil': 'Tamil',
+    'telugu': 'Telugu',
+    'kannada': 'Kannada',
+    'malayalam': 'Malayalam',
+    'urdu': 'Arabic',
+}
+
+
+@lru_cache(maxsize=4096)
+def char_script(ch: str) -> Optional[str]:
+    """Script of a single character, or None for digits, punctuation and unknown blocks"""
+    code = ord(ch)
+    for start, end, script in SCRIPT_RANGES:
+        if start <= code <= end:
+            return script
+    return None
+
+
+def token_script(token: str) -> Optional[str]:
+    """Majority script of a token's letters, or None if it has no script letters"""
+    counts = {}
+    for ch in token:
+        script = char_script(ch)
+        if script:
+            counts[script] = counts.get(script, 0) + 1
+    if not counts:
+        return None
+    return max(counts, key=counts.get)
+
+
+def split_by_language(text: str, languages: List[str]) -> Dict[str, str]:
+    """
+    Split mixed-script text (e.g. from a combined hin+eng OCR pass) per language
+
+    Each line keeps, for every language, only the tokens written in that
+    language's script; script-neutral tokens (numbers, punctuation) are kept
+    for every language. Languages sharing a script get the same text.
+    """
+    results = {lang: [] for lang in languages}
+
+    for line in text.splitlines():
+        tokens = [(token, token_script(token)) for token in line.split()]
+        for lang in languages:
+            script = LANGUAGE_SCRIPTS.get(lang.lower())
+            kept = [token for token, token_scr in tokens if token_scr in (None, script)]
+            # Drop lines that only contain script-neutral tokens for this language
+            if any(token_scr == script for _, token_scr in tokens):
+                results[lang].append(' '.join(kept))
+
+    return {lang: '\n'.join(lines).strip() for lang, lines in results.items()}
+
+
+# Frequent function words telling apart languages that share a script
+MARKER_WORDS = {
+    'hindi': {'है', 'हैं', 'और', 'का', 'की', 'के', 'में', 'से', 'नहीं', 'यह', 'पर', 'को'},
+    'marathi': {'आहे', 'आहेत', 'आणि', 'नाही', 'हे', 'ही', 'या', 'व', 'मध्ये', 'येथे', 'कडे'},
+}
+
+
+def script_histogram(text: str) -> Dict[str, int]:
+    """Count the letters of each script in text"""
+    counts = {}
+    for ch in text:
+        script = char_script(ch)
+        if script:
+            counts[script] = counts.get(script, 0) + 1
+    return counts
+
+
+def detect_text_language(text: str, candidates: List[str] = None,
+                         default: str = 'english') -> str:
+    """
+    Guess the language of text from the scripts its letters are written in
+
+    The script with the most letters wins. Languages sharing a script
+    (Hindi and Marathi) are told apart by marker words, and candidates, if
+    given, restricts the answer to those languages.
+
+    Returns:
+        A language name, or default when no candidate's script is present
+    """
+    scores = language_scores(text, candidates)
+    if not scores:
+        return default
+    return max(scores, key=scores.get)
+
+
+def language_scores(text: str, candidates: List[str] = None) -> Dict[str, float]:
+    """Share of text's letters (0-1) written in each candidate language's script"""
+    histogram = script_histogram(text)
+    total = sum(histogram.values())
+    if not total:
+        return {}
+
+    languages = candidates or list(LANGUAGE_SCRIPTS)
+    by_script = {}
+    for lang in languages:
+        script = LANGUAGE_SCRIPTS.get(lang.lower())
+        if histogram.get(script):
+            by_script.setdefault(script, []).append(lang)
+
+    scores = {}
+    for script, langs in by_script.items():
+        if len(langs) > 1:
+            langs = [_pick_by_markers(text, langs)]
+        scores[langs[0]] = histogram[script] / total
+    return scores
+
+
+def _pick_by_markers(text: str, languages: List[str]) -> str:
+    words = [word.strip('.,;:!?।॥"\'()') for word in text.split()]
+    counts = {
+        lang: sum(word in MARKER_WORDS.get(lang.lower(), ()) for word in words)
+        for lang in languages
+    }
+    best = max(languages, key=lambda lang: counts[lang])
+    # Without any marker, prefer Hindi, by far the more common of the two
+    if not counts[best] and 'hindi' in languages:
+        return 'hindi'
+    return best
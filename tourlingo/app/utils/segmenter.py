@@ -0,0 +1,39 @@
+import re
+from typing import List
+
+# A sentence runs up to sentence-final punctuation followed by whitespace or the
+# end of the line: Latin . ! ?, Devanagari danda (।) and double danda (॥), and the
+# Urdu full stop (۔). Closing quotes and brackets stay with their sentence.
+SENTENCE = re.compile(r'.+?(?:[.!?।॥۔]+["\'”’)\]]*(?=\s|$)|$)')
+
+
+def split_sentences(line: str) -> List[str]:
+    """Split one line of text into sentences"""
+    return [match.group().strip() for match in SENTENCE.finditer(line) if match.group().strip()]
+
+
+def split_long(sentence: str, max_words: int) -> List[str]:
+    """Break a run-on sentence into chunks of at most max_words words"""
+    words = sentence.split()
+    if len(words) <= max_words:
+        return [sentence]
+    return [' '.join(words[i:i + max_words]) for i in range(0, len(words), max_words)]
+
+
+def segment_document(text: str, max_words: int = 150) -> List[List[str]]:
+    """
+    Split text into lines, and each line into sentences
+
+    Sentences longer than max_words words are chunked so none is truncated
+    by the model's maximum input length. Blank lines are kept as empty lists
+    so the layout can be rebuilt.
+    """
+    return [
+        [chunk for sentence in split_sentences(line) for chunk in split_long(sentence, max_words)]
+        for line in text.splitlines()
+    ]
+
+
+def rebuild_document(lines: List[List[str]]) -> str:
+    """Join segmented (and translated) sentences back into the original line layout"""
+    return '\n'.join(' '.join(sentences) for sentences in lines)
@@ -0,0 +1,214 @@
+import math
+import threading
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_000
+
+
+class SpatialIndex:
+    """
+    In-process nearby search over points of interest
+
+    Points live in a grid of cell_deg x cell_deg cells. The main arrays are
+    sorted by cell key (latitude row, then longitude column), so the cells a
+    query circle touches in one row are a single contiguous slice found with
+    searchsorted. New points go to a small unsorted buffer that is scanned
+    directly and merged into the sorted arrays once it grows, so filling the
+    index one API response at a time stays cheap.
+    """
+
+    def __init__(self, cell_deg: float = 0.01, merge_ratio: float = 0.05, min_merge: int = 1024):
+        """
+        Args:
+            cell_deg: Grid cell size in degrees (0.01 is about 1.1 km)
+            merge_ratio: Merge the buffer once it holds this fraction of the index
+            min_merge: ...or at least this many points
+        """
+        self.cell_deg = cell_deg
+        self.columns = math.ceil(360 / cell_deg)
+        self.merge_ratio = merge_ratio
+        self.min_merge = min_merge
+
+        self._lock = threading.Lock()
+        self._places = []           # place dicts, by point id
+        self._ids = {}              # place_id -> point id
+        self._alive = []            # False once a point was superseded
+
+        # Sorted main arrays and the unsorted buffer, as point ids
+        self._keys = np.empty(0, dtype=np.int64)
+        self._order = np.empty(0, dtype=np.int64)
+        self._pending = []
+
+        self._lat = np.empty(0, dtype=np.float64)
+        self._lng = np.empty(0, dtype=np.float64)
+        self._rating = np.empty(0, dtype=np.float32)
+        self._capacity = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add_places(self, places: Iterable[Dict]) -> int:
+        """
+        Add or update places shaped like GoogleMapsHelper results
+
+        Places without coordinates are skipped; a place_id seen before
+        replaces the earlier entry.
+
+        Returns:
+            Number of places added or updated
+        """
+        added = 0
+        with self._lock:
+            for place in places:
+                location = place.get('location') or {}
+                lat, lng = location.get('lat'), location.get('lng')
+                if lat is None or lng is None:
+                    continue
+
+                key = place.get('place_id') or f"{place.get('name')}@{lat},{lng}"
+                rating = place['rating'] if place.get('rating') is not None else np.nan
+                previous = self._ids.get(key)
+                if previous is not None:
+                    if self._lat[previous] == lat and self._lng[previous] == lng:
+                        # Same spot (e.g. a cached response seen again): update in place
+                        self._places[previous] = place
+                        self._rating[previous] = rating
+                        added += 1
+                        continue
+                    self._alive[previous] = False
+
+                point = len(self._places)
+                self._ensure_capacity(point + 1)
+                self._lat[point] = lat
+                self._lng[point] = lng
+                self._rating[point] = rating
+                self._places.append(place)
+                self._alive.append(True)
+                self._ids[key] = point
+                self._pending.append(point)
+                added += 1
+
+            if len(self._pending) >= max(self.min_merge, self.merge_ratio * len(self._order)):
+                self._merge()
+        return added
+
+    def nearby(self, lat: float, lng: float, radius_m: float = 2000, place_type: str = None,
+               min_rating: float = None, limit: int = 20, rank_by: str = 'rating') -> List[Dict]:
+        """
+        Places within radius_m of (lat, lng)
+
+        Args:
+            place_type: Only places with this type (e.g. 'restaurant')
+            min_rating: Only places rated at least this
+            rank_by: 'rating' (best first, unrated last, ties by distance)
+                or 'distance'
+
+        Returns:
+            Place dicts with an added 'distance_m', best first
+        """
+        with self._lock:
+            lat_arr, lng_arr, rating_arr = self._lat, self._lng, self._rating
+            keys, order, pending = self._keys, self._order, list(self._pending)
+            alive = self._alive
+            places = self._places
+
+        # Cells covering the circle's bounding box, split in two where it
+        # crosses the antimeridian; near the poles it spans every column
+        dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+        dlng = dlat / max(math.cos(math.radians(lat)), 1e-6)
+        west, east = lng - dlng, lng + dlng
+        if dlng >= 180:
+            spans = [(-180.0, 180.0)]
+        elif west < -180:
+            spans = [(west + 360, 180.0), (-180.0, east)]
+        elif east > 180:
+            spans = [(west, 180.0), (-180.0, east - 360)]
+        else:
+            spans = [(west, east)]
+
+        slices = []
+        for span_west, span_east in spans:
+            row_start, col_start = self._cell(lat - dlat, span_west)
+            row_end, col_end = self._cell(lat + dlat, span_east)
+            for row in range(row_start, row_end + 1):
+                low = np.searchsorted(keys, row * self.columns + col_start, side='left')
+                high = np.searchsorted(keys, row * self.columns + col_end, side='right')
+                if high > low:
+                    slices.append(order[low:high])
+        if pending:
+            slices.append(np.asarray(pending, dtype=np.int64))
+        if not slices:
+            return []
+
+        candidates = np.concatenate(slices)
+        distances = self._haversine(lat, lng, lat_arr[candidates], lng_arr[candidates])
+        mask = distances <= radius_m
+        if min_rating is not None:
+            mask &= rating_arr[candidates] >= min_rating
+        candidates, distances = candidates[mask], distances[mask]
+
+        if rank_by == 'distance':
+            ranked = np.argsort(distances, kind='stable')
+        else:
+            ratings = np.nan_to_num(rating_arr[candidates], nan=-1.0)
+            ranked = np.lexsort((distances, -ratings))
+
+        results = []
+        for i in ranked:
+            point = int(candidates[i])
+            place = places[point]
+            if not alive[point]:
+                continue
+            if place_type and place_type not in (place.get('types') or ()):
+                continue
+            results.append({**place, 'distance_m': round(float(distances[i]), 1)})
+            if len(results) == limit:
+                break
+        return results
+
+    def _cell(self, lat: float, lng: float):
+        row = int((min(max(lat, -90.0), 90.0) + 90) // self.cell_deg)
+        col = int((min(max(lng, -180.0), 180.0) + 180) // self.cell_deg)
+        return row, min(col, self.columns - 1)
+
+    def _merge(self):
+        """Fold the buffer into the sorted arrays (caller holds the lock)"""
+        points = np.asarray(self._pending, dtype=np.int64)
+        rows = ((np.clip(self._lat[points], -90, 90) + 90) // self.cell_deg).astype(np.int64)
+        cols = np.minimum(
+            ((np.clip(self._lng[points], -180, 180) + 180) // self.cell_deg).astype(np.int64),
+            self.columns - 1
+        )
+        keys = np.concatenate([self._keys, rows * self.columns + cols])
+        order = np.concatenate([self._order, points])
+
+        # Drop superseded points while rebuilding
+        alive = np.asarray(self._alive, dtype=bool)[order]
+        keys, order = keys[alive], order[alive]
+
+        sort = np.argsort(keys, kind='stable')
+        # New arrays rather than in-place updates, so readers keep a consistent snapshot
+        self._keys, self._order = keys[sort], order[sort]
+        self._pending = []
+
+    def _ensure_capacity(self, size: int):
+        if size <= self._capacity:
+            return
+        capacity = max(1024, self._capacity * 2, size)
+        for name in ('_lat', '_lng', '_rating'):
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    @staticmethod
+    def _haversine(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """Great-circle distance in meters from one point to many"""
+        lat1, lng1 = math.radians(lat), math.radians(lng)
+        lat2, lng2 = np.radians(lats), np.radians(lngs)
+        a = (np.sin((lat2 - lat1) / 2) ** 2
+             + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2)
+        return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
@@ -0,0 +1,159 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, Iterable
+
+
+class StageResult:
+    """Outcome of a StagePipeline run"""
+
+    def __init__(self):
+        self.results = {}
+        self.status = {}
+        self.errors = {}
+        self.timings = {}
+
+    def get(self, name: str, default=None):
+        """Result of a stage, or default if it failed, timed out or was skipped"""
+        return self.results.get(name, default)
+
+    @property
+    def partial(self) -> bool:
+        return any(status != StagePipeline.OK for status in self.status.values())
+
+    def incomplete(self) -> Dict[str, str]:
+        """Stages that did not finish successfully, with their status"""
+        return {name: status for name, status in self.status.items() if status != StagePipeline.OK}
+
+
+class StagePipeline:
+    """
+    Runs a small DAG of request stages on a shared thread pool
+
+    Each stage is a callable receiving the results of its dependencies as
+    positional arguments. Stages whose dependencies are done run
+    concurrently; a stage that raises or exceeds its deadline is reported
+    and its dependents are skipped, while independent stages still finish,
+    so callers can return partial results.
+
+    A stage's timeout counts from when it starts running, so time spent
+    queued behind other requests' stages on a busy executor does not use
+    it up; only the pipeline deadline bounds that wait. A timed-out stage
+    keeps its executor thread until it returns.
+    """
+
+    OK = 'ok'
+    FAILED = 'failed'
+    TIMED_OUT = 'timed_out'
+    SKIPPED = 'skipped'
+
+    def __init__(self, executor, deadline: float = None):
+        """
+        Args:
+            executor: concurrent.futures executor the stages run on
+            deadline: Seconds the whole pipeline may take; None for no limit
+        """
+        self.executor = executor
+        self.deadline = deadline
+        self._stages = {}
+
+    def add(self, name: str, fn: Callable, deps: Iterable[str] = (), timeout: float = None):
+        """Register a stage; timeout is measured from when the stage starts running"""
+        self._stages[name] = (fn, tuple(deps), timeout)
+        return self
+
+    def run(self) -> StageResult:
+        outcome = StageResult()
+        pipeline_start = time.perf_counter()
+        pipeline_deadline = pipeline_start + self.deadline if self.deadline else None
+
+        pending = dict(self._stages)
+        running = {}
+
+        while pending or running:
+            now = time.perf_counter()
+
+            # Submit every stage whose dependencies are settled
+            for name in list(pending):
+                fn, deps, timeout = pending[name]
+                dep_status = [outcome.status.get(dep) for dep in deps]
+                if any(status not in (None, self.OK) for status in dep_status):
+                    outcome.status[name] = self.SKIPPED
+                    del pending[name]
+                elif all(status == self.OK for status in dep_status):
+                    args = [outcome.results[dep] for dep in deps]
+                    started = Future()
+                    future = self.executor.submit(self._call, fn, args, started)
+                    running[future] = (name, now, started, timeout)
+                    del pending[name]
+
+            if not running:
+                # Whatever is left depends on unknown stages
+                for name in pending:
+                    outcome.status[name] = self.SKIPPED
+                break
+
+            deadlines = [
+                self._deadline(started, timeout, pipeline_deadline)
+                for _, _, started, timeout in running.values()
+            ]
+            deadlines = [deadline for deadline in deadlines if deadline is not None]
+            wait_for = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+            # Also wake when a queued stage starts, so its own timeout begins
+            waiting = list(running) + [
+                started for _, _, started, timeout in running.values()
+                if timeout and not started.done()
+            ]
+            done, _ = wait(waiting, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            now = time.perf_counter()
+            for future in list(running):
+                name, submitted, started, timeout = running[future]
+                stage_deadline = self._deadline(started, timeout, pipeline_deadline)
+                if future in done:
+                    del running[future]
+                    try:
+                        result, started_at, finished = future.result()
+                        outcome.results[name] = result
+                        outcome.status[name] = self.OK
+                    except Exception as e:
+                        started_at, finished = getattr(e, 'stage_timing', (submitted, now))
+                        outcome.status[name] = self.FAILED
+                        outcome.errors[name] = str(e)
+                    self._record(outcome, name, pipeline_start, started_at, finished)
+                elif stage_deadline is not None and now >= stage_deadline:
+                    # The thread cannot be interrupted; stop waiting for it
+                    del running[future]
+                    future.cancel()
+                    outcome.status[name] = self.TIMED_OUT
+                    started_at = started.result() if started.done() else submitted
+                    self._record(outcome, name, pipeline_start, started_at, now)
+
+        return outcome
+
+    @staticmethod
+    def _deadline(started: Future, timeout: float, pipeline_deadline: float):
+        """A running stage's deadline: its own timeout once started, capped by the pipeline's"""
+        stage_deadline = started.result() + timeout if timeout and started.done() else None
+        if pipeline_deadline is not None:
+            stage_deadline = min(filter(None, [stage_deadline, pipeline_deadline]))
+        return stage_deadline
+
+    @staticmethod
+    def _call(fn, args, started_future: Future):
+        started = time.perf_counter()
+        started_future.set_result(started)
+        try:
+            result = fn(*args)
+        except Exception as e:
+            e.stage_timing = (started, time.perf_counter())
+            raise
+        return result, started, time.perf_counter()
+
+    @staticmethod
+    def _record(outcome, name, pipeline_start, started, finished):
+        outcome.timings[name] = {
+            'start_ms': round((started - pipeline_start) * 1000, 2),
+            'end_ms': round((finished - pipeline_start) * 1000, 2),
+            'duration_ms': round((finished - started) * 1000, 2),
+            'status': outcome.status[name]
+        }
@@ -0,0 +1,169 @@
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+
+class TextRegion:
+    """A detected line of text: its rotated rectangle in image coordinates"""
+
+    __slots__ = ('center', 'size', 'angle')
+
+    def __init__(self, center: Tuple[float, float], size: Tuple[float, float], angle: float):
+        self.center = center
+        self.size = size      # (length along the line, line height)
+        self.angle = angle    # degrees, in [-45, 45]
+
+    @property
+    def box(self) -> List[int]:
+        """Axis-aligned bounding box as [x, y, width, height]"""
+        x, y, width, height = cv2.boundingRect(
+            cv2.boxPoints((self.center, self.size, self.angle)).astype(np.float32)
+        )
+        return [x, y, width, height]
+
+
+def detect_text_regions(image: np.ndarray, max_side: int = 1024, levels: int = 3,
+                        min_fill: float = 0.5, max_overlap: float = 0.5) -> List[TextRegion]:
+    """
+    Find lines of text in a grayscale image
+
+    Character strokes are dense, short edges: a morphological gradient picks
+    them out, a wide closing joins the letters of a line into one blob, and
+    blobs that are too square or too hollow to be a line of text are
+    dropped. The kernels only suit text 8-40 pixels tall, so this runs on a
+    pyramid (max_side, max_side / 2, ...) and each level keeps the lines in
+    that band; a line found at two levels is kept once.
+
+    Args:
+        image: 2-D uint8 grayscale array
+        max_side: Longest side of the finest pyramid level
+        levels: Number of pyramid levels, each half the size of the last
+        min_fill: Least share of a line's rotated rectangle its blob must cover
+        max_overlap: Regions overlapping a more solid one by more than this
+            share of their own area are dropped
+
+    Returns:
+        Regions in reading order (top to bottom, then left to right)
+    """
+    height, width = image.shape[:2]
+    candidates = []
+    for level in range(levels):
+        scale = min(1.0, max_side / max(height, width)) / 2 ** level
+        if min(height, width) * scale < 16:
+            break
+        small = image if scale == 1.0 else cv2.resize(
+            image, (max(1, round(width * scale)), max(1, round(height * scale))),
+            interpolation=cv2.INTER_AREA
+        )
+        candidates.extend(_detect_level(small, scale, min_fill))
+
+    # Most solid first; drop anything mostly covered by a region already kept
+    candidates.sort(key=lambda candidate: -candidate[1])
+    kept, masks = [], []
+    for region, _ in candidates:
+        x, y, w, h = region.box
+        covered = any(
+            _intersection(region.box, other) > max_overlap * w * h for other in masks
+        )
+        if not covered:
+            kept.append(region)
+            masks.append((x, y, w, h))
+
+    # Group into rows by vertical position, then left to right
+    kept.sort(key=lambda region: (region.center[1], region.center[0]))
+    rows, row_bottom = [], None
+    for region in kept:
+        top = region.center[1] - region.size[1] / 2
+        bottom = region.center[1] + region.size[1] / 2
+        if row_bottom is None or top > row_bottom:
+            rows.append([])
+            row_bottom = bottom
+        rows[-1].append(region)
+        row_bottom = max(row_bottom, bottom)
+    return [region for row in rows for region in sorted(row, key=lambda region: region.center[0])]
+
+
+def _detect_level(small: np.ndarray, scale: float, min_fill: float) -> List[Tuple[TextRegion, float]]:
+    """Lines 8-40 pixels tall in one pyramid level, with their fill ratio"""
+    gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT,
+                                cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, edges = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    # Join letters and words along a line, but not lines to each other
+    joined = cv2.morphologyEx(edges, cv2.MORPH_CLOSE,
+                              cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+    joined = cv2.morphologyEx(joined, cv2.MORPH_CLOSE,
+                              cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)))
+
+    # Outer boundaries of every blob, including those inside a sign's outline
+    contours, hierarchy = cv2.findContours(joined, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    if hierarchy is None:
+        return []
+
+    regions = []
+    for contour, (_, _, _, parent) in zip(contours, hierarchy[0]):
+        if parent != -1:
+            continue
+        (cx, cy), (w, h), angle = cv2.minAreaRect(contour)
+        # Normalize so the first side runs along the line and |angle| <= 45
+        if w < h:
+            w, h = h, w
+            angle += 90
+        if angle > 45:
+            angle -= 90
+        elif angle < -45:
+            angle += 90
+
+        if not 8 <= h <= 40 or w < 1.5 * h:
+            continue
+        # Share of the line's rectangle the blob covers; a sign's outline
+        # encloses a large area but covers little of it
+        x, y, bw, bh = cv2.boundingRect(contour)
+        fill = cv2.countNonZero(joined[y:y + bh, x:x + bw]) / (w * h)
+        if fill < min_fill:
+            continue
+
+        regions.append((TextRegion((cx / scale, cy / scale), (w / scale, h / scale), angle), fill))
+    return regions
+
+
+def _intersection(a, b) -> int:
+    """Overlapping area of two [x, y, width, height] boxes"""
+    width = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    height = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    return max(0, width) * max(0, height)
+
+
+def crop_region(image: np.ndarray, region: TextRegion, target_height: int = 40,
+                padding: float = 0.2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cut a region out of the image, rotated level and scaled to target_height
+
+    Tesseract is most accurate with capital letters around 30-40 pixels
+    tall, so small text is enlarged and large text shrunk. Light text on a
+    dark background is inverted to dark on light.
+
+    Returns:
+        (crop, matrix): the crop and the 2x3 affine transform mapping image
+        coordinates to crop coordinates
+    """
+    (cx, cy), (length, height) = region.center, region.size
+    scale = min(4.0, max(0.25, target_height / max(height, 1.0)))
+    pad = padding * height
+    out_width = max(1, round((length + 2 * pad) * scale))
+    out_height = max(1, round((height + 2 * pad) * scale))
+
+    matrix = cv2.getRotationMatrix2D((cx, cy), region.angle, scale)
+    matrix[0, 2] += out_width / 2 - cx
+    matrix[1, 2] += out_height / 2 - cy
+
+    crop = cv2.warpAffine(
+        image, matrix, (out_width, out_height),
+        flags=cv2.INTER_CUBIC if scale > 1 else cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_REPLICATE
+    )
+    # Background is the majority of a text line's pixels
+    if np.median(crop) < 128:
+        crop = 255 - crop
+    return crop, matrix
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from app.utils.instrumentation import record_cache
+
+
+class TranslationCache:
+    def __init__(self, max_entries: int = 10000, db_path: str = None):
+        """
+        Two-tier translation cache
+
+        Args:
+            max_entries: Size of the in-process LRU tier
+            db_path: SQLite file for the persistent tier; shared safely by
+                several worker processes. None keeps the cache in memory only.
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.db_path:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection().execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, translation TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so trivially different queries share an entry"""
+        return ' '.join(unicodedata.normalize('NFC', text).split())
+
+    def make_key(self, text: str, src_code: str, tgt_code: str,
+                 model_name: str, params: Dict) -> str:
+        """Build a key from normalized text, language pair, model and generation params"""
+        payload = json.dumps(
+            [self.normalize(text), src_code, tgt_code, model_name, params],
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look a key up in memory, then on disk; returns None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                record_cache('translator', 'memory', True)
+                return self._memory[key]
+        record_cache('translator', 'memory', False)
+
+        if self.db_path:
+            row = self._connection().execute(
+                "SELECT translation FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            record_cache('translator', 'disk', row is not None)
+            if row is not None:
+                self._remember(key, row[0])
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return row[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, translation: str):
+        """Store a translation in both tiers"""
+        self._remember(key, translation)
+
+        if self.db_path:
+            try:
+                connection = self._connection()
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO translations (key, translation) VALUES (?, ?)",
+                        (key, translation)
+                    )
+            except sqlite3.Error as e:
+                print(f"Translation cache write error: {e}")
+
+    def prewarm(self, translator, phrases: Iterable[str], source_lang: str = 'english',
+                target_langs: List[str] = None) -> int:
+        """
+        Translate a phrase list ahead of time so hot phrases are served from cache
+
+        Returns:
+            Number of (phrase, target language) pairs warmed
+        """
+        phrases = [phrase for phrase in phrases if phrase.strip()]
+        if target_langs is None:
+            target_langs = [lang for lang in translator.lang_codes if lang != source_lang]
+
+        for target_lang in target_langs:
+            translator.batch_translate(phrases, source_lang, target_lang)
+
+        return len(phrases) * len(target_langs)
+
+    @staticmethod
+    def load_phrases(path: str) -> List[str]:
+        """Read one phrase per line, skipping blanks and # comments"""
+        with open(path, encoding='utf-8') as f:
+            return [
+                line.strip() for line in f
+                if line.strip() and not line.startswith('#')
+            ]
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and tier sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'persistent': bool(self.db_path)
+            }
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+
+        if self.db_path:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM translations")
+
+    def close(self):
+        """Close this thread's SQLite connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _remember(self, key: str, translation: str):
+        with self._lock:
+            self._memory[key] = translation
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.evictions += 1
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        One SQLite connection per thread and process; WAL lets worker
+        processes share the file. Connections inherited across fork() are
+        never reused.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.db_path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
@@ -1,13 +1,63 @@
+import logging
 import os
 import sys
 from pathlib import Path
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 import torch
 
+from app.utils.inference_backends import create_backend
+from app.utils.instrumentation import measure
+from app.utils.segmenter import segment_document, rebuild_document
+
+logger = logging.getLogger(__name__)
+
 class IndicTranslator:
-    def __init__(self, model_dir="models/indictrans2"):
+    # Upper bounds for per-request generation settings
+    MAX_BEAMS = 8
+    MAX_LENGTH = 512
+    
+    # Distilled IndicTrans2 checkpoint for each translation direction
+    MODELS = {
+        'en-indic': "ai4bharat/indictrans2-en-indic-dist-200M",
+        'indic-en': "ai4bharat/indictrans2-indic-en-dist-200M",
+        'indic-indic': "ai4bharat/indictrans2-indic-indic-dist-320M",
+    }
+    
+    def __init__(self, model_dir="models/indictrans2", cache=None, backend='torch',
+                 num_threads=None, interop_threads=None, num_beams=5, max_length=512,
+                 direction='en-indic', lazy=False):
+        """
+        Args:
+            model_dir: Converted model directory (used by the ctranslate2 backend)
+            cache: Optional TranslationCache consulted before running generate
+            backend: Inference backend: torch, torch-int8 or ctranslate2, or a
+                backend object (see create_backend)
+            num_threads: Intra-op threads for inference
+            interop_threads: Inter-op threads (parallel translations for ctranslate2)
+            num_beams: Default beam size; 1 means greedy decoding
+            max_length: Default maximum input/output length in tokens
+            direction: Which checkpoint to use, one of MODELS
+            lazy: Do not load the weights yet; call load_model() before use
+                (TranslatorPool loads and unloads them on demand)
+        """
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model_dir = model_dir
+        self.cache = cache
+        
+        # Use distilled model for faster inference
+        if direction not in self.MODELS:
+            raise ValueError(f"Unknown direction '{direction}', expected one of {list(self.MODELS)}")
+        self.direction = direction
+        self.model_name = self.MODELS[direction]
+        self.generation_params = self._generation_params(num_beams, max_length)
+        
+        self.backend = create_backend(
+            backend,
+            self.model_name,
+            model_dir,
+            self.device,
+            num_threads=num_threads,
+            interop_threads=interop_threads
+        )
         
         # Language codes for IndicTrans2
         self.lang_codes = {
@@ -24,23 +74,22 @@ class IndicTranslator:
             'english': 'eng_Latn'
         }
         
-        self.load_model()
+        self.tokenizer = None
+        if not lazy:
+            self.load_model()
+    
+    @property
+    def is_loaded(self):
+        return getattr(self.backend, 'model', None) is not None
     
     def load_model(self):
         """Load IndicTrans2 model"""
         try:
-            # Use distilled model for faster inference
-            model_name = "ai4bharat/indictrans2-en-indic-dist-200M"
+            model_name = self.model_name
             
-            print(f"Loading model on {self.device}...")
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                model_name,
-                trust_remote_code=True
-            )
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(
-                model_name,
-                trust_remote_code=True
-            ).to(self.device)
+            print(f"Loading {model_name} ({self.backend.name}) on {self.device}...")
+            self.backend.load()
+            self.tokenizer = self.backend.tokenizer
             
             print("Model loaded successfully!")
             
@@ -48,7 +97,17 @@ class IndicTranslator:
             print(f"Error loading model: {e}")
             raise
     
-    def translate(self, text, source_lang='english', target_lang='hindi'):
+    def unload_model(self):
+        """Free the model weights; the tokenizer and cache stay usable"""
+        self.backend.unload()
+        print(f"Unloaded {self.model_name}")
+    
+    def memory_bytes(self):
+        """Bytes held by the loaded weights (0 when unloaded)"""
+        return self.backend.memory_bytes()
+    
+    def translate(self, text, source_lang='english', target_lang='hindi',
+                  num_beams=None, max_length=None):
         """
         Translate text from source to target language
         
@@ -56,6 +115,8 @@ class IndicTranslator:
             text: Input text to translate
             source_lang: Source language name
             target_lang: Target language name
+            num_beams: Beam size for this call; 1 means greedy decoding
+            max_length: Maximum length in tokens for this call
         
         Returns:
             Translated text
@@ -64,32 +125,20 @@ class IndicTranslator:
             src_code = self.lang_codes.get(source_lang.lower(), 'eng_Latn')
             tgt_code = self.lang_codes.get(target_lang.lower(), 'hin_Deva')
             
+            params = self._generation_params(num_beams, max_length)
+            
+            cached = self._cache_lookup(text, src_code, tgt_code, params)
+            if cached is not None:
+                return cached
+            
             # Prepare input
             input_text = f"{src_code} {text}"
             
-            inputs = self.tokenizer(
-                input_text,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=512
-            ).to(self.device)
-            
-            # Generate translation
-            with torch.no_grad():
-                generated_tokens = self.model.generate(
-                    **inputs,
-                    forced_bos_token_id=self.tokenizer.convert_tokens_to_ids(tgt_code),
-                    max_length=512,
-                    num_beams=5,
-                    num_return_sequences=1
-                )
+            with measure('translator', 'translate', input_size=len(text)):
+                translation = self._generate([input_text], tgt_code, params)[0]
             
-            # Decode output
-            translation = self.tokenizer.batch_decode(
-                generated_tokens,
-                skip_special_tokens=True
-            )[0]
+            if self.cache is not None:
+                self.cache.set(self._cache_key(text, src_code, tgt_code, params), translation)
             
             return translation
             
@@ -97,6 +146,175 @@ class IndicTranslator:
             print(f"Translation error: {e}")
             return text
     
-    def batch_translate(self, texts, source_lang='english', target_lang='hindi'):
-        """Translate multiple texts efficiently"""
-        return [self.translate(text, source_lang, target_lang) for text in texts]
+    def batch_translate(self, texts, source_lang='english', target_lang='hindi', batch_size=16,
+                        check_cache=True, num_beams=None, max_length=None):
+        """
+        Translate multiple texts with padded, batched generate calls
+        
+        Texts are sorted by length so each batch pads to a similar size,
+        then results are returned in the original order.
+        
+        Args:
+            texts: List of input texts
+            source_lang: Source language name
+            target_lang: Target language name
+            batch_size: Maximum number of texts per generate call
+            check_cache: Look texts up in the cache first; callers that have
+                already done so pass False to avoid counting misses twice
+            num_beams: Beam size for this call; 1 means greedy decoding
+            max_length: Maximum length in tokens for this call
+        
+        Returns:
+            List of translated texts, aligned with the input
+        
+        Raises:
+            Whatever generate raised; translations of earlier chunks are
+            already cached by then
+        """
+        if not texts:
+            return []
+        
+        src_code = self.lang_codes.get(source_lang.lower(), 'eng_Latn')
+        tgt_code = self.lang_codes.get(target_lang.lower(), 'hin_Deva')
+        params = self._generation_params(num_beams, max_length)
+        
+        translations = list(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            cached = self._cache_lookup(text, src_code, tgt_code, params) if check_cache else None
+            if cached is None:
+                pending.append(i)
+            else:
+                translations[i] = cached
+        
+        order = sorted(pending, key=lambda i: len(texts[i]))
+        
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            try:
+                outputs = self._generate(
+                    [f"{src_code} {texts[i]}" for i in chunk],
+                    tgt_code,
+                    params
+                )
+            except Exception:
+                # Never hand the source text back as a translation; callers
+                # (MicroBatcher futures, endpoints, the phrasebook build) see the error
+                logger.exception("Batch translation of %d texts to %s failed", len(chunk), tgt_code)
+                raise
+            for i, output in zip(chunk, outputs):
+                translations[i] = output
+                if self.cache is not None:
+                    self.cache.set(self._cache_key(texts[i], src_code, tgt_code, params), output)
+        
+        return translations
+    
+    def translate_document(self, text, source_lang='english', target_lang='hindi', batch_size=16,
+                           num_beams=None, max_length=None):
+        """
+        Translate long, multi-line text without truncation
+        
+        The text is split into sentences (including danda punctuation),
+        repeated sentences are translated once, and the unique sentences go
+        through batch_translate, which buckets them by length into padded
+        batches. The output keeps the original line breaks.
+        
+        Returns:
+            Translated text
+        """
+        lines = segment_document(text)
+        unique = list(dict.fromkeys(sentence for line in lines for sentence in line))
+        
+        translations = dict(zip(unique, self.batch_translate(
+            unique,
+            source_lang,
+            target_lang,
+            batch_size=batch_size,
+            num_beams=num_beams,
+            max_length=max_length
+        )))
+        
+        return rebuild_document([
+            [translations[sentence] for sentence in line] for line in lines
+        ])
+    
+    def iter_translate_document(self, text, source_lang='english', target_lang='hindi', batch_size=16,
+                                num_beams=None, max_length=None):
+        """
+        Translate long text incrementally
+        
+        Sentences come out in order of first appearance; a repeated sentence
+        is yielded for every position it occupies as soon as it is translated.
+        Unique sentences are translated in batches that start at one sentence
+        and double up to batch_size, so the first result is ready after a
+        single short generate call while later batches stay large.
+        
+        Yields:
+            (line_index, sentence_index, source_sentence, translation) tuples
+        """
+        lines = segment_document(text)
+        positions = {}
+        for line_index, line in enumerate(lines):
+            for sentence_index, sentence in enumerate(line):
+                positions.setdefault(sentence, []).append((line_index, sentence_index))
+        
+        unique = list(positions)
+        start, size = 0, 1
+        while start < len(unique):
+            chunk = unique[start:start + size]
+            outputs = self.batch_translate(
+                chunk,
+                source_lang,
+                target_lang,
+                batch_size=size,
+                num_beams=num_beams,
+                max_length=max_length
+            )
+            for sentence, translation in zip(chunk, outputs):
+                for line_index, sentence_index in positions[sentence]:
+                    yield line_index, sentence_index, sentence, translation
+            start += size
+            size = min(size * 2, batch_size)
+    
+    def cached_translation(self, text, source_lang='english', target_lang='hindi',
+                           num_beams=None, max_length=None):
+        """Return the cached translation for text, or None if absent or uncached"""
+        src_code = self.lang_codes.get(source_lang.lower(), 'eng_Latn')
+        tgt_code = self.lang_codes.get(target_lang.lower(), 'hin_Deva')
+        params = self._generation_params(num_beams, max_length)
+        return self._cache_lookup(text, src_code, tgt_code, params)
+    
+    def _generation_params(self, num_beams=None, max_length=None):
+        """Per-call generation settings, falling back to the defaults and clamped to safe bounds"""
+        defaults = getattr(self, 'generation_params', {})
+        num_beams = num_beams or defaults.get('num_beams', 5)
+        max_length = max_length or defaults.get('max_length', self.MAX_LENGTH)
+        return {
+            'num_beams': max(1, min(int(num_beams), self.MAX_BEAMS)),
+            'max_length': max(1, min(int(max_length), self.MAX_LENGTH))
+        }
+    
+    def _cache_lookup(self, text, src_code, tgt_code, params):
+        if self.cache is None:
+            return None
+        return self.cache.get(self._cache_key(text, src_code, tgt_code, params))
+    
+    def _cache_key(self, text, src_code, tgt_code, params):
+        # Backends (e.g. int8 quantized) can produce different output, so they key separately
+        return self.cache.make_key(
+            text, src_code, tgt_code, f"{self.model_name}:{self.backend.name}", params
+        )
+    
+    def _generate(self, input_texts, tgt_code, params=None):
+        """Run one padded generate call over already-tagged input texts"""
+        if not self.is_loaded:
+            raise RuntimeError(f"{self.model_name} is not loaded")
+        params = params or self.generation_params
+        with measure('translator', 'generate', input_size=sum(len(text) for text in input_texts),
+                     batch_size=len(input_texts)):
+            return self.backend.generate(
+                input_texts,
+                tgt_code,
+                num_beams=params['num_beams'],
+                max_length=params['max_length']
+            )
@@ -0,0 +1,77 @@
+"""
+Translation backend quality-vs-latency benchmark
+
+Translates a fixed sentence set with each inference backend and decoding
+setting, reporting latency and chrF against the fp32 beam-5 PyTorch output
+as the reference.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_backends --backends torch,torch-int8,ctranslate2 --beams 1,5
+"""
+import argparse
+import time
+from collections import Counter
+
+from app.utils.translator import IndicTranslator
+from benchmarks.bench_translation import SENTENCES
+
+
+def chrf(hypothesis, reference, n=6, beta=2):
+    """Character n-gram F-score (chrF), averaged over n-gram orders 1..n"""
+    hypothesis, reference = hypothesis.replace(' ', ''), reference.replace(' ', '')
+    scores = []
+    for order in range(1, n + 1):
+        hyp = Counter(hypothesis[i:i + order] for i in range(len(hypothesis) - order + 1))
+        ref = Counter(reference[i:i + order] for i in range(len(reference) - order + 1))
+        if not hyp or not ref:
+            continue
+        overlap = sum((hyp & ref).values())
+        precision, recall = overlap / sum(hyp.values()), overlap / sum(ref.values())
+        if precision + recall == 0:
+            scores.append(0.0)
+        else:
+            scores.append((1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall))
+    return 100 * sum(scores) / len(scores) if scores else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--backends', default='torch,torch-int8')
+    parser.add_argument('--beams', default='1,5')
+    parser.add_argument('--target-lang', default='hindi')
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--model-dir', default='models/indictrans2')
+    args = parser.parse_args()
+
+    # The reference is always fp32 torch with beam 5, whatever --backends lists
+    reference_translator = IndicTranslator(
+        model_dir=args.model_dir,
+        backend='torch',
+        num_threads=args.threads
+    )
+    references = reference_translator.batch_translate(SENTENCES, 'english', args.target_lang, num_beams=5)
+
+    print(f"{'backend':<14} {'beams':>5} {'total s':>8} {'ms/sent':>8} {'chrF':>6}")
+    for backend in args.backends.split(','):
+        if backend == 'torch':
+            translator = reference_translator
+        else:
+            translator = IndicTranslator(
+                model_dir=args.model_dir,
+                backend=backend,
+                num_threads=args.threads
+            )
+
+        for beams in [int(n) for n in args.beams.split(',')]:
+            start = time.perf_counter()
+            outputs = [
+                translator.translate(text, 'english', args.target_lang, num_beams=beams)
+                for text in SENTENCES
+            ]
+            elapsed = time.perf_counter() - start
+            quality = sum(chrf(out, ref) for out, ref in zip(outputs, references)) / len(SENTENCES)
+            print(f"{backend:<14} {beams:>5} {elapsed:>8.2f} {elapsed / len(SENTENCES) * 1000:>8.0f} {quality:>6.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Batch endpoint throughput benchmark
+
+Sends the same items to the single-item endpoints one request at a time
+and to the /batch endpoints in one request, through Flask's test client:
+translate and extract-entities with single-sentence texts, and OCR with
+synthetic signboards (needs tesseract). The translation and OCR caches
+are in memory only and are cleared before every timed run, so neither
+side is served from the other's results.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_batch_endpoints --items 32 --images 8
+"""
+import argparse
+import io
+import os
+import time
+
+from benchmarks.bench_translation import SENTENCES
+from benchmarks.signboards import SIGN_TEXTS, signboard
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def single_sentence(sentence, i):
+    """Make a sentence unique without adding a second sentence ("... station (3).")"""
+    body = sentence.rstrip('.?!')
+    return f"{body} ({i}){sentence[len(body):]}"
+
+
+def png(image):
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=32)
+    parser.add_argument('--images', type=int, default=8,
+                        help='Images per OCR run (at most MAX_OCR_BATCH_IMAGES; 0 skips OCR)')
+    parser.add_argument('--target-lang', default='hindi')
+    args = parser.parse_args()
+
+    # In-memory caches only, and no background preload while timing
+    os.environ['TRANSLATION_CACHE_DB'] = ''
+    os.environ.pop('OCR_CACHE_DB', None)
+    os.environ['TOURLINGO_DEFER_PRELOAD'] = '1'
+
+    from app import main as app_main
+    client = app_main.app.test_client()
+    texts = [single_sentence(SENTENCES[i % len(SENTENCES)], i) for i in range(args.items)]
+    assert not any(app_main.is_long_text(text) for text in texts), "inputs must stay on the batcher path"
+    images = [
+        png(signboard(SIGN_TEXTS[i % len(SIGN_TEXTS)], size=(1200, 400), noise=5, seed=i))
+        for i in range(args.images)
+    ]
+
+    # Load models before timing
+    client.post('/api/translate', json={'text': 'Hello', 'target_lang': args.target_lang})
+    client.post('/api/extract-entities', json={'text': 'Hello from Delhi'})
+
+    cases = [
+        ('translate', len(texts), lambda: [
+            client.post('/api/translate', json={'text': text, 'target_lang': args.target_lang})
+            for text in texts
+        ], lambda: client.post('/api/translate/batch', json={'texts': texts, 'target_lang': args.target_lang})),
+        ('extract-entities', len(texts), lambda: [
+            client.post('/api/extract-entities', json={'text': text}) for text in texts
+        ], lambda: client.post('/api/extract-entities/batch', json={'texts': texts})),
+    ]
+    if images:
+        client.post('/api/ocr', data={'image': (io.BytesIO(images[0]), 'warmup.png')})
+        cases.append(('ocr', len(images), lambda: [
+            client.post('/api/ocr', data={'image': (io.BytesIO(image), f'{i}.png')})
+            for i, image in enumerate(images)
+        ], lambda: client.post('/api/ocr/batch', data={
+            'images': [(io.BytesIO(image), f'{i}.png') for i, image in enumerate(images)]
+        })))
+
+    print(f"{'endpoint':<18} {'single items/s':>15} {'batch items/s':>14}")
+    for name, count, single, batch in cases:
+        app_main.translation_cache.clear()
+        app_main.ocr_cache.clear()
+        single_seconds = timed(single)
+        app_main.translation_cache.clear()
+        app_main.ocr_cache.clear()
+        batch_seconds = timed(batch)
+        print(f"{name:<18} {count / single_seconds:>15.1f} {count / batch_seconds:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
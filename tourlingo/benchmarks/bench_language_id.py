@@ -0,0 +1,84 @@
+"""
+Language identification benchmark
+
+Text: accuracy and per-call latency of detect_text_language on labelled
+sentences. Images: the old OSD + per-language OCR path against a single
+combined OCR pass classified by script (extract_text_with_language), on
+synthetic signboards. Hindi signs need a Devanagari font (--font).
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_language_id --font /usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf
+"""
+import argparse
+import time
+
+from app.utils.scripts import detect_text_language
+from benchmarks.corpora import LABELLED_TEXTS
+
+HINDI_SIGNS = [
+    ('प्लेटफार्म ३', 'मुख्य सड़क की ओर निकास'),
+    ('टिकट घर', 'प्रवेश निषेध'),
+]
+
+
+def bench_text(repeat):
+    correct = 0
+    for expected, text in LABELLED_TEXTS:
+        detected = detect_text_language(text)
+        correct += detected == expected
+        if detected != expected:
+            print(f"  miss: expected {expected}, got {detected}: {text}")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, text in LABELLED_TEXTS:
+            detect_text_language(text)
+    per_call = (time.perf_counter() - start) / (repeat * len(LABELLED_TEXTS))
+
+    print(f"text: {correct}/{len(LABELLED_TEXTS)} correct, {per_call * 1e6:.1f}us per call")
+
+
+def bench_images(font_path, repeat):
+    from app.utils.ocr_processor import OCRProcessor
+    from benchmarks.signboards import SIGN_TEXTS, signboard
+
+    cases = [('english', signboard(lines, font_path=font_path)) for lines in SIGN_TEXTS]
+    if font_path:
+        cases += [('hindi', signboard(lines, font_path=font_path)) for lines in HINDI_SIGNS]
+
+    ocr = OCRProcessor()
+    processed = [(expected, ocr.preprocess_image(image)) for expected, image in cases]
+
+    def osd_path(image):
+        detected = ocr.detect_language(image)
+        languages = ['english'] if detected == 'english' else ['english', detected]
+        ocr.extract_text_from_processed(image, languages, mode='parallel')
+        return detected
+
+    def script_path(image):
+        return ocr.extract_text_with_language(image, ['english', 'hindi'])[0]
+
+    for name, detect in [('osd + per-language OCR', osd_path), ('single pass + script', script_path)]:
+        correct = sum(detect(image) == expected for expected, image in processed)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _, image in processed:
+                detect(image)
+        per_image = (time.perf_counter() - start) / (repeat * len(processed))
+        print(f"image {name:<24} {correct}/{len(processed)} correct, {per_image * 1000:8.1f}ms per image")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--font', help="TrueType font with Devanagari glyphs")
+    parser.add_argument('--text-only', action='store_true')
+    args = parser.parse_args()
+
+    bench_text(args.repeat * 1000)
+    if not args.text_only:
+        bench_images(args.font, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Long-document translation benchmark
+
+Reports translate_document latency for inputs of 1, 10, 100 and 1000 lines
+(menu/notice-board style text with repeated lines), next to the
+single-sequence translate call that truncates at max_length.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_long_text --lines 1,10,100,1000
+"""
+import argparse
+import time
+
+from app.utils.translator import IndicTranslator
+from benchmarks.bench_translation import SENTENCES
+
+MENU_LINES = [
+    "Masala dosa with sambar and chutney.",
+    "Paneer butter masala. Served with two butter naan.",
+    "Please pay at the counter before ordering.",
+    "Drinking water is free.",
+] + SENTENCES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', default='1,10,100,1000')
+    parser.add_argument('--target-lang', default='hindi')
+    parser.add_argument('--batch-size', type=int, default=16)
+    args = parser.parse_args()
+
+    translator = IndicTranslator()
+    translator.translate(MENU_LINES[0], 'english', args.target_lang)
+
+    print(f"{'lines':>6} {'document s':>11} {'single-seq s':>13}")
+    for count in [int(n) for n in args.lines.split(',')]:
+        text = '\n'.join(MENU_LINES[i % len(MENU_LINES)] for i in range(count))
+
+        start = time.perf_counter()
+        translator.translate_document(text, 'english', args.target_lang, batch_size=args.batch_size)
+        document = time.perf_counter() - start
+
+        start = time.perf_counter()
+        translator.translate(text, 'english', args.target_lang)
+        single = time.perf_counter() - start
+
+        print(f"{count:>6} {document:>11.2f} {single:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Maps client benchmark against the local stub server
+
+Compares sequential search_places calls with search_places_many fan-out,
+and shows the effect of the TTL cache on repeated queries and of the
+offline gazetteer (built from data/gazetteer_seed.csv) on cold ones.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_maps --latency-ms 80 --queries 3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.gazetteer_build import read_csv
+from app.utils.gazetteer import Gazetteer, GazetteerBuilder
+from app.utils.maps_helper import GoogleMapsHelper
+from benchmarks.stub_maps_server import start_stub_server
+
+QUERIES = ['India Gate', 'Red Fort', 'Qutub Minar', 'Lotus Temple', 'Humayun Tomb']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency-ms', type=float, default=80)
+    parser.add_argument('--queries', type=int, default=3)
+    parser.add_argument('--seed', default='data/gazetteer_seed.csv')
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency_ms=args.latency_ms)
+    queries = QUERIES[:args.queries]
+
+    helper = GoogleMapsHelper(api_key='stub', base_url=base_url, cache_ttl=0)
+    start = time.perf_counter()
+    for query in queries:
+        helper.search_places(query)
+    print(f"sequential          {(time.perf_counter() - start) * 1000:8.1f}ms")
+
+    start = time.perf_counter()
+    helper.search_places_many(queries)
+    print(f"parallel fan-out    {(time.perf_counter() - start) * 1000:8.1f}ms")
+
+    cached = GoogleMapsHelper(api_key='stub', base_url=base_url)
+    cached.search_places_many(queries)
+    start = time.perf_counter()
+    cached.search_places_many(queries)
+    print(f"cached fan-out      {(time.perf_counter() - start) * 1000:8.1f}ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        builder = GazetteerBuilder(os.path.join(directory, 'gazetteer.db'))
+        for place in read_csv(args.seed):
+            builder.add(**place)
+        gazetteer = Gazetteer(builder.finish()['path'])
+
+        offline = GoogleMapsHelper(api_key='stub', base_url=base_url, cache_ttl=0, gazetteer=gazetteer)
+        start = time.perf_counter()
+        for query in queries:
+            offline.search_places(query)
+        print(f"gazetteer sequential{(time.perf_counter() - start) * 1000:8.1f}ms")
+        gazetteer.close()
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Peak memory benchmark for image ingestion
+
+Decodes and preprocesses a large synthetic JPEG in a fresh interpreter and
+reports the growth in peak RSS, comparing a plain Image.open + np.array path
+against app.utils.image_ingest.open_image.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_memory --size 4000x3000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.signboards import signboard
+
+CHILD = '''
+import json, resource, sys
+import numpy as np
+from PIL import Image
+from app.utils.image_ingest import open_image
+from app.utils.ocr_processor import OCRProcessor
+
+path, method = sys.argv[1], sys.argv[2]
+ocr = OCRProcessor()
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+with open(path, 'rb') as stream:
+    if method == 'naive':
+        image = Image.open(stream).convert('RGB')
+        np.array(image)
+    else:
+        image = open_image(stream, max_side=ocr.max_side())
+    ocr.preprocess_image(image)
+
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'delta_kb': peak - baseline, 'decoded_size': image.size}))
+'''
+
+
+def measure(path, method):
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD, path, method],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', default='4000x3000')
+    args = parser.parse_args()
+
+    width, height = (int(n) for n in args.size.split('x'))
+    fd, path = tempfile.mkstemp(suffix='.jpg')
+    os.close(fd)
+    try:
+        signboard(size=(width, height), noise=8).save(path, quality=90)
+        print(f"input {width}x{height} JPEG, {os.path.getsize(path) / 1024:.0f} KB")
+        for method in ('naive', 'ingest'):
+            report = measure(path, method)
+            print(f"{method:<8} decoded {report['decoded_size']}  peak RSS +{report['delta_kb'] / 1024:.1f} MB")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Translation model pool benchmark
+
+For each direction (en-indic, indic-en, indic-indic): weight memory, RSS
+growth, cold load (swap-in) time and warm translation latency. Then replays
+a mixed request sequence under a memory budget and reports how often a
+request had to wait for a swap-in and what that cost.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_model_pool --budget-mb 1200 --requests 30
+"""
+import argparse
+import random
+import time
+
+from app.utils.model_pool import TranslatorPool
+from app.utils.translator import IndicTranslator
+
+# (source, target, text) per direction
+SAMPLES = {
+    'en-indic': ('english', 'hindi', "Where is the nearest railway station?"),
+    'indic-en': ('hindi', 'english', "सबसे नज़दीकी रेलवे स्टेशन कहाँ है?"),
+    'indic-indic': ('hindi', 'tamil', "सबसे नज़दीकी रेलवे स्टेशन कहाँ है?"),
+}
+
+
+def rss_mb():
+    """Current resident set size (Linux)"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def build_pool(backend, budget_mb):
+    return TranslatorPool(
+        {
+            direction: IndicTranslator(backend=backend, direction=direction, lazy=True)
+            for direction in SAMPLES
+        },
+        memory_budget_mb=budget_mb
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--backend', default='torch')
+    parser.add_argument('--budget-mb', type=float, default=1200,
+                        help="Budget for the mixed run; below the three models' total forces swaps")
+    parser.add_argument('--requests', type=int, default=30)
+    args = parser.parse_args()
+
+    pool = build_pool(args.backend, None)
+    print(f"{'direction':<12} {'weights':>9} {'rss +':>9} {'load':>8} {'warm':>8}")
+    for direction, (source, target, text) in SAMPLES.items():
+        before = rss_mb()
+        pool.preload([direction])
+        grown = rss_mb() - before
+
+        start = time.perf_counter()
+        pool.batch_translate([text], source, target, check_cache=False)
+        warm = time.perf_counter() - start
+
+        status = pool.status()[direction]
+        print(f"{direction:<12} {status['memory_mb']:>7.0f}MB {grown:>7.0f}MB "
+              f"{status['load_seconds']:>7.2f}s {warm * 1000:>6.0f}ms")
+    for direction in SAMPLES:
+        pool.unload(direction)
+
+    # Mixed traffic, mostly en-indic, under the budget
+    pool = build_pool(args.backend, args.budget_mb)
+    rng = random.Random(0)
+    sequence = rng.choices(list(SAMPLES), weights=[6, 3, 1], k=args.requests)
+
+    swaps, warm = [], []
+    for direction in sequence:
+        source, target, text = SAMPLES[direction]
+        loads_before = pool.status()[direction]['loads']
+        start = time.perf_counter()
+        pool.batch_translate([text], source, target, check_cache=False)
+        elapsed = time.perf_counter() - start
+        (swaps if pool.status()[direction]['loads'] > loads_before else warm).append(elapsed)
+
+    print(f"\nbudget {args.budget_mb:.0f}MB, {len(sequence)} requests:")
+    print(f"  swap-in requests {len(swaps):>3}, mean {sum(swaps) / max(1, len(swaps)):.2f}s")
+    print(f"  warm requests    {len(warm):>3}, mean {sum(warm) / max(1, len(warm)) * 1000:.0f}ms")
+    for direction, status in pool.status().items():
+        print(f"  {direction:<12} loads {status['loads']}, unloads {status['unloads']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+NER pipeline benchmark
+
+Reports spaCy parses per request and latency of TravelNER.analyze as the
+input text grows.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_ner --repeat 20
+"""
+import argparse
+import time
+
+from app.utils.ner_extractor import TravelNER
+
+QUERY = (
+    "Where can I find a good hotel near the museum and the railway station "
+    "in Agra, and is there a vegetarian restaurant close to the Taj Mahal? "
+)
+PLURAL_QUERY = "Where can I find good restaurants near India Gate?"
+
+
+class CountingNLP:
+    """Wraps a spaCy Language object and counts full parses"""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.calls = 0
+
+    def __call__(self, text, *args, **kwargs):
+        self.calls += 1
+        return self.nlp(text, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.nlp, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--lengths', default='1,4,16,64')
+    args = parser.parse_args()
+
+    ner = TravelNER()
+    ner.nlp = CountingNLP(ner.nlp)
+
+    ner.nlp.calls = 0
+    ner.analyze(QUERY)
+    print(f"parses per analyze() request: {ner.nlp.calls}")
+
+    # Plural keywords must still mark their noun phrase as an attraction
+    plural = ner.extract_entities(PLURAL_QUERY)['attractions']
+    assert any('restaurants' in chunk for chunk in plural), plural
+    print(f"plural keyword attractions: {plural}")
+
+    print(f"{'sentences':>10} {'chars':>7} {'mean ms':>9}")
+    for multiplier in [int(n) for n in args.lengths.split(',')]:
+        text = QUERY * multiplier
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            ner.analyze(text)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"{multiplier:>10} {len(text):>7} {elapsed * 1000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Bulk NER throughput benchmark
+
+Measures docs/sec for TravelNER.extract_entities_stream at several
+n_process settings, against the one-document-at-a-time baseline.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_ner_stream --docs 5000 --processes 1,2,4
+"""
+import argparse
+import os
+import time
+
+from app.utils.ner_extractor import TravelNER
+
+REVIEWS = [
+    "Stayed at a lovely guesthouse near the Amber Fort in Jaipur, the staff arranged a taxi to the airport.",
+    "The street food at Chandni Chowk was amazing but the metro station was very crowded.",
+    "We took the overnight train from Mumbai to Goa and spent three days at Baga beach.",
+    "The museum in Kolkata was closed on Monday so we visited the Victoria Memorial garden instead.",
+    "Our hotel in Varanasi had a rooftop cafe with a view of the ghats.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--processes', default=f"1,2,{os.cpu_count() or 1}")
+    args = parser.parse_args()
+
+    docs = [REVIEWS[i % len(REVIEWS)] for i in range(args.docs)]
+    ner = TravelNER()
+
+    start = time.perf_counter()
+    for text in docs[:min(len(docs), 500)]:
+        ner.extract_entities(text)
+    elapsed = time.perf_counter() - start
+    print(f"{'per-document':<16} {min(len(docs), 500) / elapsed:10.1f} docs/s")
+
+    for n_process in sorted({int(n) for n in args.processes.split(',')}):
+        start = time.perf_counter()
+        for _ in ner.extract_entities_stream(docs, batch_size=args.batch_size, n_process=n_process):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"{f'pipe n={n_process}':<16} {len(docs) / elapsed:10.1f} docs/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Multi-language OCR benchmark
+
+Times OCRProcessor.extract_text_from_processed on a synthetic signboard for
+1 to 9 languages in each multi-language mode.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_ocr --repeat 3
+"""
+import argparse
+import time
+
+from app.utils.ocr_processor import OCRProcessor
+from benchmarks.signboards import signboard
+
+LANGUAGES = ['english', 'hindi', 'marathi', 'tamil', 'telugu',
+             'bengali', 'gujarati', 'kannada', 'malayalam']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-workers', type=int, default=4)
+    args = parser.parse_args()
+
+    ocr = OCRProcessor(max_workers=args.max_workers)
+    processed = ocr.preprocess_image(signboard())
+
+    print(f"{'langs':>5} " + ' '.join(f"{mode:>12}" for mode in OCRProcessor.MODES))
+    for count in range(1, len(LANGUAGES) + 1):
+        languages = LANGUAGES[:count]
+        timings = []
+        for mode in OCRProcessor.MODES:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                ocr.extract_text_from_processed(processed, languages, mode=mode)
+            timings.append((time.perf_counter() - start) / args.repeat)
+        print(f"{count:>5} " + ' '.join(f"{t * 1000:>10.0f}ms" for t in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+OCR result cache benchmark
+
+Hash robustness: Hamming distance between each synthetic signboard and
+re-uploaded copies of it (JPEG re-encode, resize, grayscale, brightness),
+against the distance between different signs, including signs one
+character apart. A usable max_distance sits between the two.
+
+Cost: hashing time, lookup time with a full cache, and (with --ocr, which
+needs tesseract) request latency on a miss versus a hit.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_ocr_cache --entries 2048 --ocr
+"""
+import argparse
+import io
+import random
+import time
+
+from PIL import Image
+
+from app.utils.ocr_cache import OCRCache
+from benchmarks.signboards import SIGN_TEXTS, signboard
+
+# Signs that differ from SIGN_TEXTS[0] by one character
+NEAR_SIGNS = [
+    ('PLATFORM 4', 'EXIT TO MAIN ROAD'),
+    ('PLATFORM 3', 'EXIT TO MALL ROAD'),
+]
+
+
+def jpeg(image, quality):
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, 'JPEG', quality=quality)
+    buffer.seek(0)
+    return Image.open(buffer)
+
+
+def reuploads(image):
+    """Copies of an image as they come back from messaging apps and re-uploads"""
+    width, height = image.size
+    return {
+        'jpeg q85': jpeg(image, 85),
+        'jpeg q40': jpeg(image, 40),
+        'resize 60%': image.resize((int(width * 0.6), int(height * 0.6))),
+        'grayscale': image.convert('L'),
+        'brighter': Image.eval(image, lambda p: min(255, p + 25)),
+    }
+
+
+def bench_distances(cache):
+    signs = [signboard(lines, noise=5) for lines in list(SIGN_TEXTS) + NEAR_SIGNS]
+    hashes = [cache.image_hash(image) for image in signs]
+
+    worst = {}
+    for image, image_hash in zip(signs, hashes):
+        for name, copy in reuploads(image).items():
+            distance = (cache.image_hash(copy) ^ image_hash).bit_count()
+            worst[name] = max(worst.get(name, 0), distance)
+
+    closest = min(
+        (hashes[i] ^ hashes[j]).bit_count()
+        for i in range(len(hashes)) for j in range(i + 1, len(hashes))
+    )
+
+    print(f"same sign, re-uploaded (max bits out of {cache.hash_size ** 2}):")
+    for name, distance in worst.items():
+        print(f"  {name:<12} {distance:>4}")
+    print(f"different signs, closest pair: {closest} bits (max_distance {cache.max_distance})")
+
+
+def bench_lookup(cache, entries, repeat):
+    image = signboard(SIGN_TEXTS[0], size=(4000, 3000), noise=8)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cache.image_hash(image)
+    hash_ms = (time.perf_counter() - start) / repeat * 1000
+
+    key = OCRCache.make_key('extract', ['english', 'hindi'])
+    rng = random.Random(0)
+    for i in range(entries):
+        cache.set(rng.getrandbits(cache.hash_size ** 2), key, {'english': str(i)})
+
+    # A miss compares against every entry, the slowest lookup
+    probe = cache.image_hash(image)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cache.get(probe, key)
+    lookup_ms = (time.perf_counter() - start) / repeat * 1000
+
+    print(f"hash 12MP image {hash_ms:.1f}ms, missed lookup among {entries} entries {lookup_ms:.2f}ms")
+
+
+def bench_ocr(cache, repeat):
+    from app.utils.ocr_processor import OCRProcessor
+
+    ocr = OCRProcessor()
+    key = OCRCache.make_key('extract', ['english', 'hindi'], mode=ocr.mode, profile=ocr.profile)
+    image = signboard(SIGN_TEXTS[1], size=(1600, 900), noise=10)
+
+    def request(upload):
+        image_hash = cache.image_hash(upload)
+        texts = cache.get(image_hash, key)
+        if texts is None:
+            texts = ocr.extract_text(upload, ['english', 'hindi'])
+            cache.set(image_hash, key, texts)
+        return texts
+
+    cache.clear()
+    start = time.perf_counter()
+    request(image)
+    miss = time.perf_counter() - start
+
+    copies = list(reuploads(image).values())
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for copy in copies:
+            request(copy)
+    hit = (time.perf_counter() - start) / (repeat * len(copies))
+
+    print(f"ocr request: miss {miss * 1000:.0f}ms, hit on a re-upload {hit * 1000:.1f}ms")
+    print(f"  {cache.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=2048)
+    parser.add_argument('--max-distance', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--ocr', action='store_true', help="Also time OCR misses against hits")
+    args = parser.parse_args()
+
+    cache = OCRCache(max_entries=args.entries + 1, max_distance=args.max_distance)
+    bench_distances(cache)
+    bench_lookup(cache, args.entries, args.repeat)
+    if args.ocr:
+        bench_ocr(cache, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
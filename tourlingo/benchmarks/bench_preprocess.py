@@ -0,0 +1,48 @@
+"""
+Preprocessing profile benchmark
+
+Runs every preprocessing profile over the synthetic signboard corpus and
+reports per-stage latency alongside English OCR character accuracy.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_preprocess
+"""
+import argparse
+import difflib
+import time
+
+from app.utils.ocr_processor import OCRProcessor
+from benchmarks.signboards import corpus
+
+
+def accuracy(predicted, expected):
+    """Character-level similarity between OCR output and ground truth"""
+    normalize = lambda text: ' '.join(text.upper().split())
+    return difflib.SequenceMatcher(None, normalize(predicted), normalize(expected)).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profiles', default=','.join(OCRProcessor.PREPROCESS_PROFILES))
+    args = parser.parse_args()
+
+    ocr = OCRProcessor()
+    samples = list(corpus())
+
+    for profile in args.profiles.split(','):
+        print(f"\n[{profile}]")
+        print(f"{'image':<12} {'grayscale':>10} {'resize':>8} {'denoise':>8} {'threshold':>10} {'ocr':>8} {'accuracy':>9}")
+        for name, image, truth in samples:
+            timings = {}
+            start = time.perf_counter()
+            texts = ocr.extract_text(image, ['english'], profile=profile, timings=timings)
+            timings['total'] = (time.perf_counter() - start) * 1000
+            print(
+                f"{name:<12} {timings['grayscale']:>8.1f}ms {timings['resize']:>6.1f}ms "
+                f"{timings['denoise']:>6.1f}ms {timings['threshold']:>8.1f}ms {timings['ocr']:>6.0f}ms "
+                f"{accuracy(texts['english'], truth):>9.2%}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Nearby-search benchmark for the spatial index
+
+Fills a SpatialIndex with synthetic POIs spread over Indian metro areas,
+then times "restaurants within 2 km" queries against a brute-force NumPy
+scan of every point. Also times incremental filling in API-sized batches.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_spatial --sizes 10000,100000,1000000 --queries 1000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.utils.spatial_index import SpatialIndex
+
+# Centers POIs cluster around, as (lat, lng)
+CITIES = [
+    (28.6139, 77.2090), (19.0760, 72.8777), (12.9716, 77.5946), (22.5726, 88.3639),
+    (13.0827, 80.2707), (17.3850, 78.4867), (26.9124, 75.7873), (25.3176, 82.9739),
+]
+TYPES = ['restaurant', 'cafe', 'lodging', 'museum', 'tourist_attraction', 'atm', 'hospital', 'park']
+
+
+def synthetic_places(count, seed=0):
+    rng = random.Random(seed)
+    places = []
+    for i in range(count):
+        lat, lng = rng.choice(CITIES)
+        places.append({
+            'name': f"Place {i}",
+            'place_id': f"synthetic:{i}",
+            'rating': rng.choice([None, 3.0, 3.5, 4.0, 4.2, 4.5, 4.8]),
+            'types': [rng.choice(TYPES), 'point_of_interest'],
+            'location': {'lat': lat + rng.gauss(0, 0.08), 'lng': lng + rng.gauss(0, 0.08)}
+        })
+    return places
+
+
+def timed_queries(fn, centers):
+    latencies = []
+    for lat, lng in centers:
+        start = time.perf_counter()
+        fn(lat, lng)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--radius', type=float, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    centers = [
+        (lat + rng.gauss(0, 0.05), lng + rng.gauss(0, 0.05))
+        for lat, lng in (rng.choice(CITIES) for _ in range(args.queries))
+    ]
+
+    print(f"{'POIs':>9} {'bulk load':>10} {'incremental':>12} {'p50':>9} {'p99':>9} "
+          f"{'scan p50':>9} {'avg hits':>9}")
+    for size in [int(size) for size in args.sizes.split(',')]:
+        places = synthetic_places(size)
+
+        start = time.perf_counter()
+        index = SpatialIndex()
+        index.add_places(places)
+        bulk = time.perf_counter() - start
+
+        # Responses arrive 20 places at a time; time the last 10% of them
+        incremental_index = SpatialIndex()
+        incremental_index.add_places(places[:size * 9 // 10])
+        tail = places[size * 9 // 10:]
+        start = time.perf_counter()
+        for i in range(0, len(tail), 20):
+            incremental_index.add_places(tail[i:i + 20])
+        per_batch = (time.perf_counter() - start) * 1000 / max(1, len(tail) // 20)
+
+        hits = []
+        latencies = timed_queries(
+            lambda lat, lng: hits.append(len(index.nearby(lat, lng, args.radius, 'restaurant', limit=20))),
+            centers
+        )
+
+        # Baseline: distance to every point, then filter
+        lats = np.array([place['location']['lat'] for place in places])
+        lngs = np.array([place['location']['lng'] for place in places])
+        is_restaurant = np.array(['restaurant' in place['types'] for place in places])
+        scan = timed_queries(
+            lambda lat, lng: np.flatnonzero(
+                (SpatialIndex._haversine(lat, lng, lats, lngs) <= args.radius) & is_restaurant
+            ),
+            centers[:100]
+        )
+
+        print(f"{size:>9} {bulk:>9.2f}s {per_batch:>10.3f}ms {np.percentile(latencies, 50):>7.3f}ms "
+              f"{np.percentile(latencies, 99):>7.3f}ms {np.percentile(scan, 50):>7.3f}ms "
+              f"{sum(hits) / len(hits):>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
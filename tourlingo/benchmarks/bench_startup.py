@@ -0,0 +1,87 @@
+"""
+Startup-time benchmark for app.main
+
+Runs each measurement in a fresh interpreter and reports:
+  - import time of app.main
+  - latency of the first request to an endpoint (includes lazy model load)
+  - steady-state latency of later requests to the same endpoint
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_startup --endpoint translate --repeat 20
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+REQUESTS = {
+    'translate': ('/api/translate', {
+        'text': 'Where is the nearest restaurant?',
+        'source_lang': 'english',
+        'target_lang': 'hindi'
+    }),
+    'extract-entities': ('/api/extract-entities', {
+        'text': 'I want to visit the Taj Mahal in Agra and then go to the Red Fort'
+    }),
+    'travel-assist': ('/api/travel-assist', {
+        'text': 'Where can I find good restaurants near India Gate?',
+        'target_lang': 'hindi',
+        'include_suggestions': False
+    }),
+}
+
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+import app.main as main
+import_seconds = time.perf_counter() - start
+
+path, payload, repeat = json.loads(sys.argv[1])
+client = main.app.test_client()
+
+start = time.perf_counter()
+client.post(path, json=payload)
+first_seconds = time.perf_counter() - start
+
+steady = []
+for _ in range(repeat):
+    start = time.perf_counter()
+    client.post(path, json=payload)
+    steady.append(time.perf_counter() - start)
+steady.sort()
+
+print(json.dumps({
+    'import_seconds': import_seconds,
+    'first_request_seconds': first_seconds,
+    'steady_p50_seconds': steady[len(steady) // 2] if steady else None,
+    'components': main.components.status()
+}))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--endpoint', choices=sorted(REQUESTS), default='translate')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    path, payload = REQUESTS[args.endpoint]
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD, json.dumps([path, payload, args.repeat])],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    print(f"endpoint            {path}")
+    print(f"import app.main     {report['import_seconds']:.3f}s")
+    print(f"first request       {report['first_request_seconds']:.3f}s")
+    if report['steady_p50_seconds'] is not None:
+        print(f"steady state p50    {report['steady_p50_seconds'] * 1000:.1f}ms")
+    for name, state in report['components'].items():
+        print(f"  {name:<20} {state['state']:<11} {state['load_seconds']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Translation throughput benchmark
+
+Compares the per-sentence translate loop against batched batch_translate
+and against the MicroBatcher fed by concurrent callers.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.bench_translation --sentences 64 --concurrency 8
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.translator import IndicTranslator
+from app.utils.batching import MicroBatcher
+from benchmarks.corpora import SENTENCES
+
+
+def report(name, count, elapsed):
+    print(f"{name:<28} {count:>5} sentences  {elapsed:8.2f}s  {count / elapsed:8.2f} sent/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sentences', type=int, default=64)
+    parser.add_argument('--target-lang', default='hindi')
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--max-wait-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    texts = [SENTENCES[i % len(SENTENCES)] for i in range(args.sentences)]
+    translator = IndicTranslator()
+
+    # Warm up so model initialisation is not measured
+    translator.translate(texts[0], 'english', args.target_lang)
+
+    start = time.perf_counter()
+    for text in texts:
+        translator.translate(text, 'english', args.target_lang)
+    report('per-sentence translate', len(texts), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    translator.batch_translate(texts, 'english', args.target_lang, batch_size=args.batch_size)
+    report('batch_translate', len(texts), time.perf_counter() - start)
+
+    batcher = MicroBatcher(
+        translator,
+        max_batch_size=args.batch_size,
+        max_wait_ms=args.max_wait_ms
+    )
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(lambda text: batcher.translate(text, 'english', args.target_lang), texts))
+    report(f'micro-batcher x{args.concurrency}', len(texts), time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Compare two benchmark result files
+
+Flattens both files' results to dotted metric names (e.g.
+"translation.sentence_ms", "load.translate.p99_ms") and prints every metric
+present in either, with the relative change. Whether lower or higher is
+better is read from the metric name's suffix; metrics matching neither
+(counts, flags) are shown but never flagged. Exits 1 when a metric got
+worse by more than --threshold, so CI can gate on it; timings that moved by
+less than --min-ms are left alone, as that is scheduling noise.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.compare benchmarks/results/suite-abc123.json benchmarks/results/suite-def456.json
+"""
+import argparse
+import sys
+
+from benchmarks.results import load_results
+
+LOWER_IS_BETTER = ('_ms', '_us', '_s', '_mb', 'errors')
+HIGHER_IS_BETTER = ('rps', '_per_s', 'accuracy', 'recall', 'similarity', 'found', 'hit_rate')
+# Time units, as milliseconds
+TIME_UNITS = {'_us': 0.001, '_ms': 1.0, '_s': 1000.0}
+
+
+def flatten(results, prefix=''):
+    """{'a': {'b_ms': 1}} -> {'a.b_ms': 1}, keeping numeric leaves only"""
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+
+def direction(metric):
+    """-1 if lower is better, 1 if higher is better, 0 if neither"""
+    leaf = metric.rsplit('.', 1)[-1]
+    # Checked first: "_per_s" also ends in "_s"
+    if leaf.endswith(HIGHER_IS_BETTER):
+        return 1
+    if leaf.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def milliseconds(metric, value):
+    """value in ms for time metrics, None for anything else"""
+    for suffix, scale in TIME_UNITS.items():
+        if metric.endswith(suffix) and not metric.endswith('_per_s'):
+            return value * scale
+    return None
+
+
+def compare(base, new, threshold, min_ms=0.0):
+    """Rows of (metric, base value, new value, relative change, verdict)"""
+    base_metrics, new_metrics = flatten(base['results']), flatten(new['results'])
+    rows = []
+    for metric in sorted(set(base_metrics) | set(new_metrics)):
+        old, value = base_metrics.get(metric), new_metrics.get(metric)
+        if old is None or value is None:
+            rows.append((metric, old, value, None, 'added' if old is None else 'removed'))
+            continue
+
+        change = (value - old) / abs(old) if old else (0.0 if value == old else float('inf'))
+        better = direction(metric)
+        delta_ms = milliseconds(metric, abs(value - old))
+        if delta_ms is not None and delta_ms < min_ms:
+            better = 0
+        if better and change * better < -threshold:
+            verdict = 'REGRESSION'
+        elif better and change * better > threshold:
+            verdict = 'improved'
+        else:
+            verdict = ''
+        rows.append((metric, old, value, change, verdict))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('base', help="Results of the baseline commit")
+    parser.add_argument('new', help="Results to check")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Relative change treated as significant (default 0.2 = 20%%)")
+    parser.add_argument('--min-ms', type=float, default=0.05,
+                        help="Smallest change in a timing, in ms, that can be flagged")
+    parser.add_argument('--changed-only', action='store_true',
+                        help="Only print regressions, improvements and added/removed metrics")
+    args = parser.parse_args()
+
+    base, new = load_results(args.base), load_results(args.new)
+    for label, data in (('base', base), ('new', new)):
+        meta = data.get('meta', {})
+        print(f"{label}: {meta.get('commit')}{' (dirty)' if meta.get('dirty') else ''} "
+              f"{meta.get('timestamp')} {meta.get('platform')}")
+
+    rows = compare(base, new, args.threshold, args.min_ms)
+    print(f"\n{'metric':<48} {'base':>12} {'new':>12} {'change':>8}")
+    for metric, old, value, change, verdict in rows:
+        if args.changed_only and not verdict:
+            continue
+        old_text = f"{old:>12.4g}" if old is not None else f"{'-':>12}"
+        new_text = f"{value:>12.4g}" if value is not None else f"{'-':>12}"
+        change_text = f"{change:>+8.1%}" if change is not None else f"{'':>8}"
+        print(f"{metric:<48} {old_text} {new_text} {change_text}  {verdict}")
+
+    regressions = [row for row in rows if row[4] == 'REGRESSION']
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
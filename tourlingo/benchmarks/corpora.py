@@ -0,0 +1,111 @@
+"""
+Fixed benchmark corpora
+
+Sentences, travel queries and signboard texts shared by the benchmarks, so
+results from different commits are measured on the same input.
+"""
+import glob
+import os
+
+# English sentences for the en-indic direction
+SENTENCES = [
+    "Where is the nearest restaurant?",
+    "How much does a ticket to the Red Fort cost?",
+    "Please take me to the railway station.",
+    "Is this museum open on Monday?",
+    "I would like a room for two nights.",
+    "Which bus goes to India Gate?",
+    "Can you recommend a good vegetarian dhaba nearby?",
+    "What time does the last metro leave from Rajiv Chowk?",
+]
+
+# (language, text) with the language detect_text_language should report
+LABELLED_TEXTS = [
+    ('english', "Where is the nearest railway station?"),
+    ('english', "How much does a ticket to the Red Fort cost?"),
+    ('english', "Platform 3, exit to main road"),
+    ('hindi', "सबसे नज़दीकी रेलवे स्टेशन कहाँ है?"),
+    ('hindi', "लाल किले का टिकट कितने का है?"),
+    ('hindi', "मुझे होटल जाना है और खाना भी खाना है।"),
+    ('marathi', "सर्वात जवळचे रेल्वे स्थानक कुठे आहे?"),
+    ('marathi', "मला हॉटेलमध्ये जायचे आहे आणि जेवण करायचे आहे."),
+    ('bengali', "নিকটতম রেলওয়ে স্টেশন কোথায়?"),
+    ('tamil', "அருகிலுள்ள ரயில் நிலையம் எங்கே?"),
+    ('telugu', "దగ్గరలోని రైల్వే స్టేషన్ ఎక్కడ ఉంది?"),
+    ('kannada', "ಹತ್ತಿರದ ರೈಲು ನಿಲ್ದಾಣ ಎಲ್ಲಿದೆ?"),
+    ('malayalam', "അടുത്തുള്ള റെയിൽവേ സ്റ്റേഷൻ എവിടെയാണ്?"),
+    ('gujarati', "નજીકનું રેલવે સ્ટેશન ક્યાં છે?"),
+    ('punjabi', "ਸਭ ਤੋਂ ਨੇੜੇ ਰੇਲਵੇ ਸਟੇਸ਼ਨ ਕਿੱਥੇ ਹੈ?"),
+    ('urdu', "قریب ترین ریلوے اسٹیشن کہاں ہے؟"),
+]
+
+# Multi-line text for the document (segment, batch, rebuild) path
+DOCUMENT = (
+    "Welcome to the City Museum. The galleries open at 10 AM and close at 5 PM.\n"
+    "Tickets are sold at the counter near the main gate. Photography is not allowed "
+    "inside the sculpture hall.\n"
+    "The nearest metro station is a ten minute walk away. Buses to India Gate leave "
+    "every fifteen minutes."
+)
+
+# (query, place names the extracted entities should contain)
+TRAVEL_QUERIES = [
+    ("I want to visit the Taj Mahal in Agra and then go to the Red Fort",
+     ['Taj Mahal', 'Agra', 'Red Fort']),
+    ("Where can I find good restaurants near India Gate?", ['India Gate']),
+    ("Is the Gateway of India far from Colaba market?", ['Gateway of India', 'Colaba']),
+    ("Book a hotel in Jaipur close to the Hawa Mahal", ['Jaipur', 'Hawa Mahal']),
+    ("How do I get from Chennai airport to Marina Beach?", ['Chennai', 'Marina Beach']),
+    ("Which temples should I see in Varanasi besides Kashi Vishwanath?",
+     ['Varanasi', 'Kashi Vishwanath']),
+    ("Is there a metro station near Connaught Place in Delhi?", ['Connaught Place', 'Delhi']),
+    ("We are taking the train from Mumbai to Goa next week", ['Mumbai', 'Goa']),
+]
+
+# Two-line signs per language OCR supports, in that language's script
+INDIC_SIGNS = {
+    'hindi': ('रेलवे स्टेशन', 'प्रवेश द्वार'),
+    'marathi': ('रेल्वे स्थानक', 'बाहेर जाण्याचा मार्ग'),
+    'bengali': ('রেলওয়ে স্টেশন', 'প্রবেশ পথ'),
+    'tamil': ('ரயில் நிலையம்', 'நுழைவாயில்'),
+    'telugu': ('రైల్వే స్టేషన్', 'ప్రవేశ ద్వారం'),
+    'kannada': ('ರೈಲು ನಿಲ್ದಾಣ', 'ಪ್ರವೇಶ ದ್ವಾರ'),
+    'malayalam': ('റെയിൽവേ സ്റ്റേഷൻ', 'പ്രവേശന കവാടം'),
+    'gujarati': ('રેલવે સ્ટેશન', 'પ્રવેશ દ્વાર'),
+}
+
+# Font families that cover each language's script, most common first
+SCRIPT_FONTS = {
+    'hindi': ['NotoSansDevanagari', 'Lohit-Devanagari'],
+    'marathi': ['NotoSansDevanagari', 'Lohit-Marathi', 'Lohit-Devanagari'],
+    'bengali': ['NotoSansBengali', 'Lohit-Bengali'],
+    'tamil': ['NotoSansTamil', 'Lohit-Tamil'],
+    'telugu': ['NotoSansTelugu', 'Lohit-Telugu'],
+    'kannada': ['NotoSansKannada', 'Lohit-Kannada'],
+    'malayalam': ['NotoSansMalayalam', 'Lohit-Malayalam'],
+    'gujarati': ['NotoSansGujarati', 'Lohit-Gujarati'],
+}
+
+FONT_DIRS = ['/usr/share/fonts', '/usr/local/share/fonts', '~/.local/share/fonts', '~/.fonts',
+             '/Library/Fonts', '/System/Library/Fonts']
+
+
+def find_font(language, font_dirs=None):
+    """
+    Path of a TrueType font for language's script, or None
+
+    Searches font_dirs, then BENCH_FONT_DIRS (colon-separated), then the
+    usual system font directories.
+    """
+    directories = list(font_dirs or [])
+    directories += [path for path in os.getenv('BENCH_FONT_DIRS', '').split(':') if path]
+    directories += FONT_DIRS
+    for family in SCRIPT_FONTS.get(language, []):
+        for directory in directories:
+            pattern = os.path.join(os.path.expanduser(directory), '**', f'{family}*.ttf')
+            matches = sorted(glob.glob(pattern, recursive=True))
+            # Prefer the regular weight of a family
+            regular = [path for path in matches if 'Regular' in os.path.basename(path)]
+            if regular or matches:
+                return (regular or matches)[0]
+    return None
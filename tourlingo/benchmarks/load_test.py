@@ -0,0 +1,237 @@
+"""
+HTTP load test for a running Tourlingo server
+
+Drives each /api/* endpoint at a fixed concurrency for a fixed duration and
+reports requests/sec, errors (5xx, connection failures, SSE error events),
+rejections (429 from the job queue) and p50/p90/p99 latency per endpoint.
+Streaming endpoints are timed until the last event arrives.
+
+With --stub the server is started in-process on stub backends (see
+benchmarks.stub_app), so the run needs no network, Maps key or model
+weights. --output writes the numbers as JSON for benchmarks.compare.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --concurrency 16 --duration 30
+    python -m benchmarks.load_test --stub --ner-model blank:en --duration 5 --output load.json
+"""
+import argparse
+import functools
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.corpora import DOCUMENT, SENTENCES, TRAVEL_QUERIES
+
+TIMEOUT = 120
+
+
+@functools.lru_cache(maxsize=1)
+def sign_image():
+    """PNG bytes of one synthetic signboard, rendered once"""
+    from benchmarks.signboards import signboard
+
+    buffer = io.BytesIO()
+    signboard(size=(1200, 400), noise=5).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class Endpoint:
+    """One request shape; path may use fields returned by prepare, e.g. {job_id}"""
+
+    def __init__(self, method, path, json=None, params=None, form=None, files=None,
+                 prepare=None):
+        self.method = method
+        self.path = path
+        self.json = json
+        self.params = params
+        self.form = form
+        self.files = files
+        self.prepare = prepare
+
+    def send(self, session, url, context=None):
+        files = None
+        if self.files:
+            image = sign_image()
+            files = [(field, ('sign.png', image, 'image/png')) for field in self.files]
+        return session.request(
+            self.method, url + self.path.format(**(context or {})),
+            json=self.json, params=self.params, data=self.form, files=files, timeout=TIMEOUT
+        )
+
+
+def queued_job(session, url):
+    """Submit a low-priority async translation to poll or cancel"""
+    try:
+        response = session.post(url + '/api/translate', json={
+            'text': DOCUMENT, 'target_lang': 'hindi', 'async': True, 'priority': 'low'
+        }, timeout=TIMEOUT)
+        return {'job_id': response.json().get('id', 'unknown')}
+    except (requests.RequestException, ValueError):
+        # Polled as an unknown job (404) rather than not at all
+        return {'job_id': 'unknown'}
+
+
+ENDPOINTS = {
+    'translate': Endpoint('POST', '/api/translate', json={
+        'text': SENTENCES[0], 'source_lang': 'english', 'target_lang': 'hindi'
+    }),
+    'translate-async': Endpoint('POST', '/api/translate', json={
+        'text': SENTENCES[1], 'target_lang': 'hindi', 'async': True
+    }),
+    'translate-batch': Endpoint('POST', '/api/translate/batch', json={
+        'texts': SENTENCES, 'source_lang': 'english', 'target_lang': 'hindi'
+    }),
+    'translate-stream': Endpoint('POST', '/api/translate/stream', json={
+        'text': DOCUMENT, 'source_lang': 'english', 'target_lang': 'hindi'
+    }),
+    'translate-models': Endpoint('GET', '/api/translate/models'),
+    'translate-cache-stats': Endpoint('GET', '/api/translate/cache-stats'),
+    'ocr-cache-stats': Endpoint('GET', '/api/ocr/cache-stats'),
+    'jobs': Endpoint('GET', '/api/jobs'),
+    'job-status': Endpoint('GET', '/api/jobs/{job_id}', prepare=queued_job),
+    'job-cancel': Endpoint('DELETE', '/api/jobs/{job_id}', prepare=queued_job),
+    'extract-entities': Endpoint('POST', '/api/extract-entities', json={
+        'text': TRAVEL_QUERIES[0][0]
+    }),
+    'extract-entities-batch': Endpoint('POST', '/api/extract-entities/batch', json={
+        'texts': [query for query, _ in TRAVEL_QUERIES]
+    }),
+    'ocr': Endpoint('POST', '/api/ocr', form={'languages': 'english'}, files=['image']),
+    'ocr-batch': Endpoint('POST', '/api/ocr/batch', form={'languages': 'english'},
+                          files=['images', 'images']),
+    'travel-assist': Endpoint('POST', '/api/travel-assist', json={
+        'text': 'Where can I find good restaurants near India Gate?',
+        'target_lang': 'hindi',
+        'include_suggestions': True
+    }),
+    'travel-assist-stream': Endpoint('POST', '/api/travel-assist/stream', json={
+        'text': 'Where can I find good restaurants near India Gate?',
+        'target_lang': 'hindi',
+        'include_suggestions': True
+    }),
+    'nearby': Endpoint('GET', '/api/nearby', params={
+        'lat': 28.6129, 'lng': 77.2295, 'radius': 5000
+    }),
+    'image-assist': Endpoint('POST', '/api/image-assist', form={'target_lang': 'hindi'},
+                             files=['image']),
+    'image-assist-async': Endpoint('POST', '/api/image-assist', form={
+        'target_lang': 'hindi', 'async': '1'
+    }, files=['image']),
+}
+
+# Need neither tesseract nor a spaCy model
+OFFLINE_ENDPOINTS = [
+    'translate', 'translate-async', 'translate-batch', 'translate-stream', 'translate-models',
+    'translate-cache-stats', 'ocr-cache-stats', 'jobs', 'job-status', 'job-cancel', 'nearby'
+]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_endpoint(url, endpoint, concurrency, duration):
+    """Hammer one endpoint; returns (latencies, errors, rejected, status_codes, elapsed)"""
+    latencies, errors, rejected, status_codes = [], 0, 0, {}
+    lock = threading.Lock()
+    if endpoint.files:
+        sign_image()
+    stop_at = time.perf_counter() + duration
+
+    def worker():
+        nonlocal errors, rejected
+        session = requests.Session()
+        context = endpoint.prepare(session, url) if endpoint.prepare else None
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                response = endpoint.send(session, url, context)
+                status = response.status_code
+                # Streams report failures as events after a 200
+                ok = status < 500 and b'event: error' not in response.content
+            except requests.RequestException:
+                status, ok = 'failed', False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                errors += not ok
+                rejected += status == 429
+                status_codes[str(status)] = status_codes.get(str(status), 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    return sorted(latencies), errors, rejected, status_codes, time.perf_counter() - start
+
+
+def run_load_test(url, names, concurrency, duration, report=print):
+    """Run each endpoint in turn; returns {name: metrics}"""
+    results = {}
+    report(f"{'endpoint':<24} {'requests':>8} {'errors':>6} {'429':>5} {'rps':>8} "
+           f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}")
+    for name in names:
+        latencies, errors, rejected, status_codes, elapsed = run_endpoint(
+            url.rstrip('/'), ENDPOINTS[name], concurrency, duration
+        )
+        results[name] = {
+            'requests': len(latencies),
+            'errors': errors,
+            'rejected': rejected,
+            'status_codes': status_codes,
+            'rps': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.5) * 1000,
+            'p90_ms': percentile(latencies, 0.9) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000
+        }
+        row = results[name]
+        report(f"{name:<24} {row['requests']:>8} {errors:>6} {rejected:>5} {row['rps']:>8.1f} "
+               f"{row['p50_ms']:>8.0f} {row['p90_ms']:>8.0f} {row['p99_ms']:>8.0f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                        help="Comma-separated names, or 'offline' for those needing no "
+                             "tesseract or spaCy model")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--stub', action='store_true',
+                        help="Start the server in-process on stub backends instead of using --url")
+    parser.add_argument('--maps-latency-ms', type=float, default=0.0, help="With --stub")
+    parser.add_argument('--ner-model', help="With --stub: spaCy pipeline, e.g. blank:en")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    names = OFFLINE_ENDPOINTS if args.endpoints == 'offline' else args.endpoints.split(',')
+    unknown = [name for name in names if name not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints {unknown}, expected some of {list(ENDPOINTS)}")
+
+    url = args.url
+    if args.stub:
+        from benchmarks.stub_app import create_stub_app, serve
+
+        app_module, _ = create_stub_app(args.maps_latency_ms, args.ner_model)
+        _, url = serve(app_module.app)
+
+    results = run_load_test(url, names, args.concurrency, args.duration)
+
+    if args.output:
+        from benchmarks.results import write_results
+
+        write_results(args.output, {'load': results}, url=None if args.stub else url,
+                      stub=args.stub, concurrency=args.concurrency, duration=args.duration)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
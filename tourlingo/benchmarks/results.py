@@ -0,0 +1,62 @@
+"""
+JSON benchmark results
+
+Every result file carries the commit and machine it was measured on, so
+two runs can be compared with benchmarks.compare.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def _git(*args):
+    try:
+        return subprocess.run(
+            ['git', *args], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def metadata(**settings):
+    """Commit, machine and run settings for a result file"""
+    return {
+        'commit': _git('rev-parse', 'HEAD') or None,
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'argv': sys.argv[1:],
+        'settings': settings
+    }
+
+
+def default_path(name):
+    """benchmarks/results/<name>-<short commit>.json"""
+    commit = _git('rev-parse', '--short', 'HEAD') or 'unknown'
+    return os.path.join(RESULTS_DIR, f"{name}-{commit}.json")
+
+
+def write_results(path, results, **settings):
+    """Write {'meta': ..., 'results': results} to path and return the path"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': metadata(**settings), 'results': results}, f, indent=2, sort_keys=True,
+                  ensure_ascii=False)
+        f.write('\n')
+    return path
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,394 @@
+"""
+Benchmark suite with JSON results
+
+Micro-benchmarks for each component on the fixed corpora in
+benchmarks.corpora: language identification, translation (MockBackend by
+default, so no weights are needed), NER on travel queries, image
+preprocessing, text-region detection, the OCR cache, OCR accuracy on
+signboards rendered in each Indic script, the gazetteer, the spatial index
+and the Maps client against the stub server. --load adds a short load test
+of the /api/* routes on stub backends (benchmarks.load_test --stub).
+
+A component whose dependency is missing here (tesseract, a spaCy model,
+torch) is recorded as skipped rather than failing the run. Latencies are
+medians over --repeat calls. Indic signboards need a font for each script
+(see corpora.find_font) and PIL built with libraqm to shape conjuncts;
+without raqm the rendered text is only a floor for OCR accuracy.
+
+Results go to benchmarks/results/suite-<commit>.json by default; compare
+two runs with benchmarks.compare.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.run_suite --repeat 20 --ner-model en_core_web_sm --load
+    python -m benchmarks.run_suite --only language_id,text_regions,ocr_cache --output new.json
+"""
+import argparse
+import difflib
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.corpora import (DOCUMENT, INDIC_SIGNS, LABELLED_TEXTS, SENTENCES, TRAVEL_QUERIES,
+                                find_font)
+from benchmarks.signboards import SIGN_TEXTS, corpus, signboard, street_scene
+
+
+def median_ms(fn, repeat):
+    """Median wall time of fn() over repeat calls, in milliseconds"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def bench_language_id(args):
+    from app.utils.scripts import detect_text_language
+
+    correct = sum(detect_text_language(text) == expected for expected, text in LABELLED_TEXTS)
+
+    def run():
+        for _, text in LABELLED_TEXTS:
+            detect_text_language(text)
+
+    return {
+        'accuracy': correct / len(LABELLED_TEXTS),
+        'per_call_us': median_ms(run, args.repeat) * 1000 / len(LABELLED_TEXTS)
+    }
+
+
+def bench_translation(args):
+    from app.utils.batching import ModelRoutedBatcher
+    from app.utils.translation_cache import TranslationCache
+
+    def build_pool(cache=None):
+        if args.translate_backend == 'mock':
+            from benchmarks.stub_backends import stub_translator_pool
+            return stub_translator_pool(cache, directions=('en-indic', 'indic-en'))
+
+        from app.utils.model_pool import TranslatorPool
+        from app.utils.translator import IndicTranslator
+        return TranslatorPool({
+            direction: IndicTranslator(cache=cache, backend=args.translate_backend,
+                                       direction=direction, lazy=True)
+            for direction in ('en-indic', 'indic-en')
+        })
+
+    pool = build_pool()
+    pool.preload(['en-indic', 'indic-en'])
+    hindi = [text for language, text in LABELLED_TEXTS if language == 'hindi']
+    texts = SENTENCES * 4
+
+    results = {
+        'sentence_ms': median_ms(lambda: pool.translate(SENTENCES[0], 'english', 'hindi'),
+                                 args.repeat),
+        'indic_en_ms': median_ms(lambda: pool.translate(hindi[0], 'hindi', 'english'),
+                                 args.repeat),
+        'document_ms': median_ms(lambda: pool.translate_document(DOCUMENT, 'english', 'hindi'),
+                                 max(1, args.repeat // 4)),
+    }
+
+    start = time.perf_counter()
+    pool.batch_translate(texts, 'english', 'hindi')
+    results['batch_sentences_per_s'] = len(texts) / (time.perf_counter() - start)
+
+    # Concurrent single-sentence callers, coalesced by the micro-batcher
+    batcher = ModelRoutedBatcher(pool, max_batch_size=16, max_wait_ms=10)
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda text: batcher.translate(text, 'english', 'hindi'), texts))
+        results['batcher_sentences_per_s'] = len(texts) / (time.perf_counter() - start)
+    finally:
+        batcher.close()
+
+    cached = build_pool(TranslationCache(max_entries=1000))
+    cached.translate(SENTENCES[0], 'english', 'hindi')
+    results['cache_hit_us'] = median_ms(
+        lambda: cached.translate(SENTENCES[0], 'english', 'hindi'), args.repeat
+    ) * 1000
+    return results
+
+
+def bench_ner(args):
+    from app.utils.ner_extractor import TravelNER
+
+    ner = TravelNER(args.ner_model)
+    queries = [query for query, _ in TRAVEL_QUERIES]
+
+    found = expected_total = 0
+    for query, expected in TRAVEL_QUERIES:
+        entities = ' | '.join(
+            value for values in ner.extract_entities(query).values() for value in values
+        ).lower()
+        found += sum(name.lower() in entities for name in expected)
+        expected_total += len(expected)
+
+    start = time.perf_counter()
+    for _ in range(max(1, args.repeat // 4)):
+        list(ner.extract_entities_stream(queries, batch_size=len(queries)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'recall': found / expected_total,
+        'query_ms': median_ms(lambda: ner.extract_entities(queries[0]), args.repeat),
+        'pipe_queries_per_s': len(queries) * max(1, args.repeat // 4) / elapsed
+    }
+
+
+def bench_preprocess(args):
+    from app.utils.ocr_processor import OCRProcessor
+
+    ocr = OCRProcessor()
+    return {
+        f'{name}_ms': median_ms(lambda: ocr.preprocess_image(image), max(1, args.repeat // 4))
+        for name, image, _ in corpus()
+    }
+
+
+def bench_text_regions(args):
+    from app.utils.text_regions import detect_text_regions
+
+    scenes = [street_scene(lines, seed=i) for i, lines in enumerate(SIGN_TEXTS)]
+    grays = [np.asarray(image.convert('L')) for image, _ in scenes]
+
+    found = 0
+    for gray, (_, (x, y, width, height)) in zip(grays, scenes):
+        regions = detect_text_regions(gray)
+        found += any(
+            x <= region.center[0] <= x + width and y <= region.center[1] <= y + height
+            for region in regions
+        )
+
+    return {
+        'sign_found': found / len(scenes),
+        'detect_ms': median_ms(lambda: detect_text_regions(grays[0]), max(1, args.repeat // 4))
+    }
+
+
+def bench_ocr_cache(args):
+    from app.utils.ocr_cache import OCRCache
+
+    cache = OCRCache(max_entries=2049)
+    sign = signboard(SIGN_TEXTS[0], noise=5)
+    photo = signboard(SIGN_TEXTS[0], size=(4000, 3000), noise=8)
+
+    key = OCRCache.make_key('extract', ['english', 'hindi'])
+    rng = random.Random(0)
+    for i in range(2048):
+        cache.set(rng.getrandbits(cache.hash_size ** 2), key, {'english': str(i)})
+    probe = cache.image_hash(sign)
+
+    return {
+        'hash_ms': median_ms(lambda: cache.image_hash(sign), args.repeat),
+        'hash_12mp_ms': median_ms(lambda: cache.image_hash(photo), max(1, args.repeat // 4)),
+        # A miss compares against every entry, the slowest lookup
+        'miss_lookup_ms': median_ms(lambda: cache.get(probe, key), args.repeat)
+    }
+
+
+def bench_ocr(args):
+    import PIL.features
+    import pytesseract
+    from app.utils.ocr_processor import OCRProcessor
+
+    # Raises TesseractNotFoundError (an OSError), so the component is skipped
+    pytesseract.get_tesseract_version()
+    ocr = OCRProcessor()
+    repeat = max(1, args.repeat // 10)
+
+    def similarity(expected, text):
+        return difflib.SequenceMatcher(None, ' '.join(expected.split()), ' '.join(text.split())).ratio()
+
+    results = {'raqm': PIL.features.check('raqm'), 'skipped_languages': {}}
+    signs = {'english': (SIGN_TEXTS[0], None)}
+    for language, lines in INDIC_SIGNS.items():
+        font = find_font(language)
+        if font is None:
+            results['skipped_languages'][language] = 'no font for its script'
+        else:
+            signs[language] = (lines, font)
+
+    for language, (lines, font) in signs.items():
+        image = signboard(lines, size=(1200, 400), noise=5, font_path=font)
+        languages = sorted({'english', language})
+        expected = '\n'.join(lines)
+        try:
+            texts = ocr.extract_text(image, languages)
+            gray = ocr.preprocess_gray(image)
+            region_texts, _ = ocr.extract_text_regions(gray, languages, image.size)
+        except pytesseract.TesseractError as e:
+            results['skipped_languages'][language] = str(e).strip()
+            continue
+
+        results[f'{language}_similarity'] = similarity(expected, texts.get(language, ''))
+        results[f'{language}_regions_similarity'] = similarity(expected, region_texts.get(language, ''))
+        results[f'{language}_ms'] = median_ms(lambda: ocr.extract_text(image, languages), repeat)
+        results[f'{language}_regions_ms'] = median_ms(
+            lambda: ocr.extract_text_regions(ocr.preprocess_gray(image), languages, image.size),
+            repeat
+        )
+    return results
+
+
+def bench_gazetteer(args):
+    from app.utils.gazetteer import Gazetteer
+    from benchmarks.stub_app import build_seed_gazetteer
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        path = build_seed_gazetteer(directory)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        gazetteer = Gazetteer(path)
+        queries = {'exact': 'Taj Mahal', 'prefix': 'Red F', 'fuzzy': 'Qutub Minr',
+                   'alias': 'ताज महल'}
+        results = {'build_ms': build_ms}
+        for kind, query in queries.items():
+            results[f'{kind}_found'] = int(bool(gazetteer.search(query)))
+            results[f'{kind}_ms'] = median_ms(lambda: gazetteer.search(query), args.repeat)
+        gazetteer.close()
+    return results
+
+
+def bench_spatial(args):
+    from app.utils.spatial_index import SpatialIndex
+
+    rng = np.random.default_rng(0)
+    lats = 28.6 + rng.normal(0, 0.1, 100_000)
+    lngs = 77.2 + rng.normal(0, 0.1, 100_000)
+    places = [{
+        'place_id': str(i),
+        'name': f"Place {i}",
+        'location': {'lat': float(lat), 'lng': float(lng)},
+        'rating': round(float(rng.uniform(2, 5)), 1),
+        'types': ['restaurant' if i % 4 == 0 else 'point_of_interest']
+    } for i, (lat, lng) in enumerate(zip(lats, lngs))]
+
+    index = SpatialIndex()
+    start = time.perf_counter()
+    index.add_places(places)
+    add_s = time.perf_counter() - start
+
+    return {
+        'add_100k_s': add_s,
+        'nearby_ms': median_ms(lambda: index.nearby(28.6, 77.2, 2000), args.repeat),
+        'nearby_typed_ms': median_ms(lambda: index.nearby(28.6, 77.2, 2000, 'restaurant'),
+                                     args.repeat)
+    }
+
+
+def bench_maps(args):
+    from app.utils.maps_helper import GoogleMapsHelper
+    from benchmarks.stub_maps_server import start_stub_server
+
+    server, base_url = start_stub_server(latency_ms=args.maps_latency_ms)
+    try:
+        uncached = GoogleMapsHelper(api_key='stub', base_url=base_url, cache_ttl=0)
+        cached = GoogleMapsHelper(api_key='stub', base_url=base_url)
+        cached.search_places('restaurants near India Gate')
+        queries = [f"restaurants near {name}" for name in ('India Gate', 'Red Fort', 'Qutub Minar')]
+        return {
+            'search_ms': median_ms(lambda: uncached.search_places(queries[0]), args.repeat),
+            'search_many_ms': median_ms(lambda: uncached.search_places_many(queries),
+                                        max(1, args.repeat // 4)),
+            'cached_search_ms': median_ms(
+                lambda: cached.search_places('restaurants near India Gate'), args.repeat
+            )
+        }
+    finally:
+        server.shutdown()
+
+
+def bench_load(args):
+    from benchmarks.load_test import ENDPOINTS, OFFLINE_ENDPOINTS, run_load_test
+    from benchmarks.stub_app import create_stub_app, serve
+
+    app_module, maps_server = create_stub_app(args.maps_latency_ms, args.ner_model)
+    server, url = serve(app_module.app)
+    try:
+        names = OFFLINE_ENDPOINTS if args.endpoints == 'offline' else (
+            list(ENDPOINTS) if args.endpoints == 'all' else args.endpoints.split(',')
+        )
+        return run_load_test(url, names, args.concurrency, args.load_duration)
+    finally:
+        server.shutdown()
+        maps_server.shutdown()
+        app_module.shutdown()
+
+
+BENCHMARKS = {
+    'language_id': bench_language_id,
+    'translation': bench_translation,
+    'ner': bench_ner,
+    'preprocess': bench_preprocess,
+    'text_regions': bench_text_regions,
+    'ocr_cache': bench_ocr_cache,
+    'ocr': bench_ocr,
+    'gazetteer': bench_gazetteer,
+    'spatial': bench_spatial,
+    'maps': bench_maps,
+}
+
+
+def main():
+    from benchmarks.results import default_path, write_results
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', help=f"Comma-separated subset of {list(BENCHMARKS)}")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--translate-backend', default='mock',
+                        help="mock, or a real backend (torch, torch-int8, ctranslate2)")
+    parser.add_argument('--ner-model', default='en_core_web_md')
+    parser.add_argument('--maps-latency-ms', type=float, default=0.0)
+    parser.add_argument('--load', action='store_true', help="Also load-test /api/* on stub backends")
+    parser.add_argument('--endpoints', default='all',
+                        help="With --load: 'all', 'offline' or comma-separated names")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--load-duration', type=float, default=5)
+    parser.add_argument('--output', help="JSON file (default benchmarks/results/suite-<commit>.json)")
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks {unknown}, expected some of {list(BENCHMARKS)}")
+
+    results = {}
+    for name in names:
+        print(f"== {name}")
+        start = time.perf_counter()
+        try:
+            results[name] = BENCHMARKS[name](args)
+        except (ImportError, OSError) as e:
+            # Missing optional dependency (tesseract, spaCy model, torch)
+            results[name] = {'skipped': f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+        for metric, value in results[name].items():
+            print(f"   {metric:<28} {value:.3f}" if isinstance(value, float) else f"   {metric:<28} {value}")
+        print(f"   ({time.perf_counter() - start:.1f}s)")
+
+    if args.load:
+        print("== load")
+        try:
+            results['load'] = bench_load(args)
+        except (ImportError, OSError) as e:
+            results['load'] = {'skipped': f"{type(e).__name__}: {e}"}
+
+    path = write_results(
+        args.output or default_path('suite'), results,
+        repeat=args.repeat, translate_backend=args.translate_backend, ner_model=args.ner_model,
+        maps_latency_ms=args.maps_latency_ms, concurrency=args.concurrency,
+        load_duration=args.load_duration if args.load else None
+    )
+    print(f"Wrote {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Tourlingo server wired to stub backends
+
+Starts the stub Maps server, builds a gazetteer from data/gazetteer_seed.csv
+in a temporary directory, swaps the translation models for MockBackend and
+serves the real Flask app on a local port, so every /api/* route runs
+offline (CI, machines without model weights or a Maps key). NER still needs
+a spaCy pipeline ("blank:en" needs no download and keeps only the keyword
+matches) and the OCR routes need tesseract.
+
+Usage (from the tourlingo/ directory):
+    python -m benchmarks.stub_app --port 5000 --maps-latency-ms 50 --ner-model blank:en
+    python -m benchmarks.load_test --url http://127.0.0.1:5000
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.stub_maps_server import start_stub_server
+
+SEED_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'gazetteer_seed.csv')
+
+
+def build_seed_gazetteer(directory):
+    """Gazetteer of the seed places, so /api/nearby and place lookups have data"""
+    from app.gazetteer_build import read_csv
+    from app.utils.gazetteer import GazetteerBuilder
+
+    builder = GazetteerBuilder(os.path.join(directory, 'gazetteer.db'))
+    for place in read_csv(SEED_CSV):
+        builder.add(**place)
+    return builder.finish(source=SEED_CSV)['path']
+
+
+def create_stub_app(maps_latency_ms=0.0, ner_model=None, **backend_options):
+    """
+    Import app.main configured for stub backends
+
+    Must run before anything else imports app.main, which reads its
+    settings from the environment at import time.
+
+    Args:
+        maps_latency_ms: Artificial latency of each stub Maps response
+        ner_model: spaCy pipeline for NER (default: the app's own)
+        backend_options: MockBackend latency and size settings
+
+    Returns:
+        (app.main module, stub Maps server)
+    """
+    maps_server, maps_url = start_stub_server(latency_ms=maps_latency_ms)
+    data_dir = tempfile.mkdtemp(prefix='tourlingo-stub-')
+
+    os.environ['GOOGLE_MAPS_BASE_URL'] = maps_url
+    os.environ['GOOGLE_MAPS_API_KEY'] = 'stub'
+    os.environ['GAZETTEER_DB'] = build_seed_gazetteer(data_dir)
+    # Keep stub translations out of the real on-disk cache
+    os.environ['TRANSLATION_CACHE_DB'] = ''
+    os.environ['TOURLINGO_DEFER_PRELOAD'] = '1'
+
+    from app import main
+    from benchmarks.stub_backends import stub_translator_pool
+
+    main.components.register(
+        'translator', lambda: stub_translator_pool(main.translation_cache, **backend_options)
+    )
+    if ner_model:
+        from app.utils.ner_extractor import TravelNER
+        main.components.register('ner', lambda: TravelNER(ner_model))
+    return main, maps_server
+
+
+def serve(app, port=0):
+    """Serve a WSGI app on a daemon thread; returns (server, base_url)"""
+    from werkzeug.serving import make_server
+
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--maps-latency-ms', type=float, default=0.0)
+    parser.add_argument('--translate-base-ms', type=float, default=5.0)
+    parser.add_argument('--translate-per-token-ms', type=float, default=0.5)
+    parser.add_argument('--ner-model', help="spaCy pipeline, e.g. blank:en or en_core_web_sm")
+    args = parser.parse_args()
+
+    app_module, maps_server = create_stub_app(
+        args.maps_latency_ms, args.ner_model,
+        base_ms=args.translate_base_ms, per_token_ms=args.translate_per_token_ms
+    )
+    server, base_url = serve(app_module.app, args.port)
+    print(f"Tourlingo (stub backends) listening on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        maps_server.shutdown()
+        app_module.shutdown()
+
+
+if __name__ == '__main__':
+    main()
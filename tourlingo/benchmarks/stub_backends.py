@@ -0,0 +1,92 @@
+"""
+Stub translation backend for offline benchmarks
+
+MockBackend implements the inference backend interface (see
+app.utils.inference_backends.create_backend) without model weights: it
+returns a deterministic pseudo-translation after a latency that grows with
+batch size and input length, and runs one batch at a time per model like
+the real backends. Everything around the model (segmentation, caching,
+batching, the model pool) is the production code, so its overhead and
+behaviour under load are what the benchmarks measure.
+"""
+import threading
+import time
+
+MB = 1024 * 1024
+
+
+class MockBackend:
+    """Deterministic stand-in for an IndicTrans2 checkpoint"""
+
+    name = 'mock'
+
+    def __init__(self, model_name, base_ms=5.0, per_token_ms=0.5, load_seconds=0.0, memory_mb=100):
+        """
+        Args:
+            model_name: Checkpoint being stood in for (used in cache keys)
+            base_ms: Fixed cost of one generate call
+            per_token_ms: Cost per input word per beam in the batch; a batch
+                is padded to its longest input, as in the real model
+            load_seconds: Time load() takes
+            memory_mb: Reported weight size while loaded, for pool budgets
+        """
+        self.model_name = model_name
+        self.base_ms = base_ms
+        self.per_token_ms = per_token_ms
+        self.load_seconds = load_seconds
+        self.memory_mb = memory_mb
+        self.model = None
+        self.tokenizer = None
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        time.sleep(self.load_seconds)
+        self.model = self.model_name
+
+    def unload(self):
+        self.model = None
+
+    def memory_bytes(self):
+        return int(self.memory_mb * MB) if self.model is not None else 0
+
+    def generate(self, input_texts, tgt_code, num_beams, max_length):
+        # Inputs arrive as "<src_code> <text>"
+        texts = [text.split(' ', 1)[1] if ' ' in text else text for text in input_texts]
+        longest = max((len(text.split()) for text in texts), default=0)
+        cost_ms = self.base_ms + self.per_token_ms * longest * len(texts) * (num_beams or 1)
+
+        with self._lock:
+            time.sleep(cost_ms / 1000)
+            self.calls += 1
+        return [f"[{tgt_code}] {text}" for text in texts]
+
+
+def stub_translator_pool(cache=None, directions=('en-indic', 'indic-en', 'indic-indic'),
+                         memory_budget_mb=None, num_beams=1, **backend_options):
+    """
+    TranslatorPool with a MockBackend per direction, loaded on first use
+
+    Args:
+        cache: Optional TranslationCache, as passed to IndicTranslator
+        directions: Directions to serve
+        memory_budget_mb: Pool budget; MockBackend reports memory_mb per model
+        num_beams: Default beam size
+        backend_options: MockBackend latency and size settings
+    """
+    from app.utils.model_pool import TranslatorPool
+    from app.utils.translator import IndicTranslator
+
+    return TranslatorPool(
+        {
+            direction: IndicTranslator(
+                cache=cache,
+                backend=MockBackend(IndicTranslator.MODELS[direction], **backend_options),
+                num_beams=num_beams,
+                direction=direction,
+                lazy=True
+            )
+            for direction in directions
+        },
+        memory_budget_mb=memory_budget_mb
+    )
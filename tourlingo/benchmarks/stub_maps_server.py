@@ -0,0 +1,104 @@
+"""
+Local stub for the Google Maps Places/Geocoding API
+
+Serves deterministic JSON for /place/textsearch/json, /place/details/json
+and /geocode/json with an optional artificial latency, so GoogleMapsHelper
+can be exercised offline:
+
+    python -m benchmarks.stub_maps_server --port 8765 --latency-ms 80
+    GOOGLE_MAPS_BASE_URL=http://127.0.0.1:8765 python -m app.main
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _coordinates(text):
+    """Stable pseudo-coordinates inside India for a query string"""
+    digest = hashlib.md5(text.encode('utf-8')).digest()
+    return {
+        'lat': 8.0 + digest[0] / 255 * 27.0,
+        'lng': 68.0 + digest[1] / 255 * 29.0
+    }
+
+
+def place_results(query, count=5):
+    return [{
+        'name': f"{query.title()} {i + 1}",
+        'formatted_address': f"{i + 1} Stub Road, India",
+        'rating': round(3.5 + (i % 3) * 0.5, 1),
+        'place_id': hashlib.md5(f"{query}:{i}".encode('utf-8')).hexdigest(),
+        'types': ['point_of_interest', 'establishment'],
+        'geometry': {'location': _coordinates(f"{query}:{i}")}
+    } for i in range(count)]
+
+
+class StubMapsHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        time.sleep(self.latency)
+
+        if url.path.endswith('/place/textsearch/json'):
+            query = params.get('query', '')
+            body = {'status': 'OK', 'results': place_results(query)} if query else {
+                'status': 'INVALID_REQUEST', 'results': []
+            }
+        elif url.path.endswith('/place/details/json'):
+            body = {'status': 'OK', 'result': {
+                'name': f"Place {params.get('place_id', '')[:8]}",
+                'rating': 4.2,
+                'formatted_address': "1 Stub Road, India"
+            }}
+        elif url.path.endswith('/geocode/json'):
+            address = params.get('address', '')
+            body = {'status': 'OK', 'results': [{
+                'formatted_address': f"{address}, India",
+                'geometry': {'location': _coordinates(address)}
+            }]}
+        else:
+            self.send_error(404)
+            return
+
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, latency_ms=0.0):
+    """Start the stub on a daemon thread; returns (server, base_url)"""
+    handler = type('Handler', (StubMapsHandler,), {'latency': latency_ms / 1000.0})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Google Maps API server")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, args.latency_ms)
+    print(f"Stub Maps API listening on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
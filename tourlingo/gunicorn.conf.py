@@ -0,0 +1,71 @@
+"""
+Production server configuration
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master. Components listed in
+PRELOAD_COMPONENTS (e.g. "translator,ner") are built there before any
+worker is forked, so model weights are shared copy-on-write instead of
+being loaded once per worker. Do not preload translation_batcher or jobs:
+their worker threads would not survive the fork; they are built lazily
+per worker.
+"""
+import multiprocessing
+import os
+
+# Defer app.main's background preload; it happens synchronously in when_ready
+os.environ.setdefault('TOURLINGO_DEFER_PRELOAD', '1')
+
+bind = os.getenv('BIND', f"0.0.0.0:{os.getenv('PORT', 5000)}")
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True
+
+# Model inference and OCR can be slow; streaming responses hold a thread
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Split the cores between workers so their torch thread pools do not
+# oversubscribe the machine (override with TORCH_THREADS_PER_WORKER)
+torch_threads = int(os.getenv(
+    'TORCH_THREADS_PER_WORKER',
+    max(1, multiprocessing.cpu_count() // workers)
+))
+
+
+def when_ready(server):
+    """Runs in the master after binding, before workers are forked"""
+    from app.main import preload_components
+
+    server.log.info("Preloading components before forking workers")
+    preload_components(background=False, before_fork=True)
+
+
+def post_fork(server, worker):
+    from app.main import after_fork
+
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    server.log.info(f"Worker {worker.pid} using {torch_threads} torch threads")
+
+    # First inference (translation cache pre-warm) starts here, never in the
+    # master; it runs in the background so the worker can boot meanwhile
+    after_fork()
+
+
+def worker_exit(server, worker):
+    from app.main import shutdown
+
+    shutdown()
+
+
+def child_exit(server, worker):
+    # Drop a dead worker's live gauges when metrics are aggregated across workers
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
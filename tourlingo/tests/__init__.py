@@ -0,0 +1 @@
+# This file makes 'tests' a Python package
@@ -0,0 +1,51 @@
+import pytest
+
+from app.utils.batching import MicroBatcher
+
+
+class FailingTranslator:
+    """Stub translator whose generate call fails for some target languages"""
+
+    def __init__(self, failing=('hindi',)):
+        self.failing = failing
+        self.calls = []
+
+    def batch_translate(self, texts, source_lang, target_lang, batch_size=16, check_cache=True,
+                        num_beams=None, max_length=None):
+        self.calls.append((list(texts), target_lang))
+        if target_lang in self.failing:
+            raise RuntimeError(f"generate failed for {target_lang}")
+        return [f"[{target_lang}] {text}" for text in texts]
+
+
+@pytest.fixture
+def batcher():
+    translator = FailingTranslator()
+    batcher = MicroBatcher(translator, max_batch_size=8, max_wait_ms=50)
+    yield batcher
+    batcher.close()
+
+
+def test_generate_error_reaches_every_future_in_the_batch(batcher):
+    futures = [batcher.submit(f"Where is gate {i}?", 'english', 'hindi') for i in range(3)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="generate failed"):
+            future.result(timeout=5)
+    assert len(batcher.translator.calls) == 1
+
+
+def test_failing_group_does_not_affect_other_groups(batcher):
+    failing = batcher.submit("Where is the station?", 'english', 'hindi')
+    working = batcher.submit("Where is the station?", 'english', 'tamil')
+
+    assert working.result(timeout=5) == "[tamil] Where is the station?"
+    with pytest.raises(RuntimeError):
+        failing.result(timeout=5)
+
+
+def test_batcher_keeps_serving_after_an_error(batcher):
+    with pytest.raises(RuntimeError):
+        batcher.translate("Hello", 'english', 'hindi', timeout=5)
+
+    assert batcher.translate("Hello", 'english', 'tamil', timeout=5) == "[tamil] Hello"
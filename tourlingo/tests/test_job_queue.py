@@ -0,0 +1,106 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.utils.job_queue import JobQueue
+
+
+def stored_status(db_path, job_id):
+    connection = sqlite3.connect(db_path)
+    try:
+        row = connection.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        connection.close()
+    return row[0] if row else None
+
+
+def wait_finished(jobs, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        state = jobs.get(job_id)
+        if state['status'] in JobQueue.FINISHED:
+            return state
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'jobs.db')
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def jobs(db_path, release):
+    jobs = JobQueue(max_workers=1, db_path=db_path)
+    yield jobs
+    release.set()
+    jobs.close(timeout=5)
+
+
+def test_finished_jobs_are_never_overwritten_by_earlier_states(jobs, db_path):
+    # Jobs that finish immediately race their own submit; the stored row
+    # must still end on the final state
+    ids = [jobs.submit('translate', lambda: ({'ok': True}, 200))['id'] for _ in range(20)]
+
+    for job_id in ids:
+        wait_finished(jobs, job_id)
+    assert {stored_status(db_path, job_id) for job_id in ids} == {JobQueue.DONE}
+
+
+def test_cancelled_queued_job_stays_cancelled(jobs, db_path, release):
+    blocker = jobs.submit('slow', lambda: (release.wait(5), ({}, 200))[1])['id']
+    queued = jobs.submit('translate', lambda: ({'ran': True}, 200))['id']
+    assert stored_status(db_path, queued) == JobQueue.QUEUED
+
+    assert jobs.cancel(queued)['status'] == JobQueue.CANCELLED
+    release.set()
+    wait_finished(jobs, blocker)
+
+    assert stored_status(db_path, queued) == JobQueue.CANCELLED
+    assert jobs.get(queued)['status'] == JobQueue.CANCELLED
+    assert jobs.get(queued)['result'] is None
+
+
+def test_cancel_from_another_process_is_not_overwritten(jobs, db_path, release):
+    started = threading.Event()
+
+    def work():
+        started.set()
+        release.wait(5)
+        return {'ok': True}, 200
+
+    job_id = jobs.submit('slow', work)['id']
+    assert started.wait(5)
+
+    # Another server process sharing the database, with no workers of its own
+    other = JobQueue(max_workers=0, db_path=db_path)
+    other.cancel(job_id)
+    release.set()
+
+    assert wait_finished(jobs, job_id)['status'] == JobQueue.CANCELLED
+    assert stored_status(db_path, job_id) == JobQueue.CANCELLED
+    assert other.get(job_id)['status'] == JobQueue.CANCELLED
+
+
+def test_close_persists_jobs_it_cancels(db_path):
+    release = threading.Event()
+    jobs = JobQueue(max_workers=1, db_path=db_path)
+    jobs.submit('slow', lambda: (release.wait(5), ({}, 200))[1])
+    queued = jobs.submit('translate', lambda: ({}, 200))['id']
+
+    closer = threading.Thread(target=jobs.close, kwargs={'timeout': 5})
+    closer.start()
+    time.sleep(0.05)
+    release.set()
+    closer.join()
+
+    assert stored_status(db_path, queued) == JobQueue.CANCELLED
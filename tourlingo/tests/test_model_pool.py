@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('transformers')
+
+from app.utils.model_pool import DirectionNotEnabledError
+from app.utils.translation_cache import TranslationCache
+from benchmarks.stub_backends import stub_translator_pool
+
+
+def loaded(pool):
+    return {direction for direction, state in pool.status().items() if state['loaded']}
+
+
+def test_memory_budget_unloads_least_recently_used_model():
+    # Room for two 100MB models
+    pool = stub_translator_pool(memory_budget_mb=250, memory_mb=100, base_ms=0, per_token_ms=0)
+
+    pool.translate("Where is the station?", 'english', 'hindi')
+    pool.translate("स्टेशन कहाँ है?", 'hindi', 'english')
+    assert loaded(pool) == {'en-indic', 'indic-en'}
+
+    pool.translate("Where is the station?", 'english', 'tamil')
+    pool.translate("स्टेशन कहाँ है?", 'hindi', 'tamil')
+
+    # indic-en was used least recently, so it made room for indic-indic
+    assert loaded(pool) == {'en-indic', 'indic-indic'}
+    status = pool.status()
+    assert status['indic-en']['unloads'] == 1
+    assert status['en-indic']['loads'] == 1
+
+
+def test_model_in_use_is_never_unloaded():
+    pool = stub_translator_pool(memory_budget_mb=150, memory_mb=100, base_ms=0, per_token_ms=0)
+
+    stream = pool.iter_translate_document("Where is the fort? How far is it?", 'english', 'hindi')
+    next(stream)
+    # en-indic is pinned by the open stream, so the pool goes over budget
+    pool.translate("स्टेशन कहाँ है?", 'hindi', 'english')
+    assert loaded(pool) == {'en-indic', 'indic-en'}
+
+    list(stream)
+    pool.translate("किला कहाँ है?", 'hindi', 'tamil')
+    assert 'en-indic' not in loaded(pool)
+
+
+def test_cache_hits_never_load_a_model():
+    cache = TranslationCache()
+    pool = stub_translator_pool(cache, base_ms=0, per_token_ms=0)
+    pool.translate("Thank you", 'english', 'hindi')
+    pool.unload('en-indic')
+
+    assert pool.translate("Thank you", 'english', 'hindi') == "[hin_Deva] Thank you"
+    assert loaded(pool) == set()
+
+
+def test_disabled_direction_is_rejected():
+    pool = stub_translator_pool(directions=('en-indic',))
+
+    with pytest.raises(DirectionNotEnabledError):
+        pool.translate("स्टेशन कहाँ है?", 'hindi', 'english')
+    assert pool.translate("Hello", 'english', 'english') == "Hello"
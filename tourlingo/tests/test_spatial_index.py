@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from app.utils.spatial_index import SpatialIndex
+
+
+def place(place_id, lat, lng, rating=None, types=()):
+    return {
+        'name': place_id, 'place_id': place_id, 'rating': rating,
+        'types': list(types), 'location': {'lat': lat, 'lng': lng}
+    }
+
+
+@pytest.fixture(params=[False, True], ids=['buffered', 'merged'])
+def index(request):
+    """Same points held in the unsorted buffer or merged into the sorted arrays"""
+    index = SpatialIndex(min_merge=1 if request.param else 10_000)
+    index.add_places([
+        place('east', -17.0, 179.99),
+        place('west', -17.0, -179.99),
+        place('far', -17.0, 178.0)
+    ])
+    return index
+
+
+def test_search_wraps_across_the_antimeridian(index):
+    for lng in (179.995, -179.995):
+        names = {result['name'] for result in index.nearby(-17.0, lng, radius_m=5000)}
+        assert names == {'east', 'west'}
+
+
+def test_results_carry_distance_and_respect_radius(index):
+    results = index.nearby(-17.0, 180.0, radius_m=2000, rank_by='distance')
+
+    assert [result['name'] for result in results] == ['east', 'west']
+    assert all(result['distance_m'] <= 2000 for result in results)
+
+
+def test_updated_place_replaces_the_old_point(index):
+    index.add_places([place('east', -17.0, 178.01)])
+
+    assert {r['name'] for r in index.nearby(-17.0, 179.995, radius_m=5000)} == {'west'}
+    assert {r['name'] for r in index.nearby(-17.0, 178.0, radius_m=5000)} == {'east', 'far'}
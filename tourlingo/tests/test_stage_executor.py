@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.stage_executor import StagePipeline
+
+
+@pytest.fixture
+def release():
+    """Event that blocked stages wait on; set at teardown so no thread outlives the test"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def executor(release):
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    release.set()
+    executor.shutdown(wait=True)
+
+
+def test_time_queued_behind_other_stages_does_not_count(executor):
+    pipeline = StagePipeline(executor)
+    pipeline.add('slow', lambda: time.sleep(0.3) or 'slow')
+    # Queued for ~0.3s on the single worker, then runs well inside its timeout
+    pipeline.add('quick', lambda: 'quick', timeout=0.2)
+
+    outcome = pipeline.run()
+
+    assert outcome.status == {'slow': StagePipeline.OK, 'quick': StagePipeline.OK}
+    assert outcome.get('quick') == 'quick'
+    assert not outcome.partial
+
+
+def test_running_stage_times_out_and_dependents_are_skipped(executor, release):
+    pipeline = StagePipeline(executor)
+    pipeline.add('stuck', lambda: release.wait(5), timeout=0.1)
+    pipeline.add('after', lambda result: result, deps=['stuck'])
+
+    start = time.perf_counter()
+    outcome = pipeline.run()
+
+    assert time.perf_counter() - start < 1
+    assert outcome.status['stuck'] == StagePipeline.TIMED_OUT
+    assert outcome.status['after'] == StagePipeline.SKIPPED
+    assert outcome.incomplete() == {'stuck': 'timed_out', 'after': 'skipped'}
+
+
+def test_pipeline_deadline_bounds_stages_without_a_timeout(executor, release):
+    pipeline = StagePipeline(executor, deadline=0.1)
+    pipeline.add('stuck', lambda: release.wait(5))
+    pipeline.add('queued', lambda: 'never started')
+
+    start = time.perf_counter()
+    outcome = pipeline.run()
+
+    assert time.perf_counter() - start < 1
+    assert outcome.status == {'stuck': StagePipeline.TIMED_OUT, 'queued': StagePipeline.TIMED_OUT}
+
+
+def test_failed_stage_is_reported_and_independent_stages_finish(executor):
+    def fail():
+        raise ValueError("no text found")
+
+    pipeline = StagePipeline(executor)
+    pipeline.add('ocr', fail)
+    pipeline.add('translate', lambda text: text, deps=['ocr'])
+    pipeline.add('places', lambda: ['India Gate'])
+
+    outcome = pipeline.run()
+
+    assert outcome.status == {
+        'ocr': StagePipeline.FAILED,
+        'translate': StagePipeline.SKIPPED,
+        'places': StagePipeline.OK
+    }
+    assert outcome.errors['ocr'] == "no text found"
+    assert outcome.get('places') == ['India Gate']
@@ -0,0 +1,59 @@
+from app.utils.translation_cache import TranslationCache
+
+PARAMS = {'num_beams': 1, 'max_length': 512}
+
+
+def key(cache, text, tgt_code='hin_Deva', params=PARAMS):
+    return cache.make_key(text, 'eng_Latn', tgt_code, 'indictrans2-en-indic:mock', params)
+
+
+def test_keys_ignore_whitespace_but_not_language_or_settings():
+    cache = TranslationCache()
+
+    assert key(cache, "Where is  the\tstation?") == key(cache, " Where is the station? ")
+    assert key(cache, "Where is the station?") != key(cache, "Where is the station?", 'tam_Taml')
+    assert key(cache, "Where is the station?") != key(
+        cache, "Where is the station?", params={'num_beams': 5, 'max_length': 512}
+    )
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = TranslationCache(max_entries=2)
+    first, second, third = (key(cache, text) for text in ("one", "two", "three"))
+    cache.set(first, "एक")
+    cache.set(second, "दो")
+    assert cache.get(first) == "एक"
+
+    cache.set(third, "तीन")
+
+    assert cache.get(second) is None
+    assert cache.get(first) == "एक"
+    assert cache.get(third) == "तीन"
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['memory_entries'] == 2
+    assert (stats['hits'], stats['misses']) == (3, 1)
+
+
+def test_disk_tier_survives_a_new_process(tmp_path):
+    db_path = str(tmp_path / 'translations.db')
+    cache = TranslationCache(db_path=db_path)
+    cache.set(key(cache, "Thank you"), "धन्यवाद")
+    cache.close()
+
+    reopened = TranslationCache(db_path=db_path)
+
+    assert reopened.get(key(reopened, "Thank you")) == "धन्यवाद"
+    assert reopened.stats()['disk_hits'] == 1
+    # Promoted to memory: the second lookup does not touch the disk
+    assert reopened.get(key(reopened, "Thank you")) == "धन्यवाद"
+    assert reopened.stats()['disk_hits'] == 1
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = TranslationCache(db_path=str(tmp_path / 'translations.db'))
+    cache.set(key(cache, "Hello"), "नमस्ते")
+
+    cache.clear()
+
+    assert cache.get(key(cache, "Hello")) is None